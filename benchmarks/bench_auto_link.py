@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Auto Link Benchmark - Aho-Corasick single pass vs one regex search per glossary term
+
+Builds a synthetic glossary and chapter notes in memory and times finding the
+term mentions of every line both ways, plus the full auto_link pass (matching,
+filtering and rewriting) per file.
+"""
+import argparse
+import random
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from auto_link import AutoLinker, lower_same_length
+from synthetic_vault import stem, term_names
+from timing import timed
+
+WORDS = [f"word{n}" for n in range(5000)]
+
+
+def synthetic(terms: int, lines: int, seed: int = 0):
+    rng = random.Random(seed)
+    names = term_names(terms)
+    topics = {f"topics/{stem(name)}.wiki": (name, stem(name)) for name in names}
+    files = []
+    for start in range(0, lines, 200):
+        body = ["= Chapter =", "== Section =="]
+        for _ in range(min(200, lines - start)):
+            words = rng.choices(WORDS, k=10)
+            if rng.random() < 0.3:
+                words.insert(rng.randrange(10), rng.choice(names) + "s")
+            body.append("- " + " ".join(words))
+        files.append("\n".join(body) + "\n")
+    return topics, files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark glossary auto-linking")
+    parser.add_argument("--terms", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=50000)
+    args = parser.parse_args()
+
+    topics, files = synthetic(args.terms, args.lines)
+    build, linker = timed(lambda: AutoLinker(topics))
+    print(
+        f"{args.terms} terms -> {len(linker.automaton)} automaton states "
+        f"built in {build * 1000:.0f} ms; {args.lines} lines in {len(files)} files"
+    )
+
+    lines = [lower_same_length(line) for text in files for line in text.split("\n")]
+    automaton_time, found = timed(
+        lambda: sum(len(linker.automaton.matches(line)) for line in lines)
+    )
+
+    patterns = [
+        re.compile(re.escape(name.lower()) + "s?") for name, _ in topics.values()
+    ]
+    sample = lines[: max(1, len(lines) // 20)]
+
+    def search_sample():
+        for line in sample:
+            for pattern in patterns:
+                pattern.search(line)
+
+    per_term = timed(search_sample)[0] * len(lines) / len(sample)
+    print(
+        f"match all lines: automaton {automaton_time:.2f} s ({found} matches), "
+        f"regex per term ~{per_term:.1f} s (extrapolated from 5%), "
+        f"{per_term / automaton_time:.0f}x"
+    )
+
+    full, added = timed(
+        lambda: sum(
+            len(linker.link_text(text, f"chapters/ch{n}/part 1.wiki")[1])
+            for n, text in enumerate(files)
+        )
+    )
+    print(f"full auto-link pass: {full:.2f} s, {added} links added")
+
+
+if __name__ == "__main__":
+    main()
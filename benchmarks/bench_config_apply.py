@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Config Apply Benchmark - validating and diffing a large glossary_config.yaml
+
+Writes a synthetic config with one bad entry in a temp directory, then times
+loading it, the single-pass validator, the line lookup for its issues and the
+diff apply computes against the current state (a planner-shaped namespace).
+"""
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from config_validator import locate_issues, split_issues, validate_config
+from glossary_study_manager import diff_config, render_config
+from synthetic_vault import config_entry, synthetic_terms
+from timing import timed
+from yaml_cache import load_yaml
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark config validate/apply")
+    parser.add_argument("--entries", type=int, default=100000)
+    args = parser.parse_args()
+
+    terms = {
+        name: config_entry(term)
+        for name, term in synthetic_terms(args.entries, reviewed_share=0).items()
+    }
+    current = {name: dict(entry) for name, entry in terms.items()}
+    names = list(terms)
+    terms[names[7]]["exam_importance"] = "urgent"
+    terms[names[8]]["study_importance"] = "low"
+    terms[names[8]]["exam_importance"] = "low"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = Path(tmp) / "config.yaml"
+        config_file.write_text(render_config(terms))
+        cache_dir = Path(tmp) / "cache"
+        load, config = timed(lambda: load_yaml(config_file, cache_dir=cache_dir))
+        cached, _ = timed(lambda: load_yaml(config_file, cache_dir=cache_dir))
+        validate, issues = timed(lambda: validate_config(config, current))
+        locate, _ = timed(lambda: locate_issues(config_file, issues))
+        errors, _ = split_issues(issues)
+        print(
+            f"{args.entries} entries: load {load:.2f} s "
+            f"(cached {cached * 1000:.0f} ms), validate {validate * 1000:.0f} ms, "
+            f"line lookup {locate:.2f} s "
+            f"({len(errors)} errors: {errors[0] if errors else '-'})"
+        )
+
+        del config["terms"][names[7]]
+        planner = SimpleNamespace(terms=current, config_data=current, metadata={})
+        diff, (static_changes, _, report) = timed(
+            lambda: diff_config(planner, config["terms"])
+        )
+        print(
+            f"diff {diff * 1000:.0f} ms: {len(report)} changes in "
+            f"{len(static_changes)} terms -> one config rewrite, one store upsert"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Due Queue Benchmark - "what is due today" from the next_review index vs a full scan
+
+Writes synthetic review data for N terms (JSON and SQLite stores) in a temp
+directory and times fetching the 20 most overdue terms: a scan of every
+record, the JSON store's DueIndex (cold build, warm query, after one review)
+and SQLite's next_review index.
+"""
+import argparse
+import heapq
+import sys
+import tempfile
+from datetime import date
+from itertools import islice
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from metadata_store import JsonMetadataStore, SqliteMetadataStore, write_json_atomic
+from synthetic_vault import review_metadata, synthetic_terms
+from timing import timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the due-review queue")
+    parser.add_argument("--terms", type=int, default=200000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    today = date.today().isoformat()
+    data = review_metadata(synthetic_terms(args.terms))
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "glossary_metadata.json"
+        write_json_atomic(json_path, data)
+
+        def scan():
+            store = JsonMetadataStore(json_path)
+            records = store.load_all()
+            due = (
+                (record["next_review"], term)
+                for term, record in records.items()
+                if record.get("next_review") and record["next_review"] <= today
+            )
+            return heapq.nsmallest(args.limit, due)
+
+        def first_due(store):
+            return list(islice(store.iter_due(today), args.limit))
+
+        scanned, expected = timed(scan)
+        cold, _ = timed(lambda: first_due(JsonMetadataStore(json_path)))
+        warm, found = timed(lambda: first_due(JsonMetadataStore(json_path)))
+        assert found == expected
+        print(
+            f"{args.terms} terms, {args.limit} most overdue: full scan "
+            f"{scanned * 1000:.0f} ms, JSON index cold {cold * 1000:.0f} ms, "
+            f"warm {warm * 1000:.1f} ms"
+        )
+
+        store = JsonMetadataStore(json_path)
+        reviewed = found[0][1]
+        write, _ = timed(
+            lambda: store.upsert({reviewed: {"next_review": "9999-01-01"}})
+        )
+        after, found = timed(lambda: first_due(JsonMetadataStore(json_path)))
+        assert reviewed not in {term for _, term in found}
+        print(
+            f"one review: write {write * 1000:.0f} ms (index patched), "
+            f"next query {after * 1000:.1f} ms"
+        )
+
+        sqlite_store = SqliteMetadataStore(Path(tmp) / "glossary_metadata.db")
+        sqlite_store.upsert(data)
+        query, found = timed(lambda: first_due(sqlite_store))
+        print(f"SQLite next_review index: {query * 1000:.1f} ms ({len(found)} due)")
+
+
+if __name__ == "__main__":
+    main()
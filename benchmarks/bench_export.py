@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Export Benchmark - streaming term export: time and peak memory per format
+
+Builds N synthetic term records with review data, then streams them to a temp
+file as NDJSON, CSV and columnar chunks, timing each export and measuring the
+peak memory it allocates (tracemalloc, in a second traced run), next to the
+peak of building the whole JSON document in memory first.
+"""
+import argparse
+import json
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from synthetic_vault import synthetic_terms
+from term_export import EXPORT_FORMATS, export_rows, term_rows
+from term_store import Interner, TermRecord
+from timing import timed
+
+
+def traced_peak(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the streaming export")
+    parser.add_argument("--terms", type=int, default=200_000)
+    args = parser.parse_args()
+
+    interner = Interner()
+    records = {
+        name: TermRecord(interner, **term)
+        for name, term in synthetic_terms(args.terms).items()
+    }
+    scheduler = {"sm2_ease": 2.5, "sm2_repetitions": 2, "interval_days": 6}
+    metadata = {name: dict(scheduler) for name in records}
+    with tempfile.TemporaryDirectory() as tmp:
+        for export_format in EXPORT_FORMATS:
+            path = Path(tmp) / f"terms.{export_format}"
+
+            def export():
+                rows = term_rows(records, records, metadata)
+                return export_rows(rows, str(path), export_format)
+
+            elapsed, count = timed(export)
+            peak = traced_peak(export)
+            print(
+                f"{export_format:>8}: {count} terms in {elapsed * 1000:.0f} ms, "
+                f"{path.stat().st_size / 1e6:.0f} MB written, "
+                f"peak {peak / 1e6:.2f} MB allocated"
+            )
+
+        def whole_document():
+            rows = list(term_rows(records, records, metadata))
+            return len(json.dumps(rows, default=str))
+
+        peak = traced_peak(whole_document)
+        print(f"whole document in memory first: peak {peak / 1e6:.0f} MB allocated")
+
+
+if __name__ == "__main__":
+    main()
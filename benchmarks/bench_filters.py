@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Filter Benchmark - Linear filter scan vs term_filters posting-set intersection
+
+Runs the study plan's chapter / importance / tag filters over a synthetic
+glossary both ways, checks that they select the same terms in the same order,
+and reports per-query timings.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from synthetic_vault import CHAPTERS, synthetic_terms
+from term_filters import TermFilterIndex
+from term_store import Interner, TermRecord
+from timing import best_of, timed
+
+
+def term_records(count: int, seed: int = 0):
+    """synthetic_terms as TermRecords, each also mentioning the next chapter"""
+    interner = Interner()
+    terms = {}
+    for name, term in synthetic_terms(count, seed=seed).items():
+        chapter = term["chapter"]
+        terms[name] = TermRecord(
+            interner,
+            definition=term["definition"],
+            wiki_link=term["wiki_link"],
+            letter_section=name[0].upper(),
+            chapter=chapter,
+            exam_importance=term["exam_importance"],
+            tags=term["tags"],
+            all_chapters=[chapter, str(int(chapter) % CHAPTERS + 1)],
+        )
+    return terms
+
+
+def linear_filter(terms, chapters, chapter, importance, tag):
+    """The original per-term checks from generate_study_plan"""
+    names = []
+    for term_name, term_data in terms.items():
+        if chapters:
+            if term_data.get("chapter") not in chapters:
+                if not any(
+                    chap in chapters for chap in term_data.get("all_chapters", [])
+                ):
+                    continue
+        elif chapter and term_data.get("chapter") != chapter:
+            continue
+        if importance and term_data.get("exam_importance") != importance:
+            continue
+        if tag:
+            term_tags = term_data.get("tags", [])
+            if not any(tag.lower() in t.lower() for t in term_tags):
+                continue
+        names.append(term_name)
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark study plan filters")
+    parser.add_argument("--terms", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement")
+    args = parser.parse_args()
+
+    terms = term_records(args.terms)
+    build, index = timed(lambda: TermFilterIndex(terms))
+    print(f"{args.terms} terms, index built in {build * 1000:.0f} ms")
+
+    queries = [
+        ("deadline chapters 3,4", dict(chapters=["3", "4"])),
+        ("chapter", dict(chapter="7")),
+        ("importance", dict(importance="high")),
+        ("tag 'genetics'", dict(tag="genetics")),
+        ("tag 'ology'", dict(tag="ology")),
+        ("chapter+importance+tag", dict(chapter="7", importance="high", tag="vir")),
+    ]
+    print(f"{'filter':<26}{'matches':>9}{'scan':>11}{'index':>11}{'speedup':>9}")
+    for label, query in queries:
+        full = {"chapters": None, "chapter": None, "importance": None, "tag": None}
+        full.update(query)
+        scan_time, expected = best_of(
+            lambda: linear_filter(terms, *full.values()), args.runs
+        )
+        index_time, selected = best_of(lambda: index.select(**query), args.runs)
+        if selected != expected:
+            print(f"❌ {label}: index selected different terms")
+            return 1
+        print(
+            f"{label:<26}{len(selected):>9}{scan_time * 1000:>9.1f}ms"
+            f"{index_time * 1000:>9.1f}ms{scan_time / index_time:>8.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Glossary Regen Benchmark - Full vs incremental glossary.wiki regeneration
+
+Writes a synthetic topics directory to a temp directory and times a cold
+regeneration, a no-op run, a run after editing one topic, a run after adding
+one and an on-save run given the edited path, each with the cache reloaded.
+"""
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from glossary_regen import GlossaryRegenerator
+from synthetic_vault import stem, term_names
+from timing import timed
+
+
+def write_topics(topics_dir: Path, count: int):
+    topics_dir.mkdir(parents=True)
+    for name in term_names(count):
+        body = [f"= {name} =", "", f"Definition of {name}.", "", "More notes."]
+        (topics_dir / f"{stem(name)}.wiki").write_text("\n".join(body) + "\n")
+
+
+def timed_run(tmp: Path, paths=None):
+    def run():
+        regen = GlossaryRegenerator(
+            tmp / "topics", tmp / "glossary.wiki", tmp / "glossary_regen.pickle"
+        )
+        return regen.regenerate(paths)
+
+    elapsed, (changed, sections, written) = timed(run)
+    return elapsed, changed, sections, written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark glossary regeneration")
+    parser.add_argument("--topics", type=int, default=50000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        write_topics(tmp / "topics", args.topics)
+        edited = sorted((tmp / "topics").iterdir())[100]
+        added = tmp / "topics" / "zz_new.wiki"
+        steps = [
+            ("cold", None, None),
+            ("no-op", None, None),
+            ("edit one topic", lambda: edited.write_text("= X =\nEdited.\n"), None),
+            ("add one topic", lambda: added.write_text("x\n"), None),
+            ("on save (path)", lambda: edited.write_text("= X =\nAgain.\n"), [edited]),
+        ]
+        for label, action, paths in steps:
+            if action:
+                action()
+            elapsed, changed, sections, written = timed_run(tmp, paths)
+            print(
+                f"{label:<15} {elapsed * 1000:7.0f} ms  ({changed} re-read, "
+                f"{sections} sections, {'written' if written else 'unchanged'})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Link Graph Benchmark - link_graph cold build, cached sync, incremental edit and PageRank
+
+Generates a synthetic vault (chapter notes linking topics with "../../topics/..."
+links, topic pages cross-linking each other, a glossary) in a temp directory.
+"""
+import argparse
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from link_graph import LinkGraph
+from synthetic_vault import stem, term_names
+from timing import timed
+
+
+def write_vault(notes: Path, topics: int, chapters: int, seed: int = 0) -> int:
+    """Topic pages, chapter notes and a glossary; returns the number of links"""
+    rng = random.Random(seed)
+    names = [stem(name) for name in term_names(topics)]
+    links = 0
+    (notes / "topics").mkdir(parents=True)
+    for name in names:
+        related = rng.sample(names, 4)
+        # A few links use spaces instead of underscores and dangle
+        body = [f"= {name} =", "Some description."]
+        body += [f"- see [[{other}|{other.replace('_', ' ')}]]" for other in related]
+        if rng.random() < 0.02:
+            body.append(f"- [[{name.replace('_', ' ')} extra]]")
+        (notes / "topics" / f"{name}.wiki").write_text("\n".join(body) + "\n")
+        links += len(body) - 2
+    for chapter in range(1, chapters + 1):
+        path = notes / "chapters" / f"ch{chapter}" / "part 1.wiki"
+        path.parent.mkdir(parents=True)
+        body = [f"= Chapter {chapter} ="]
+        for name in rng.sample(names, min(len(names), 40)):
+            body.append(f"- [[../../topics/{name}|{name}]] in context")
+        path.write_text("\n".join(body) + "\n")
+        links += len(body) - 1
+    glossary = ["= Glossary =", "== T =="]
+    glossary += [f"* [[topics/{name}|{name}]] :: definition" for name in names]
+    (notes / "glossary.wiki").write_text("\n".join(glossary) + "\n")
+    return links + len(names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vault link graph")
+    parser.add_argument("--topics", type=int, default=20000)
+    parser.add_argument("--chapters", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        notes = Path(tmp) / "notes"
+        links = write_vault(notes, args.topics, args.chapters)
+        names = [stem(name) for name in term_names(args.topics)]
+        cache_file = Path(tmp) / "link_graph.pickle"
+
+        def cold():
+            graph = LinkGraph(notes, cache_file)
+            graph.update()
+            graph.save()
+            return graph
+
+        build, graph = timed(cold)
+        print(
+            f"{len(graph)} pages, {links} links ({len(graph.targets)} distinct "
+            f"edges, {len(graph.dangling)} dangling): cold build {build:.2f} s"
+        )
+        load, graph = timed(lambda: LinkGraph(notes, cache_file))
+        unchanged, _ = timed(graph.update)
+        edited = notes / "topics" / f"{names[7]}.wiki"
+        edited.write_text(edited.read_text() + f"- [[{names[8]}]]\n")
+        incremental, _ = timed(graph.update)
+        print(
+            f"load {load * 1000:.0f} ms, sync unchanged {unchanged * 1000:.0f} ms, "
+            f"sync after one edit {incremental * 1000:.0f} ms"
+        )
+        pagerank, _ = timed(graph.pagerank)
+        orphans, found = timed(graph.orphans)
+        print(
+            f"pagerank {pagerank * 1000:.0f} ms, "
+            f"orphans {orphans * 1000:.0f} ms ({len(found)} found)"
+        )
+
+
+if __name__ == "__main__":
+    main()
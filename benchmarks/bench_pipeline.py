@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark - planner scenarios on synthetic vaults of growing size, with baselines
+
+For every size a synthetic vault is generated (see synthetic_vault), then each
+scenario runs in a fresh worker process so cold caches are really cold and the
+memory peak belongs to that scenario alone. An untimed parse first builds the
+index and caches, so any subset of scenarios measures the same thing:
+  - cold_parse:   construct the planner and parse_glossary with no index/caches
+  - scan_topics:  _scan_topics_directory without the index (every topic read)
+  - warm_parse:   construct and parse_glossary from the on-disk index snapshot
+  - warm_plan:    generate_study_plan after a warm parse (first call and repeat)
+  - batch_review: mark_terms_reviewed for 1000 terms, then one mark_term_reviewed
+  - config_apply: apply_config for a file changing 1% of the terms
+
+Results (seconds of the measured step, peak RSS of the worker, step details)
+are printed and optionally written as JSON; --compare flags scenarios that got
+slower or bigger than a stored baseline by more than --threshold (exit code 1).
+
+Usage:
+    python3 benchmarks/bench_pipeline.py --sizes 1k 10k --output baseline.json
+    python3 benchmarks/bench_pipeline.py --sizes 1k 10k --compare baseline.json
+"""
+import argparse
+import io
+import json
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from datetime import date, datetime
+from pathlib import Path
+
+from timing import timed
+
+RESULTS_VERSION = 1
+SCENARIOS = (
+    "cold_parse",
+    "scan_topics",
+    "warm_parse",
+    "warm_plan",
+    "batch_review",
+    "config_apply",
+)
+SIZES = {"1k": 1000, "10k": 10000, "100k": 100000, "1m": 1000000}
+DEFAULT_SIZES = ["1k", "10k", "100k"]
+BATCH_REVIEWS = 1000
+# Differences below these never count as regressions (timer and allocator noise)
+MIN_SECONDS = 0.02
+MIN_RSS_MB = 5.0
+
+
+def parse_size(text: str) -> int:
+    """'10k', '1m' or a plain number of terms"""
+    text = text.lower()
+    if text in SIZES:
+        return SIZES[text]
+    if text.endswith("k") and text[:-1].isdigit():
+        return int(text[:-1]) * 1000
+    if text.endswith("m") and text[:-1].isdigit():
+        return int(text[:-1]) * 1000000
+    if text.isdigit():
+        return int(text)
+    raise argparse.ArgumentTypeError(f"invalid size: {text!r} (e.g. 1k, 100k, 1m)")
+
+
+def peak_rss_mb() -> float:
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# --- worker side -----------------------------------------------------------
+def run_scenario(scenario: str, vault: Path) -> dict:
+    """Run one scenario in this process against `vault`; returns its measurements"""
+    # Nothing from this repo's scripts/ is imported yet, so the planner modules
+    # come from the vault and resolve their paths inside it
+    sys.path.insert(0, str(vault / "scripts"))
+    from glossary_planner import GlossaryStudyPlanner
+
+    details = {}
+
+    def step(name, func):
+        elapsed, result = timed(func)
+        details[name] = round(elapsed, 6)
+        return result
+
+    def parsed_planner():
+        planner = GlossaryStudyPlanner()
+        planner.parse_glossary()
+        return planner
+
+    data_dir = vault / "notes" / "data"
+    with redirect_stdout(io.StringIO()):
+        if scenario == "prime":
+            parsed_planner()
+            measured = 0.0
+        elif scenario == "cold_parse":
+            shutil.rmtree(data_dir / "cache", ignore_errors=True)
+            (data_dir / "glossary_index.json").unlink(missing_ok=True)
+            planner = step("construct", GlossaryStudyPlanner)
+            step("parse_glossary", planner.parse_glossary)
+            measured = details["construct"] + details["parse_glossary"]
+            details["terms"] = len(planner.terms)
+        elif scenario == "scan_topics":
+            planner = GlossaryStudyPlanner()
+            topics = step("scan", lambda: planner._scan_topics_directory(None))
+            measured = details["scan"]
+            details["topics"] = len(topics)
+        elif scenario == "warm_parse":
+            planner = step("construct", GlossaryStudyPlanner)
+            step("parse_glossary", planner.parse_glossary)
+            measured = details["construct"] + details["parse_glossary"]
+        elif scenario == "warm_plan":
+            planner = parsed_planner()
+            plan, _ = step("first", planner.generate_study_plan)
+            step("repeat", planner.generate_study_plan)
+            measured = details["first"]
+            details["planned"] = len(plan)
+        elif scenario == "batch_review":
+            planner = parsed_planner()
+            planner._open_review_log()  # a new log snapshots the store once
+            rng = random.Random(0)
+            names = list(planner.terms)
+            records = [
+                (rng.choice(names), 1, date.today())
+                for _ in range(min(BATCH_REVIEWS, len(names)))
+            ]
+            step("batch", lambda: planner.mark_terms_reviewed(records))
+            step("single", lambda: planner.mark_term_reviewed(names[0]))
+            measured = details["batch"]
+            details["reviews"] = len(records)
+        elif scenario == "config_apply":
+            from glossary_study_manager import apply_config
+
+            planner = parsed_planner()
+            rng = random.Random(0)
+            names = sorted(planner.config_data)
+            changed = rng.sample(names, max(1, len(names) // 100))
+            levels = ["high", "medium", "low"]
+            changes = {
+                name: {
+                    "exam_importance": levels[
+                        (levels.index(planner.config_data[name]["exam_importance"]) + 1)
+                        % 3
+                    ],
+                    "mastery_level": rng.randint(0, 5),
+                }
+                for name in changed
+            }
+            apply_file = vault / "apply.json"
+            apply_file.write_text(json.dumps({"terms": changes}))
+            applied = step("apply", lambda: apply_config(planner, apply_file))
+            measured = details["apply"]
+            details["changed"] = len(changes)
+            details["applied"] = bool(applied)
+        else:
+            raise ValueError(f"Unknown scenario: {scenario}")
+    return {
+        "seconds": round(measured, 6),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "details": details,
+    }
+
+
+# --- driver side -----------------------------------------------------------
+def run_worker(scenario: str, vault: Path) -> dict:
+    completed = subprocess.run(
+        [sys.executable, __file__, "--worker", scenario, "--vault", str(vault)],
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"{scenario} failed:\n{completed.stderr.strip() or completed.stdout}"
+        )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(results: list, baseline: dict, threshold: float) -> list:
+    """[(result, baseline result, reasons)] for every scenario that regressed"""
+    previous = {
+        (entry["terms"], entry["scenario"]): entry
+        for entry in baseline.get("results", [])
+    }
+    regressions = []
+    for entry in results:
+        before = previous.get((entry["terms"], entry["scenario"]))
+        if before is None:
+            continue
+        reasons = []
+        seconds, old_seconds = entry["seconds"], before["seconds"]
+        if (
+            seconds > old_seconds * (1 + threshold)
+            and seconds - old_seconds > MIN_SECONDS
+        ):
+            reasons.append(f"time {old_seconds:.3f} s -> {seconds:.3f} s")
+        rss, old_rss = entry["peak_rss_mb"], before["peak_rss_mb"]
+        if rss > old_rss * (1 + threshold) and rss - old_rss > MIN_RSS_MB:
+            reasons.append(f"peak RSS {old_rss:.0f} MB -> {rss:.0f} MB")
+        if reasons:
+            regressions.append((entry, before, reasons))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the planner pipeline")
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=parse_size,
+        default=[SIZES[size] for size in DEFAULT_SIZES],
+        help="Vault sizes in terms (1k, 10k, 100k, 1m or a number)",
+    )
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument("--output", metavar="FILE", help="Write results as JSON")
+    parser.add_argument(
+        "--compare", metavar="BASELINE", help="Flag regressions against a results file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown/growth over the baseline (default 0.25 = 25%%)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--worker", choices=("prime",) + SCENARIOS, help=argparse.SUPPRESS
+    )
+    parser.add_argument("--vault", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_scenario(args.worker, Path(args.vault))))
+        return 0
+
+    from synthetic_vault import write_vault
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = []
+    print(f"{'terms':>8} {'scenario':<14}{'seconds':>10}{'peak RSS':>11}  details")
+    for terms in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            vault = Path(tmp) / "vault"
+            generate, counts = timed(lambda: write_vault(vault, terms, seed=args.seed))
+            print(
+                f"{terms:>8} {'(generate)':<14}{generate:>10.3f}{'':>11}  "
+                f"{counts['topics']} topics, "
+                f"{counts['chapter_notes']} chapter notes"
+            )
+            run_worker("prime", vault)  # warm scenarios never pay for the first parse
+            for scenario in args.scenarios:
+                measured = run_worker(scenario, vault)
+                entry = {"terms": terms, "scenario": scenario, **measured}
+                results.append(entry)
+                steps = ", ".join(f"{k} {v}" for k, v in measured["details"].items())
+                print(
+                    f"{terms:>8} {scenario:<14}{measured['seconds']:>10.3f}"
+                    f"{measured['peak_rss_mb']:>8.0f} MB  {steps}"
+                )
+
+    report = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"✅ Wrote {len(results)} results to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if not regressions:
+            print(f"✅ No regressions against {args.compare}")
+            return 0
+        print(f"❌ {len(regressions)} regressions against {args.compare}:")
+        for entry, _, reasons in regressions:
+            print(f"  {entry['terms']} terms {entry['scenario']}: {'; '.join(reasons)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Review Log Benchmark - appending review events and replaying them into review data
+
+Appends N synthetic review events (synthetic_vault.review_events) to a review
+log in a temp directory, then times single appends, replaying the whole log
+over the snapshot, compaction and the replay after it.
+"""
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from review_log import EVENT, ReviewLog
+from synthetic_vault import review_events, synthetic_terms
+from timing import timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the review event log")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--terms", type=int, default=20000)
+    parser.add_argument("--appends", type=int, default=2000)
+    args = parser.parse_args()
+
+    events = review_events(synthetic_terms(args.terms), args.events)
+    with tempfile.TemporaryDirectory() as tmp:
+        log = ReviewLog(Path(tmp) / "review_log")
+        log.create({})
+        bulk, _ = timed(lambda: log.append(events))
+
+        def single():
+            for event in events[: args.appends]:
+                log.append([event])
+
+        appends, _ = timed(single)
+        size = log.events_file.stat().st_size
+        print(
+            f"{args.events + args.appends} events ({EVENT.size} bytes each, "
+            f"{size / 1e6:.0f} MB): bulk append {bulk * 1000:.0f} ms, single append "
+            f"{appends / args.appends * 1e6:.0f} us"
+        )
+
+        replay, (records, count) = timed(log.replay)
+        print(
+            f"replay {count} events over the snapshot: {replay * 1000:.0f} ms "
+            f"({len(records)} terms)"
+        )
+        compact, _ = timed(log.compact)
+        after, (compacted, count) = timed(log.replay)
+        assert compacted == records
+        log.append(events[:1000])
+        tail, _ = timed(log.replay)
+        print(
+            f"compaction {compact * 1000:.0f} ms; replay after it "
+            f"{after * 1000:.0f} ms, "
+            f"with 1000 new events {tail * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
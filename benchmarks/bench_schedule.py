@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Schedule Benchmark - horizon_scheduler full solve vs. incremental repair
+
+Builds synthetic terms spread over 30 chapters and a course plan with a quiz
+every few days and an exam every few weeks, then times the full solve over the
+horizon, a cached update and the repair after reviewing one term.
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from course_timeline import Timeline
+from horizon_scheduler import HorizonScheduler, build_tasks, term_inputs
+from synthetic_vault import course_assignments, synthetic_terms
+from timing import timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the horizon scheduler")
+    parser.add_argument("--terms", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--capacity", type=int, default=200)
+    args = parser.parse_args()
+
+    today = date.today()
+    records = synthetic_terms(args.terms, today)
+    chapters = {}
+    for name, record in records.items():
+        chapters.setdefault(record["chapter"], []).append(name)
+    plan = course_assignments(today, 1, args.days + 1)
+    assignments = Timeline.from_courses([(None, plan)]).assignments
+
+    def select(chapter_list):
+        return [name for chap in chapter_list for name in chapters.get(chap, ())]
+
+    def inputs():
+        tasks = build_tasks(assignments, select)
+        scores = {name: 1.0 for name in tasks}
+        return term_inputs(tasks, records, scores, today)
+
+    def update(scheduler, new_inputs):
+        return scheduler.update(today, args.days, args.capacity, new_inputs)
+
+    prepare, first = timed(inputs)
+    scheduler = HorizonScheduler()
+    solve, _ = timed(lambda: update(scheduler, first))
+    print(
+        f"{len(first)} terms, {sum(len(i[0]) for i in first.values())} slots "
+        f"over {args.days} days: inputs {prepare * 1000:.0f} ms, "
+        f"full solve {solve * 1000:.0f} ms "
+        f"({scheduler.slot_count()} placed, "
+        f"{len(scheduler.unscheduled)} terms unscheduled)"
+    )
+    cached, mode = timed(lambda: update(scheduler, first))
+    print(f"unchanged update: {cached * 1000:.1f} ms ({mode})")
+
+    reviewed = next(iter(first))
+    records[reviewed] = {
+        **records[reviewed],
+        "review_count": records[reviewed]["review_count"] + 1,
+        "next_review": (today + timedelta(days=7)).isoformat(),
+    }
+    second = inputs()
+    repair, mode = timed(lambda: update(scheduler, second))
+    full = HorizonScheduler()
+    resolve, _ = timed(lambda: update(full, second))
+    print(
+        f"after one review: {repair * 1000:.1f} ms ({mode}) "
+        f"vs full re-solve {resolve * 1000:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Scoring Benchmark - Per-term calculate_study_priority vs columnar priority_scoring
+
+Scores a synthetic glossary with both implementations, checks that every score
+is identical and reports the speedup. The columnar path uses NumPy when it is
+installed and its pure-Python loop otherwise.
+"""
+import argparse
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import priority_scoring
+from glossary_planner import GlossaryStudyPlanner
+from synthetic_vault import synthetic_terms
+from timing import best_of
+
+ODD_VALUES = {
+    "exam_importance": [None, "unknown"],
+    "study_importance": [None, "unknown"],
+    "mastery_level": [None, 2.5, "high"],
+    "last_reviewed": ["not-a-date", (date.today() + timedelta(days=3)).isoformat()],
+}
+
+
+def scored_terms(count: int, seed: int = 0):
+    """
+    synthetic_terms (80% reviewed) with some fields replaced by odd values, so
+    every branch of the scoring formula is covered
+    """
+    rng = random.Random(seed)
+    terms = list(synthetic_terms(count, reviewed_share=0.8, seed=seed).values())
+    for term in terms:
+        for field, values in ODD_VALUES.items():
+            if rng.random() < 0.05:
+                term[field] = rng.choice(values)
+    return terms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark study priority scoring")
+    parser.add_argument(
+        "--terms", type=int, nargs="+", default=[1000, 10000, 100000]
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement")
+    args = parser.parse_args()
+
+    # calculate_study_priority only reads its argument, so no vault is needed
+    scalar = GlossaryStudyPlanner.calculate_study_priority
+    backend = "numpy" if priority_scoring.np is not None else "pure Python"
+    print(f"Columnar backend: {backend}")
+    print(f"{'terms':>8}{'scalar':>12}{'columnar':>12}{'speedup':>10}")
+    for count in args.terms:
+        terms = scored_terms(count)
+        scalar_time, expected = best_of(
+            lambda: [scalar(None, t) for t in terms], args.runs
+        )
+        columnar_time, scores = best_of(
+            lambda: priority_scoring.score_terms(terms), args.runs
+        )
+        if scores != expected:
+            mismatches = sum(a != b for a, b in zip(scores, expected))
+            print(f"❌ {mismatches} scores differ from calculate_study_priority")
+            return 1
+        print(
+            f"{count:>8}{scalar_time * 1000:>10.1f}ms{columnar_time * 1000:>10.1f}ms"
+            f"{scalar_time / columnar_time:>9.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
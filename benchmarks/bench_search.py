@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Search Benchmark - vault_search index build, incremental update and query latency
+
+Generates a synthetic vault (chapter notes, topic pages, glossary) in a temp
+directory, builds the BM25 index, edits one file and re-syncs, then times a mix
+of plain, chapter-filtered and term-filtered queries.
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from synthetic_vault import stem, term_names
+from timing import timed
+from vault_search import SearchIndex
+
+VOCABULARY = [f"word{n}" for n in range(20000)] + [
+    "plasmid",
+    "conjugation",
+    "transduction",
+    "bacteria",
+    "ribosome",
+    "antibody",
+    "virus",
+    "protein",
+]
+TOPICS = [stem(name) for name in term_names(2000)]
+
+
+def write_vault(notes: Path, lines: int, seed: int = 0):
+    """Chapter notes plus topic pages adding up to about `lines` lines"""
+    rng = random.Random(seed)
+    # Zipf-ish word choice so common words have long posting lists
+    weights = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+    def sentence():
+        words = rng.choices(VOCABULARY, weights=weights, k=rng.randint(6, 16))
+        if rng.random() < 0.2:
+            topic = rng.choice(TOPICS)
+            words.append(f"[[../../topics/{topic}|{topic}]]")
+        return " ".join(words)
+
+    written = 0
+    chapter = 0
+    while written < lines * 0.8:
+        chapter += 1
+        for part in range(1, 6):
+            path = notes / "chapters" / f"ch{chapter}" / f"part {part}.wiki"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            body = [f"= Chapter {chapter} part {part} ="]
+            for section in range(20):
+                body.append(f"== Section {section} ==")
+                body.extend(f"- {sentence()}" for _ in range(rng.randint(5, 15)))
+            path.write_text("\n".join(body) + "\n")
+            written += len(body)
+    (notes / "topics").mkdir(parents=True, exist_ok=True)
+    glossary = ["= Glossary =", "== T =="]
+    for topic in TOPICS:
+        body = [f"= {topic} =", sentence(), "== Notes =="]
+        body.extend(f"- {sentence()}" for _ in range(rng.randint(5, 40)))
+        body.append(f"Tags: Ch. {rng.randint(1, chapter)}")
+        (notes / "topics" / f"{topic}.wiki").write_text("\n".join(body) + "\n")
+        glossary.append(f"* [[topics/{topic}|{topic}]] :: {sentence()}")
+        written += len(body)
+    (notes / "glossary.wiki").write_text("\n".join(glossary) + "\n")
+    return written + len(glossary)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vault full-text search")
+    parser.add_argument("--lines", type=int, default=300000, help="Vault size")
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        notes = Path(tmp) / "notes"
+        total = write_vault(notes, args.lines)
+        index_file = Path(tmp) / "search_index.pickle"
+
+        def cold():
+            index = SearchIndex(index_file, notes)
+            index.update()
+            index.save()
+            return index
+
+        build, index = timed(cold)
+        print(
+            f"{total} lines in {len(index.files)} files: {len(index.sections)} "
+            f"sections, {len(index.postings)} words, built in {build:.1f} s"
+        )
+
+        load, index = timed(lambda: SearchIndex(index_file, notes))
+        unchanged, _ = timed(index.update)
+        edited = notes / "topics" / f"{TOPICS[7]}.wiki"
+        edited.write_text(edited.read_text() + "- plasmid conjugation addendum\n")
+        incremental, (changed, _) = timed(index.update)
+        print(
+            f"load {load * 1000:.0f} ms, sync unchanged {unchanged * 1000:.0f} ms, "
+            f"sync after editing {changed} file {incremental * 1000:.0f} ms"
+        )
+
+        rng = random.Random(1)
+        cases = {
+            "plain": lambda q: index.search(q),
+            "--chapter": lambda q: index.search(q, chapter="3"),
+            "--term": lambda q: index.search(q, term=TOPICS[7]),
+        }
+        for label, run in cases.items():
+            timings = []
+            for _ in range(args.queries):
+                query = " ".join(rng.sample(VOCABULARY[:200] + VOCABULARY[-8:], 2))
+                timings.append(timed(lambda: run(query))[0])
+            print(
+                f"{label:<10} median {statistics.median(timings) * 1000:6.2f} ms"
+                f"   max {max(timings) * 1000:6.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Selection Benchmark - Choosing a plan's terms from n scored candidates
+
+Compares the old full sort against heap top-k for the deterministic plan, and
+random.choices (with replacement, so terms can repeat) against the weighted
+sampler without replacement used by --randomize.
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from priority_scoring import top_k_indices, weighted_sample_indices
+from timing import best_of
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark study plan selection")
+    parser.add_argument(
+        "--terms", type=int, nargs="+", default=[10000, 100000, 1000000]
+    )
+    parser.add_argument("-k", type=int, default=10, help="Terms per plan")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{'terms':>8}{'sort':>10}{'top-k':>10}{'choices':>10}{'sampler':>10}"
+        f"{'repeats':>9}"
+    )
+    for count in args.terms:
+        rng = random.Random(args.seed)
+        # Priority scores are rounded to 2 places, so ties are common
+        scores = [round(rng.uniform(0, 120), 2) for _ in range(count)]
+        entries = [{"priority_score": score} for score in scores]
+
+        def full_sort():
+            ranked = sorted(entries, key=lambda x: x["priority_score"], reverse=True)
+            return ranked[: args.k]
+
+        sort_time, expected = best_of(full_sort, args.runs)
+        heap_time, selected = best_of(lambda: top_k_indices(scores, args.k), args.runs)
+        if [entries[i] for i in selected] != expected:
+            print("❌ top-k differs from the full sort")
+            return 1
+
+        choices_time, drawn = best_of(
+            lambda: rng.choices(entries, weights=scores, k=args.k), args.runs
+        )
+        sampler_time, sampled = best_of(
+            lambda: weighted_sample_indices(scores, args.k, rng), args.runs
+        )
+        if len(set(sampled)) != len(sampled):
+            print("❌ sampler returned a repeated term")
+            return 1
+        repeats = len(drawn) - len({id(entry) for entry in drawn})
+
+        print(
+            f"{count:>8}{sort_time * 1000:>8.1f}ms{heap_time * 1000:>8.1f}ms"
+            f"{choices_time * 1000:>8.1f}ms{sampler_time * 1000:>8.1f}ms{repeats:>9}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark - Wall-clock time of glossary_planner.py commands, cold vs warm caches
+
+Runs against a throwaway copy of the project so review data is never touched.
+"cold" deletes notes/data (index + YAML snapshots) before every run; "warm"
+reuses them, which is the normal interactive case.
+"""
+import argparse
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from timing import timed
+
+PROJECT_DIR = Path(__file__).parent.parent
+COPY_DIRS = ["scripts", "notes", "config", "plans"]
+
+
+def make_sandbox(tmp: Path) -> Path:
+    """Copy the parts of the project the planner reads into `tmp`"""
+    for name in COPY_DIRS:
+        shutil.copytree(
+            PROJECT_DIR / name,
+            tmp / name,
+            ignore=shutil.ignore_patterns("__pycache__", "data", "*.pdf", "*.png"),
+        )
+    return tmp
+
+
+def time_command(sandbox: Path, argv, runs: int, cold: bool):
+    """Median and min wall time of `runs` invocations"""
+    planner = str(sandbox / "scripts" / "glossary_planner.py")
+    timings = []
+    for _ in range(runs):
+        if cold:
+            shutil.rmtree(sandbox / "notes" / "data", ignore_errors=True)
+        elapsed, _ = timed(
+            lambda: subprocess.run(
+                [sys.executable, planner, *argv],
+                stdout=subprocess.DEVNULL,
+                check=True,
+            )
+        )
+        timings.append(elapsed)
+    return statistics.median(timings), min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark planner CLI startup")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per scenario")
+    parser.add_argument(
+        "--term", default="Plasmid", help="Term used for --mark-reviewed"
+    )
+    args = parser.parse_args()
+
+    scenarios = [
+        ("plan", []),
+        ("--mark-reviewed", ["--mark-reviewed", args.term]),
+    ]
+    baseline = [sys.executable, "-c", "pass"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sandbox = make_sandbox(Path(tmp))
+        elapsed, _ = timed(
+            lambda: [subprocess.run(baseline, check=True) for _ in range(args.runs)]
+        )
+        interpreter = elapsed / args.runs
+
+        print(f"Bare interpreter startup: {interpreter * 1000:.0f} ms")
+        print(f"{'command':<18}{'cache':<8}{'median':>10}{'min':>10}")
+        for label, argv in scenarios:
+            for cold in (True, False):
+                median, best = time_command(sandbox, argv, args.runs, cold)
+                print(
+                    f"{label:<18}{'cold' if cold else 'warm':<8}"
+                    f"{median * 1000:>8.0f}ms{best * 1000:>8.0f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
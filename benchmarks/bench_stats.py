@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Statistics Benchmark - study_stats rebuild vs. cached report and per-review patch
+
+Builds the aggregates for N synthetic terms (30 chapters, a few tags each),
+then times saving them, loading the cache and answering every --stats query,
+and patching them for one review, against a full rebuild.
+"""
+import argparse
+import sys
+import tempfile
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from study_stats import StudyStats
+from synthetic_vault import synthetic_terms
+from term_store import Interner, TermRecord
+from timing import timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the study statistics")
+    parser.add_argument("--terms", type=int, default=200000)
+    args = parser.parse_args()
+
+    today = date.today()
+    interner = Interner()
+    terms = {
+        name: TermRecord(interner, **term)
+        for name, term in synthetic_terms(args.terms, today, 0.7).items()
+    }
+    days = Counter(today.toordinal() - n % 30 for n in range(args.terms))
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = Path(tmp) / "study_stats.pickle"
+        stats = StudyStats(cache_file)
+        build, _ = timed(lambda: stats.build(terms, {"metadata": 1}, days))
+        stats.save()
+
+        def report(stats):
+            stats.chapters()
+            stats.tags(15)
+            stats.due(today)
+            stats.overdue_by_chapter(today)
+            stats.reviews_per_day(today, 14)
+            return stats.readiness(["3", "4", "5"], today)
+
+        cached, ready = timed(lambda: report(StudyStats(cache_file)))
+        print(
+            f"{args.terms} terms: rebuild {build * 1000:.0f} ms, cached report "
+            f"{cached * 1000:.1f} ms ({ready['terms']} terms in chapters 3-5)"
+        )
+
+        record = next(iter(terms.values()))
+        old = (record.mastery_level, record.next_review)
+        new = (5, (today + timedelta(days=30)).isoformat())
+
+        def patch():
+            stats.update_term(record.chapter, record.tags, old, new)
+            stats.add_reviews([today])
+            stats.save()
+
+        patched, _ = timed(patch)
+        record.update(mastery_level=new[0], next_review=new[1])
+        full = StudyStats()
+        full.build(terms, {"metadata": 1}, days + Counter([today.toordinal()]))
+        assert report(stats) == report(full) and +stats.total() == +full.total()
+        print(f"one review: patch and save {patched * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
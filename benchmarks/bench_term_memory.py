@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Term Memory Benchmark - Retained memory of the parsed term table, dicts vs TermRecord
+
+Builds a synthetic glossary twice from the same per-term inputs: once as the
+original dict-of-dicts, once as interned TermRecord objects. Also measures the
+study plan step: copying every eligible term into a new dict, against
+PlanEntry views of only the selected terms. Sizes come from tracemalloc.
+"""
+import argparse
+import gc
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from synthetic_vault import synthetic_terms
+from term_store import Interner, PlanEntry, TermRecord
+
+
+
+def _copy(text: str) -> str:
+    """An equal string that is a new object"""
+    return (" " + text)[1:]
+
+
+def raw_terms(count: int, seed: int = 0):
+    """
+    synthetic_terms (half reviewed) as a YAML/JSON parse produces them: every
+    string is its own object, even when the same chapter or tag repeats.
+    """
+    rng = random.Random(seed)
+    terms = synthetic_terms(count, reviewed_share=0.5, seed=seed)
+    names = list(terms)
+    for name, term in terms.items():
+        fields = {
+            field: _copy(value) if isinstance(value, str) else value
+            for field, value in term.items()
+        }
+        fields["letter_section"] = _copy(name[0].upper())
+        fields["tags"] = [_copy(tag) for tag in term["tags"]]
+        fields["related_terms"] = [
+            names[rng.randrange(count)] for _ in range(rng.randint(0, 3))
+        ]
+        fields["all_chapters"] = (
+            [_copy(term["chapter"])] if rng.random() < 0.7 else []
+        )
+        yield name, fields
+
+
+def build_dicts(count: int):
+    return {name: dict(fields) for name, fields in raw_terms(count)}
+
+
+def build_records(count: int):
+    interner = Interner()
+    return {
+        sys.intern(name): TermRecord(interner, **fields)
+        for name, fields in raw_terms(count)
+    }
+
+
+def plan_copies(terms, k: int):
+    """The original generate_study_plan: a new dict for every eligible term"""
+    eligible = [
+        {
+            "name": name,
+            "definition": data["definition"],
+            "chapter": data.get("chapter", "Unassigned"),
+            "exam_importance": data.get("exam_importance", "medium"),
+            "study_importance": data.get("study_importance", "medium"),
+            "mastery_level": data.get("mastery_level", 0),
+            "priority_score": 1.0,
+            "last_reviewed": data.get("last_reviewed", "Never"),
+            "wiki_link": data["wiki_link"],
+            "letter_section": data["letter_section"],
+            "tags": data.get("tags", []),
+            "related_terms": data.get("related_terms", []),
+        }
+        for name, data in terms.items()
+    ]
+    return eligible[:k]
+
+
+def plan_views(terms, k: int):
+    matching = list(terms.items())
+    return [PlanEntry(name, record, 1.0) for name, record in matching[:k]]
+
+
+def measure(func, *args):
+    """(retained bytes, peak bytes) of func's result"""
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark term table memory")
+    parser.add_argument("--terms", type=int, default=200000)
+    parser.add_argument("-k", type=int, default=10, help="Terms per plan")
+    args = parser.parse_args()
+
+    mib = 1024 * 1024
+    print(f"{args.terms} synthetic terms")
+    print(f"{'':<24}{'retained':>12}{'peak':>12}")
+    results = {}
+    for label, build, plan in (
+        ("dict-of-dicts", build_dicts, plan_copies),
+        ("TermRecord", build_records, plan_views),
+    ):
+        terms, current, peak = measure(build, args.terms)
+        print(f"{label + ' table':<24}{current / mib:>10.1f}MB{peak / mib:>10.1f}MB")
+        _, plan_current, plan_peak = measure(plan, terms, args.k)
+        print(
+            f"{label + ' plan':<24}{plan_current / mib:>10.2f}MB"
+            f"{plan_peak / mib:>10.1f}MB"
+        )
+        results[label] = current
+        del terms
+    saved = 1 - results["TermRecord"] / results["dict-of-dicts"]
+    print(f"Term table memory reduced by {saved:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tokenizer Benchmark - Compares the legacy per-line regex scan with the streaming tokenizer
+"""
+import argparse
+import random
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from parallel_scan import extract_wiki_metadata
+from synthetic_vault import WORDS, stem, term_names
+from timing import best_of
+
+
+def legacy_extract(wiki_path):
+    """The original _extract_wiki_metadata: f.read(), split, three regexes per line"""
+    with open(wiki_path, "r") as f:
+        content = f.read()
+    metadata = {"chapters": [], "tags": [], "related_terms": []}
+    for line in content.split("\n"):
+        line = line.strip()
+        for match in re.findall(r"(?:Ch\.?\s*|Chapter\s+)(\d+)", line, re.IGNORECASE):
+            if match not in metadata["chapters"]:
+                metadata["chapters"].append(match)
+        tag_match = re.match(r"^Tags?\s*:\s*(.+)", line, re.IGNORECASE)
+        if tag_match:
+            metadata["tags"].extend(t.strip() for t in tag_match.group(1).split(","))
+        for link in re.findall(r"\[\[([^|\]]+)(?:\|[^\]]+)?\]\]", line):
+            if link.startswith("topics/"):
+                term_name = link.replace("topics/", "").replace("_", " ").title()
+                if term_name not in metadata["related_terms"]:
+                    metadata["related_terms"].append(term_name)
+    return metadata
+
+
+def streaming_extract(wiki_path):
+    """Same result computed from the shared streaming tokenizer"""
+    return extract_wiki_metadata(wiki_path)
+
+
+def write_sample(path, size_mb, unique_links, seed=0):
+    """Write a link-heavy wiki page of roughly `size_mb` megabytes"""
+    rng = random.Random(seed)
+    names = term_names(unique_links)
+    written = 0
+    with open(path, "w") as f:
+        while written < size_mb * 1024 * 1024:
+            kind = rng.random()
+            if kind < 0.05:
+                line = f"== Section {rng.randint(1, 500)} =="
+            elif kind < 0.08:
+                line = f"Tags: Ch. {rng.randint(1, 30)}, {rng.choice(WORDS)}"
+            else:
+                parts = []
+                for _ in range(rng.randint(3, 8)):
+                    r = rng.random()
+                    if r < 0.3:
+                        name = rng.choice(names)
+                        parts.append(f"[[topics/{stem(name)}|{name}]]")
+                    elif r < 0.4:
+                        parts.append(f"see Chapter {rng.randint(1, 30)}")
+                    else:
+                        parts.append(rng.choice(WORDS))
+                line = "  - " + " ".join(parts)
+            f.write(line + "\n")
+            written += len(line) + 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark wiki metadata extraction")
+    parser.add_argument("--size-mb", type=float, default=4, help="Sample file size")
+    parser.add_argument(
+        "--unique-links", type=int, default=5000, help="Distinct topic links"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "sample.wiki"
+        write_sample(path, args.size_mb, args.unique_links)
+        size_mb = path.stat().st_size / (1024 * 1024)
+
+        legacy_time, legacy_result = best_of(lambda: legacy_extract(path), args.repeat)
+        stream_time, stream_result = best_of(
+            lambda: streaming_extract(path), args.repeat
+        )
+
+    assert legacy_result == stream_result, "tokenizer output differs from legacy scan"
+    print(f"Sample: {size_mb:.1f} MB, {args.unique_links} distinct links")
+    print(f"  legacy    : {legacy_time:.3f}s  ({size_mb / legacy_time:.1f} MB/s)")
+    print(f"  streaming : {stream_time:.3f}s  ({size_mb / stream_time:.1f} MB/s)")
+    print(f"  speedup   : {legacy_time / stream_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
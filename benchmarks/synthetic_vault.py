@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Synthetic Vault - Deterministic generator of a full study vault for the pipeline benchmarks
+
+Writes a sandbox laid out like the project, so glossary_planner.py runs against
+it unchanged (scripts/ is a symlink to this repo's scripts):
+  - notes/glossary.wiki:  every term under its letter heading
+  - notes/topics/*.wiki:  a page for a share of the terms, with a chapter
+                          mention, "See also" links to related topics and tags
+  - notes/chapters/chN/part K.wiki: chapter notes linking the chapter's topics
+  - config/glossary_config.yaml: chapter, importance and tags for most terms
+  - plans/microbiology.yaml: a quiz every few days and exams, around today
+  - notes/data/glossary_metadata.json: review data for about half the terms
+
+The same (terms, seed) always produce the same vault; only dates follow today.
+The in-memory pieces (synthetic_terms, config_entry, review_metadata,
+course_assignments, review_events) are also what the single-module benchmarks
+run on.
+
+Usage:
+    python3 benchmarks/synthetic_vault.py /tmp/vault --terms 10000
+    python3 /tmp/vault/scripts/glossary_planner.py --stats
+"""
+import argparse
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_DIR / "scripts"))
+from glossary_study_manager import render_config
+from metadata_store import write_json_atomic
+from review_log import review_event
+
+PREFIXES = [
+    "Strepto", "Staphylo", "Myco", "Lacto", "Clostri", "Entero", "Pseudo",
+    "Bacillo", "Helico", "Vibrio", "Rhizo", "Nitro", "Thermo", "Halo", "Cyano",
+    "Proteo", "Chlamy", "Trepo", "Borre", "Legio",
+]  # fmt: skip
+ROOTS = [
+    "coccus", "bacter", "phage", "plasmid", "toxin", "genesis", "lysis", "spore",
+    "flagellin", "capsid", "ribosome", "kinase", "ase", "philia", "trophy",
+    "cyte", "mycin", "zyme", "some", "viridae",
+]  # fmt: skip
+TAGS = [
+    "biochemistry", "genetics", "immunology", "metabolism", "virology", "lab",
+    "pathogens", "cell structure", "growth", "antibiotics", "enzymes", "ecology",
+    "taxonomy", "proteins", "membranes", "transport",
+]  # fmt: skip
+WORDS = (
+    "cell membrane protein gene enzyme bacteria host replication synthesis "
+    "transfer pathway structure culture colony growth medium antigen binding "
+    "energy molecule strain infection response layer wall"
+).split()
+IMPORTANCE = ["high", "medium", "medium", "low"]
+CHAPTERS = 30
+REVIEW_FIELDS = ("last_reviewed", "review_count", "mastery_level", "next_review")
+
+
+def term_names(count: int) -> List[str]:
+    """Distinct names that survive the topic file round trip (stem -> .title())"""
+    names = []
+    for n in range(count):
+        prefix = PREFIXES[n % len(PREFIXES)]
+        root = ROOTS[(n // len(PREFIXES)) % len(ROOTS)]
+        names.append(f"{prefix}{root} {n}")
+    return names
+
+
+def stem(name: str) -> str:
+    return name.lower().replace(" ", "_")
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def synthetic_terms(
+    count: int, today: date = None, reviewed_share: float = 1.0, seed: int = 0
+) -> Dict[str, Dict]:
+    """
+    `count` terms (see term_names) as the planner merges them: definition,
+    topic link, config fields and review data (empty for unreviewed terms)
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    terms = {}
+    for name in term_names(count):
+        term = {
+            "definition": _sentence(rng, rng.randint(6, 18)),
+            "wiki_link": f"topics/{stem(name)}",
+            "chapter": str(rng.randint(1, CHAPTERS)),
+            "exam_importance": rng.choice(IMPORTANCE),
+            "study_importance": rng.choice(IMPORTANCE),
+            "tags": rng.sample(TAGS, rng.randint(0, 3)),
+            "last_reviewed": None,
+            "review_count": 0,
+            "mastery_level": 0,
+            "next_review": None,
+        }
+        if rng.random() < reviewed_share:
+            last = today - timedelta(days=rng.randint(1, 60))
+            term.update(
+                last_reviewed=last.isoformat(),
+                review_count=rng.randint(1, 8),
+                mastery_level=rng.randint(0, 5),
+                next_review=(last + timedelta(days=rng.randint(1, 60))).isoformat(),
+            )
+        terms[name] = term
+    return terms
+
+
+def config_entry(term: Dict) -> Dict:
+    """A term's glossary_config.yaml entry"""
+    return {
+        "chapter": int(term["chapter"]),
+        "exam_importance": term["exam_importance"],
+        "study_importance": term["study_importance"],
+        "tags": [f"Ch. {term['chapter']}"] + term["tags"],
+        "notes": "",
+    }
+
+
+def review_metadata(terms: Dict[str, Dict]) -> Dict[str, Dict]:
+    """glossary_metadata.json for the reviewed terms"""
+    return {
+        name: {field: term[field] for field in REVIEW_FIELDS}
+        for name, term in terms.items()
+        if term["last_reviewed"]
+    }
+
+
+def review_events(
+    terms: Dict[str, Dict], count: int, today: date = None, seed: int = 0
+) -> List[Tuple]:
+    """
+    `count` sm2 review events (see review_log.review_event) for the reviewed
+    terms, spread evenly over the year before today
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    names = [name for name, term in terms.items() if term["last_reviewed"]]
+    events = []
+    for n in range(count):
+        name = rng.choice(names)
+        previous = terms[name]
+        reviewed_on = today - timedelta(days=365 - n * 365 // count)
+        next_review = reviewed_on + timedelta(days=rng.randint(1, 60))
+        update = {
+            "mastery_level": min(5, previous["mastery_level"] + rng.choice((0, 1))),
+            "next_review": next_review.isoformat(),
+            "sm2_ease": round(rng.uniform(1.3, 3.0), 4),
+            "sm2_repetitions": rng.randint(0, 8),
+        }
+        events.append(
+            review_event(name, previous, update, rng.randint(1, 4), "sm2", reviewed_on)
+        )
+    return events
+
+
+def course_assignments(today: date, first: int, last: int) -> List[Dict]:
+    """
+    Plan file assignments due `first` to `last` days from today: a quiz every 4
+    days over two chapters, replaced by an exam over six every 4 weeks
+    """
+    assignments = []
+    for offset in range(first, last, 4):
+        chapter = (offset // 4) % CHAPTERS + 1
+        if offset % 28 == 0:
+            kind, count = "Exam", 6
+        else:
+            kind, count = "Quiz", 2
+        assignments.append(
+            {
+                "name": f"{kind} {offset + 13}",
+                "date": (today + timedelta(days=offset)).isoformat(),
+                "topics": [
+                    f"Chapter {(chapter + i - 1) % CHAPTERS + 1}: "
+                    f"Topic {(chapter + i - 1) % CHAPTERS + 1}"
+                    for i in range(count)
+                ],
+            }
+        )
+    return assignments
+
+
+def write_vault(
+    root: Path,
+    terms: int,
+    topic_share: float = 0.5,
+    config_share: float = 0.8,
+    reviewed_share: float = 0.5,
+    seed: int = 0,
+) -> Dict[str, int]:
+    """Generate the sandbox under `root`; returns counts of what was written"""
+    today = date.today()
+    term_data = synthetic_terms(terms, today, reviewed_share, seed)
+    rng = random.Random(seed + 1)
+    root = Path(root)
+    notes = root / "notes"
+    for directory in (
+        notes / "topics",
+        notes / "data",
+        root / "config",
+        root / "plans",
+    ):
+        directory.mkdir(parents=True, exist_ok=True)
+    scripts = root / "scripts"
+    if not scripts.exists():
+        scripts.symlink_to(PROJECT_DIR / "scripts", target_is_directory=True)
+
+    names = list(term_data)
+
+    # Topic pages for a share of the terms
+    topics = [name for name in names if rng.random() < topic_share]
+    by_chapter: Dict[str, List[str]] = {}
+    for name in topics:
+        term = term_data[name]
+        by_chapter.setdefault(term["chapter"], []).append(name)
+        related = rng.sample(topics, min(len(topics), rng.randint(1, 5)))
+        body = [
+            f"= {name} =",
+            "",
+            term["definition"],
+            "",
+            "== Key Features ==",
+            f"- Covered in Chapter {term['chapter']}",
+            f"- {_sentence(rng, 10)}",
+            "",
+            "== See also ==",
+        ]
+        body += [
+            f"- [[topics/{stem(other)}|{other}]]" for other in related if other != name
+        ]
+        body += ["", f"Tags: Ch. {term['chapter']}, " + ", ".join(term["tags"])]
+        (notes / "topics" / f"{stem(name)}.wiki").write_text("\n".join(body) + "\n")
+
+    # Chapter notes: about one part per 200 topics of the chapter
+    chapter_notes = 0
+    for chapter in range(1, CHAPTERS + 1):
+        chapter_topics = by_chapter.get(str(chapter), [])
+        parts = max(1, len(chapter_topics) // 200)
+        directory = notes / "chapters" / f"ch{chapter}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "index.wiki").write_text(
+            f"# Chapter {chapter}\n\n"
+            + "".join(f"[[part {part}]]\n" for part in range(1, parts + 1))
+        )
+        for part in range(1, parts + 1):
+            body = [f"= Chapter {chapter}, part {part} =", ""]
+            for name in chapter_topics[part - 1 :: parts]:
+                body.append(
+                    f"- {_sentence(rng, 8)} See [[../../topics/{stem(name)}|{name}]]."
+                )
+            (directory / f"part {part}.wiki").write_text("\n".join(body) + "\n")
+            chapter_notes += 1
+
+    # Glossary, by letter
+    glossary = ["= Glossary =", ""]
+    letter = None
+    for name in sorted(names):
+        if name[0].upper() != letter:
+            letter = name[0].upper()
+            glossary += ["", f"== {letter} =="]
+        definition = term_data[name]["definition"]
+        glossary.append(f"* [[topics/{stem(name)}|{name}]] :: {definition}")
+    (notes / "glossary.wiki").write_text("\n".join(glossary) + "\n")
+
+    # Static config for most terms
+    config = {
+        name: config_entry(term_data[name])
+        for name in names
+        if rng.random() < config_share
+    }
+    (root / "config" / "glossary_config.yaml").write_text(render_config(config))
+
+    # Course plan from 12 days ago to 90 days ahead
+    lines = ["course: Synthetic Microbiology", "assignments:"]
+    for assignment in course_assignments(today, -12, 90):
+        lines += [
+            f"  - name: {assignment['name']}",
+            f"    date: '{assignment['date']}'",
+            "    topics:",
+        ]
+        lines += [f"      - {topic}" for topic in assignment["topics"]]
+    (root / "plans" / "microbiology.yaml").write_text("\n".join(lines) + "\n")
+
+    # Review data for the reviewed share of the terms
+    metadata = review_metadata(term_data)
+    write_json_atomic(notes / "data" / "glossary_metadata.json", metadata)
+
+    return {
+        "terms": len(names),
+        "topics": len(topics),
+        "chapter_notes": chapter_notes,
+        "config_entries": len(config),
+        "reviewed": len(metadata),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic study vault")
+    parser.add_argument("directory", help="Where to create the vault")
+    parser.add_argument("--terms", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    counts = write_vault(Path(args.directory), args.terms, seed=args.seed)
+    print(
+        f"✅ Wrote {counts['terms']} terms, {counts['topics']} topic pages, "
+        f"{counts['chapter_notes']} chapter notes, {counts['config_entries']} "
+        f"config entries and review data for {counts['reviewed']} terms "
+        f"to {args.directory}"
+    )
+
+
+if __name__ == "__main__":
+    main()
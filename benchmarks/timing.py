@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Timing - Wall-clock helpers shared by the benchmarks
+
+    elapsed, result = timed(lambda: store.load_all())
+    fastest, result = best_of(lambda: index.select(chapter="7"), runs=5)
+"""
+import time
+
+
+def timed(func):
+    """(seconds, result) of one call"""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def best_of(func, runs: int):
+    """(fastest of `runs` calls in seconds, result of the last call)"""
+    timings = []
+    for _ in range(runs):
+        elapsed, result = timed(func)
+        timings.append(elapsed)
+    return min(timings), result
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Auto Link - Batch version of the Vim LinkToTopic mapping for every chapter note
+
+Every glossary term with a topic page (plus its spaced/underscored, plural and
+singular forms) goes into one Aho-Corasick automaton, so each chapter file is
+scanned once no matter how many terms there are. The first unlinked mention of
+each term in a file becomes [[../../topics/term|mention]]; headings, existing
+links, URLs, inline code, {{{ preformatted }}} blocks and Tags: lines are left
+alone, and terms the file already links to are skipped.
+
+Runs as a dry run by default and prints a unified diff; --apply writes the files
+(atomically, skipping any file edited meanwhile).
+
+Usage:
+    python3 scripts/auto_link.py
+    python3 scripts/auto_link.py --apply --parallel
+"""
+import argparse
+import difflib
+import os
+import posixpath
+import re
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from link_graph import resolve_link
+from parallel_scan import (
+    BATCHES_PER_WORKER,
+    MIN_BATCH_SIZE,
+    PARALLEL_MIN_FILES,
+    default_workers,
+)
+from wiki_tokenizer import ENTRY, tokenize_file
+
+PROJECT_DIR = Path(__file__).parent.parent
+NOTES_DIR = PROJECT_DIR / "notes"
+
+# Shorter forms ("er", "is") would match inside ordinary prose
+MIN_FORM_LENGTH = 3
+
+# Spans inside a line that must never be rewritten
+PROTECTED_RE = re.compile(r"\[\[.*?\]\]|https?://\S+|`[^`]*`")
+LINK_RE = re.compile(r"\[\[([^|\]]+)(?:\|[^\]]*)?\]\]")
+
+
+def plural(word: str) -> str:
+    if word.endswith("y") and len(word) > 1 and word[-2] not in "aeiou":
+        return word[:-1] + "ies"
+    if word.endswith(("s", "x", "z", "ch", "sh")):
+        return word + "es"
+    return word + "s"
+
+
+def singular(word: str) -> Optional[str]:
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("ses", "xes", "zes", "ches", "shes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return None
+
+
+def surface_forms(term_name: str, topic_stem: str) -> List[str]:
+    """Lowercased spellings of a term that should link to its topic page"""
+    forms = {}
+    for name in (term_name, topic_stem):
+        spaced = " ".join(name.replace("_", " ").lower().split())
+        for form in (spaced, plural(spaced), singular(spaced)):
+            if form and len(form) >= MIN_FORM_LENGTH:
+                forms[form] = None
+                forms[form.replace(" ", "_")] = None
+    return list(forms)
+
+
+class Automaton:
+    """
+    Aho-Corasick automaton over lowercased patterns. Each state keeps every
+    pattern ending there (its own and those reached through failure links)
+    as (length, value) pairs, so one left-to-right pass finds all matches.
+    """
+
+    def __init__(self, patterns: Dict[str, object]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[Tuple] = [()]
+        for pattern, value in patterns.items():
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                state = next_state
+            self.out[state] = ((len(pattern), value),)
+
+        # Breadth-first, so a state's failure target is complete before its children
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, child in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+                queue.append(child)
+
+    def __len__(self):
+        return len(self.goto)
+
+    def matches(self, text: str) -> List[Tuple[int, int, object]]:
+        """(start, end, value) of every pattern occurrence, overlapping included"""
+        goto, fail, out = self.goto, self.fail, self.out
+        found = []
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                end = index + 1
+                for length, value in out[state]:
+                    found.append((end - length, end, value))
+        return found
+
+
+def lower_same_length(text: str) -> str:
+    """text.lower(), keeping character positions (a few characters lowercase to two)"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+def read_topics(glossary_file: Path, notes_dir: Path) -> Dict[str, Tuple[str, str]]:
+    """{vault-relative topic path: (term name, topic stem)} for terms with a page"""
+    topics = {}
+    glossary = glossary_file.resolve().relative_to(notes_dir.resolve()).as_posix()
+    for kind, value, _ in tokenize_file(glossary_file, inline=False):
+        if kind != ENTRY:
+            continue
+        wiki_link, term_name, _ = value
+        topic = resolve_link(wiki_link, glossary)
+        if topic and topic not in topics and (notes_dir / topic).exists():
+            topics[topic] = (term_name.strip(), posixpath.basename(topic)[:-5])
+    return topics
+
+
+class AutoLinker:
+    """Links first mentions of glossary terms in one file at a time"""
+
+    def __init__(self, topics: Dict[str, Tuple[str, str]]):
+        patterns = {}
+        for topic, (term_name, stem) in topics.items():
+            for form in surface_forms(term_name, stem):
+                # The first term claiming a spelling keeps it
+                patterns.setdefault(form, topic)
+        self.automaton = Automaton(patterns)
+        self.topics = topics
+
+    def link_text(self, text: str, relpath: str) -> Tuple[str, List[Tuple]]:
+        """(new text, [(line, topic, mention)]) for one file's content"""
+        lines = text.split("\n")
+        linked = set()
+        for target in LINK_RE.findall(text):
+            resolved = resolve_link(target, relpath)
+            if resolved:
+                linked.add(resolved)
+        directory = posixpath.dirname(relpath)
+
+        added = []
+        preformatted = False
+        for lineno, line in enumerate(lines):
+            stripped = line.strip()
+            if stripped.startswith("{{{"):
+                preformatted = not stripped.endswith("}}}")
+                continue
+            if preformatted:
+                if stripped.startswith("}}}"):
+                    preformatted = False
+                continue
+            if not stripped or stripped[0] in "=%" or stripped[:5].lower() == "tags:":
+                continue
+
+            lowered = lower_same_length(line)
+            candidates = [
+                match
+                for match in self.automaton.matches(lowered)
+                if match[2] not in linked
+            ]
+            if not candidates:
+                continue
+            protected = [m.span() for m in PROTECTED_RE.finditer(line)]
+            # Leftmost-longest, whole words only, outside links/URLs/code
+            candidates.sort(key=lambda match: (match[0], match[0] - match[1]))
+            edits = []
+            last_end = 0
+            for start, end, topic in candidates:
+                if start < last_end or topic in linked:
+                    continue
+                if start > 0 and (line[start - 1].isalnum() or line[start - 1] == "_"):
+                    continue
+                if end < len(line) and (line[end].isalnum() or line[end] == "_"):
+                    continue
+                if any(s < end and start < e for s, e in protected):
+                    continue
+                edits.append((start, end, topic))
+                linked.add(topic)
+                last_end = end
+            for start, end, topic in reversed(edits):
+                mention = line[start:end]
+                target = posixpath.relpath(topic[:-5], directory or ".")
+                line = f"{line[:start]}[[{target}|{mention}]]{line[end:]}"
+                added.append((lineno + 1, topic, mention))
+            lines[lineno] = line
+        added.sort()
+        return "\n".join(lines), added
+
+    def link_file(self, path: str, relpath: str, apply: bool, diff: bool) -> Dict:
+        """Link one file; writes it with `apply`, returns the added links and diff"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            st = os.stat(path)
+        except (OSError, UnicodeDecodeError) as e:
+            return {"relpath": relpath, "added": [], "error": str(e)}
+        new_text, added = self.link_text(text, relpath)
+        result = {"relpath": relpath, "added": added}
+        if not added:
+            return result
+        if diff:
+            result["diff"] = "".join(
+                difflib.unified_diff(
+                    text.splitlines(True),
+                    new_text.splitlines(True),
+                    f"a/{relpath}",
+                    f"b/{relpath}",
+                )
+            )
+        if apply:
+            result["error"] = write_if_unchanged(path, new_text, st)
+        return result
+
+
+def write_if_unchanged(path: str, text: str, read_stat) -> Optional[str]:
+    """Atomically replace a file unless it changed since it was read; error or None"""
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        f.write(text)
+    shutil.copymode(path, tmp_file)
+    st = os.stat(path)
+    if (st.st_mtime_ns, st.st_size) != (read_stat.st_mtime_ns, read_stat.st_size):
+        os.remove(tmp_file)
+        return "changed while linking, left untouched"
+    os.replace(tmp_file, path)
+    return None
+
+
+def chapter_files(notes_dir: Path) -> List[Tuple[str, str]]:
+    """(path, vault-relative path) of every chapter note"""
+    return [
+        (str(path), path.relative_to(notes_dir).as_posix())
+        for path in sorted((notes_dir / "chapters").glob("**/*.wiki"))
+    ]
+
+
+_WORKER_LINKER: Optional[AutoLinker] = None
+
+
+def _init_worker(linker: AutoLinker):
+    global _WORKER_LINKER
+    _WORKER_LINKER = linker
+
+
+def _link_batch(batch: List[Tuple[str, str]], apply: bool, diff: bool) -> List[Dict]:
+    """Worker entry point: link one batch of files with the shared automaton"""
+    return [_WORKER_LINKER.link_file(p, r, apply, diff) for p, r in batch]
+
+
+def link_many(
+    linker: AutoLinker,
+    files: List[Tuple[str, str]],
+    apply: bool = False,
+    diff: bool = True,
+    parallel: bool = False,
+    workers: int = None,
+    min_files: int = PARALLEL_MIN_FILES,
+) -> List[Dict]:
+    """
+    Link every file, returning results in the order of `files`. With `parallel`
+    the files are split into contiguous batches for a process pool whose workers
+    receive the automaton once; small inputs always run serially.
+    """
+    workers = workers or default_workers()
+    if not parallel or workers < 2 or len(files) < min_files:
+        return [linker.link_file(p, r, apply, diff) for p, r in files]
+
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    batch_size = max(MIN_BATCH_SIZE, -(-len(files) // (workers * BATCHES_PER_WORKER)))
+    batches = [files[i : i + batch_size] for i in range(0, len(files), batch_size)]
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(batches)),
+        initializer=_init_worker,
+        initargs=(linker,),
+    ) as pool:
+        run_batch = partial(_link_batch, apply=apply, diff=diff)
+        for batch_result in pool.map(run_batch, batches):
+            results.extend(batch_result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Link first mentions of glossary terms in chapter notes"
+    )
+    parser.add_argument(
+        "--apply", action="store_true", help="Write the links (default: dry run)"
+    )
+    parser.add_argument(
+        "--no-diff", action="store_true", help="Only list the links, no diff"
+    )
+    parser.add_argument(
+        "--glossary", default="glossary.wiki", help="Glossary file (in notes/)"
+    )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Process files in a process pool (large vaults only)",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Worker processes for --parallel (default: CPUs)"
+    )
+    args = parser.parse_args()
+
+    glossary_file = NOTES_DIR / args.glossary
+    if not glossary_file.exists():
+        print(f"❌ Glossary file not found: {glossary_file}")
+        return 1
+    linker = AutoLinker(read_topics(glossary_file, NOTES_DIR))
+    files = chapter_files(NOTES_DIR)
+    results = link_many(
+        linker,
+        files,
+        apply=args.apply,
+        diff=not args.no_diff,
+        parallel=args.parallel,
+        workers=args.workers,
+    )
+
+    total = 0
+    changed_files = 0
+    for result in results:
+        if result.get("error"):
+            print(f"Warning: {result['relpath']}: {result['error']}")
+            if args.apply:
+                continue
+        if not result["added"]:
+            continue
+        changed_files += 1
+        total += len(result["added"])
+        if result.get("diff"):
+            print(result["diff"], end="")
+        else:
+            for lineno, topic, mention in result["added"]:
+                print(f"  {result['relpath']}:{lineno}  {mention} -> {topic}")
+
+    summary = f"{total} links in {changed_files} of {len(files)} chapter files"
+    if args.apply:
+        print(f"✅ Added {summary}")
+    else:
+        print(f"🔗 Would add {summary} (dry run, use --apply to write)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Config Validator - One rule table for glossary_config.yaml entries, shared by apply and validate
+
+Every field has exactly one check, looked up once per field, so a whole config
+is validated in a single pass over its entries. Problems are collected (not
+raised) as Issue records; their YAML line numbers are only looked up when there
+is something to report, by composing the YAML node tree (which keeps marks)
+instead of re-parsing on every run.
+"""
+import re
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional
+
+IMPORTANCE_LEVELS = ("high", "medium", "low")
+# Static properties live in glossary_config.yaml; review data in the metadata store
+STATIC_FIELDS = ("chapter", "exam_importance", "study_importance", "tags", "notes")
+DYNAMIC_FIELDS = ("mastery_level", "last_reviewed", "review_count", "next_review")
+
+DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}$")
+
+ERROR = "error"
+WARNING = "warning"
+
+
+class Issue:
+    """One validation problem; `field` is None for whole-entry problems"""
+
+    __slots__ = ("severity", "term", "field", "message", "line")
+
+    def __init__(self, severity: str, term: Optional[str], field, message: str):
+        self.severity = severity
+        self.term = term
+        self.field = field
+        self.message = message
+        self.line: Optional[int] = None
+
+    def __str__(self):
+        where = f"line {self.line}: " if self.line else ""
+        return f"{where}{self.message}"
+
+
+def _check_chapter(value) -> Optional[str]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        return "must be a chapter number"
+    return None
+
+
+def _check_importance(value) -> Optional[str]:
+    if value not in IMPORTANCE_LEVELS:
+        return f"must be one of {', '.join(IMPORTANCE_LEVELS)}"
+    return None
+
+
+def _check_tags(value) -> Optional[str]:
+    if value is None:
+        return None
+    if not isinstance(value, list) or not all(isinstance(t, str) for t in value):
+        return "must be a list of strings"
+    return None
+
+
+def _check_notes(value) -> Optional[str]:
+    if value is not None and not isinstance(value, str):
+        return "must be text"
+    return None
+
+
+def _check_count(value) -> Optional[str]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        return "must be a number >= 0"
+    return None
+
+
+def _check_date(value) -> Optional[str]:
+    if value is None or isinstance(value, date):
+        return None
+    if not isinstance(value, str) or not DATE_RE.match(value):
+        return "must be a YYYY-MM-DD date"
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return "is not a valid date"
+    return None
+
+
+FIELD_RULES: Dict[str, Callable] = {
+    "chapter": _check_chapter,
+    "exam_importance": _check_importance,
+    "study_importance": _check_importance,
+    "tags": _check_tags,
+    "notes": _check_notes,
+    "mastery_level": _check_count,
+    "last_reviewed": _check_date,
+    "review_count": _check_count,
+    "next_review": _check_date,
+}
+
+
+def validate_config(config, known_terms: Optional[Iterable] = None) -> List[Issue]:
+    """
+    Check a loaded config ({'terms': {name: {field: value}}}). Terms missing from
+    `known_terms` (when given) and unknown fields are warnings; bad values and a
+    malformed structure are errors.
+    """
+    if not isinstance(config, dict) or "terms" not in config:
+        return [Issue(ERROR, None, None, "Missing 'terms' section in config")]
+    terms = config["terms"]
+    if terms is None:
+        return []
+    if not isinstance(terms, dict):
+        return [Issue(ERROR, None, None, "'terms' must be a mapping of term names")]
+
+    known = set(known_terms) if known_terms is not None else None
+    rules = FIELD_RULES
+    issues = []
+    for term_name, entry in terms.items():
+        if known is not None and term_name not in known:
+            message = f"Term '{term_name}' not found in glossary"
+            issues.append(Issue(WARNING, term_name, None, message))
+        if entry is None:
+            continue
+        if not isinstance(entry, dict):
+            message = f"'{term_name}' must be a mapping of fields"
+            issues.append(Issue(ERROR, term_name, None, message))
+            continue
+        for field, value in entry.items():
+            rule = rules.get(field)
+            if rule is None:
+                message = f"Unknown field '{field}' for '{term_name}'"
+                issues.append(Issue(WARNING, term_name, field, message))
+                continue
+            problem = rule(value)
+            if problem:
+                message = f"Invalid {field} for '{term_name}': {value!r} ({problem})"
+                issues.append(Issue(ERROR, term_name, field, message))
+    return issues
+
+
+def load_yaml_plain_dates(path):
+    """
+    Parse a YAML file leaving dates as YYYY-MM-DD strings. Used when the normal
+    load fails on an impossible date (2026-13-01), so validation can point at it.
+    """
+    import yaml
+    from yaml_cache import _yaml_loader
+
+    base = _yaml_loader()
+    loader = type("PlainDateLoader", (base,), {})
+    loader.yaml_implicit_resolvers = {
+        first: [(tag, rx) for tag, rx in resolvers if not tag.endswith(":timestamp")]
+        for first, resolvers in base.yaml_implicit_resolvers.items()
+    }
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=loader)
+
+
+# "  key:" with the key bare, "double" or 'single' quoted
+KEY_LINE_RE = re.compile(
+    r"""( *)(?:"([^"]*)"|'([^']*)'|([^\s#'"][^:#]*?)) *:(?:\s|$)"""
+)
+
+
+def _scan_key_lines(path, wanted: Dict[str, List[Issue]]):
+    """
+    Fast path for block-style YAML: find term and field keys under `terms:` by
+    their indentation, without building the node tree. Returns the issues it
+    could not place.
+    """
+    term_indent = None
+    term_issues = None
+    placed = set()
+    in_terms = False
+    with open(path, "r") as f:
+        for number, line in enumerate(f, 1):
+            match = KEY_LINE_RE.match(line)
+            if not match:
+                continue
+            indent = len(match.group(1))
+            key = next(g for g in match.groups()[1:] if g is not None)
+            if indent == 0:
+                in_terms = key == "terms"
+                term_issues = None
+                continue
+            if not in_terms:
+                continue
+            if term_indent is None:
+                term_indent = indent
+            if indent == term_indent:
+                term_issues = wanted.get(key)
+                for issue in term_issues or ():
+                    issue.line = number
+                continue
+            if indent > term_indent and term_issues:
+                for issue in term_issues:
+                    if issue.field == key:
+                        issue.line = number
+                        placed.add(id(issue))
+    return [
+        issue
+        for issues in wanted.values()
+        for issue in issues
+        if issue.line is None or (issue.field is not None and id(issue) not in placed)
+    ]
+
+
+def locate_issues(path, issues: List[Issue]):
+    """
+    Fill in Issue.line for `path` (a no-op for JSON files, unparsable YAML or
+    when there are no issues). Block-style keys are found with a line scan;
+    anything left (flow mappings, odd quoting) falls back to the YAML node tree.
+    """
+    if not issues or str(path).lower().endswith(".json"):
+        return
+    wanted = {}
+    for issue in issues:
+        if issue.term is not None:
+            wanted.setdefault(str(issue.term), []).append(issue)
+    try:
+        missing = _scan_key_lines(path, wanted)
+    except OSError:
+        return
+    if missing:
+        _compose_key_lines(path, missing)
+
+
+def _compose_key_lines(path, issues: List[Issue]):
+    import yaml
+    from yaml_cache import _yaml_loader
+
+    try:
+        with open(path, "r") as f:
+            root = yaml.compose(f, Loader=_yaml_loader())
+    except (OSError, yaml.YAMLError):
+        return
+    if not isinstance(root, yaml.MappingNode):
+        return
+    terms_node = next(
+        (value for key, value in root.value if key.value == "terms"), None
+    )
+    if not isinstance(terms_node, yaml.MappingNode):
+        return
+
+    wanted = {}
+    for issue in issues:
+        wanted.setdefault(str(issue.term), []).append(issue)
+    for key_node, value_node in terms_node.value:
+        term_issues = wanted.get(key_node.value)
+        if not term_issues:
+            continue
+        field_lines = {}
+        if isinstance(value_node, yaml.MappingNode):
+            field_lines = {
+                field_key.value: field_key.start_mark.line + 1
+                for field_key, _ in value_node.value
+            }
+        for issue in term_issues:
+            issue.line = field_lines.get(issue.field, key_node.start_mark.line + 1)
+
+
+def split_issues(issues: List[Issue]):
+    """(errors, warnings)"""
+    errors = [issue for issue in issues if issue.severity == ERROR]
+    warnings = [issue for issue in issues if issue.severity == WARNING]
+    return errors, warnings
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Course Timeline - Assignment deadlines from one or more course plan files, indexed by date
+
+Each plans/*.yaml file is loaded once (through the YAML snapshot cache), every
+due date is parsed once, and chapter numbers are pulled from the topics once.
+Assignments from all plan files are kept sorted by date ordinal so "due today",
+"due in the next N days" and "nearest deadline" are bisect lookups. Timelines
+are cached per process and rebuilt only when a plan file changes.
+"""
+import bisect
+import os
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from yaml_cache import load_yaml
+
+DEFAULT_PLANS_DIR = Path(__file__).parent.parent / "plans"
+DEFAULT_PLAN_FILES = [DEFAULT_PLANS_DIR / "microbiology.yaml"]
+CHAPTER_PATTERN = r"Chapter\s*(\d+)"
+
+
+def topic_chapters(topics) -> List[str]:
+    """Chapter numbers (as strings) named in an assignment's topics"""
+    chapter_re = re.compile(CHAPTER_PATTERN, re.IGNORECASE)
+    chapters = []
+    # Topics are strings or one-key dicts, e.g. {'Chapter 21: ...': None}
+    for topic_entry in topics or []:
+        if isinstance(topic_entry, str):
+            keys = [topic_entry]
+        elif isinstance(topic_entry, dict):
+            keys = topic_entry.keys()
+        else:
+            continue
+        for key in keys:
+            match = chapter_re.search(str(key))
+            if match:
+                chapters.append(match.group(1))
+    return chapters
+
+
+class Assignment:
+    """One dated assignment with its chapters extracted"""
+
+    __slots__ = ("name", "due", "ordinal", "course", "chapters", "data")
+
+    def __init__(self, data: Dict, due: date, course: Optional[str]):
+        self.data = data
+        self.name = data.get("name", "N/A")
+        self.due = due
+        self.ordinal = due.toordinal()
+        self.course = course
+        self.chapters = topic_chapters(data.get("topics", []))
+
+    @property
+    def date_str(self) -> str:
+        return self.due.isoformat()
+
+    def get(self, key: str, default=None):
+        """Raw field from the plan file (location, topics, ...)"""
+        return self.data.get(key, default)
+
+    def days_from(self, today: date) -> int:
+        return self.ordinal - today.toordinal()
+
+    def __repr__(self):
+        return f"Assignment({self.name!r}, {self.date_str}, course={self.course!r})"
+
+
+class PlanFileError(ValueError):
+    """A plan file that is not a list of assignments or a dict with 'assignments'"""
+
+
+def read_plan_file(path, cache_dir=None) -> Tuple[Optional[str], List[Dict]]:
+    """(course name, raw assignment dicts) of one plan file"""
+    plans = load_yaml(path, cache_dir)
+    if isinstance(plans, dict) and "assignments" in plans:
+        return plans.get("course") or Path(path).stem, plans["assignments"] or []
+    if isinstance(plans, list):  # just a list of assignments
+        return Path(path).stem, plans
+    raise PlanFileError(f"Unexpected plans file structure: {path}")
+
+
+class Timeline:
+    """Assignments from every plan file, sorted by due date (plan order within a day)"""
+
+    def __init__(
+        self, assignments: List[Assignment], skipped=None, errors=None, courses=None
+    ):
+        # sorted() is stable, so same-day assignments keep file and plan order
+        self.assignments = sorted(assignments, key=lambda a: a.ordinal)
+        self.ordinals = [a.ordinal for a in self.assignments]
+        # (name, raw due value, reason) for assignments without a usable date
+        self.skipped: List[Tuple[str, object, str]] = skipped or []
+        # (plan file, message) for plan files that could not be read
+        self.errors: List[Tuple[Path, str]] = errors or []
+        # Course names in plan file order (including courses with no dated work)
+        self.courses: List[str] = courses or list(
+            dict.fromkeys(a.course for a in self.assignments if a.course)
+        )
+
+    @classmethod
+    def from_courses(
+        cls, courses: List[Tuple[Optional[str], List[Dict]]], errors=None
+    ) -> "Timeline":
+        assignments = []
+        skipped = []
+        for course, raw_assignments in courses:
+            for data in raw_assignments:
+                if not isinstance(data, dict):
+                    continue
+                name = data.get("name", "N/A")
+                due_value = data.get("due") or data.get("date")
+                if not due_value:
+                    skipped.append((name, due_value, "missing"))
+                    continue
+                try:
+                    # str() handles dates YAML already parsed into date objects
+                    due = datetime.strptime(str(due_value), "%Y-%m-%d").date()
+                except ValueError:
+                    skipped.append((name, due_value, "unparsable"))
+                    continue
+                assignments.append(Assignment(data, due, course))
+        return cls(assignments, skipped, errors, [course for course, _ in courses])
+
+    def warnings(self) -> List[str]:
+        """One message per unreadable plan file and per skipped assignment"""
+        messages = [
+            f"Could not read plan file {plan_file}: {error}"
+            for plan_file, error in self.errors
+        ]
+        for name, due_value, reason in self.skipped:
+            if reason == "missing":
+                messages.append(f"Skipping assignment '{name}': no 'due' or 'date'")
+            else:
+                messages.append(
+                    f"Skipping assignment '{name}': date '{due_value}' "
+                    "is not YYYY-MM-DD"
+                )
+        return messages
+
+    def __len__(self):
+        return len(self.assignments)
+
+    def between(self, start: date, end: date) -> List[Assignment]:
+        """Assignments due from `start` through `end`, inclusive"""
+        lo = bisect.bisect_left(self.ordinals, start.toordinal())
+        hi = bisect.bisect_right(self.ordinals, end.toordinal())
+        return self.assignments[lo:hi]
+
+    def due_on(self, day: date) -> List[Assignment]:
+        return self.between(day, day)
+
+    def due_within(self, today: date, days: int) -> List[Assignment]:
+        """Assignments due after today and at most `days` days away"""
+        lo = bisect.bisect_right(self.ordinals, today.toordinal())
+        hi = bisect.bisect_right(self.ordinals, today.toordinal() + days)
+        return self.assignments[lo:hi]
+
+    def after(self, day: date) -> List[Assignment]:
+        """Assignments due strictly after `day`"""
+        return self.assignments[bisect.bisect_right(self.ordinals, day.toordinal()) :]
+
+    def next_due(self, today: date, course: str = None) -> Optional[Assignment]:
+        """Nearest assignment due today or later (optionally for one course)"""
+        index = bisect.bisect_left(self.ordinals, today.toordinal())
+        for assignment in self.assignments[index:]:
+            if course is None or assignment.course == course:
+                return assignment
+        return None
+
+    def next_due_per_course(self, today: date) -> List[Assignment]:
+        """The nearest upcoming assignment of each course, soonest first"""
+        nearest = {}
+        index = bisect.bisect_left(self.ordinals, today.toordinal())
+        for assignment in self.assignments[index:]:
+            nearest.setdefault(assignment.course, assignment)
+        return list(nearest.values())
+
+
+_TIMELINES: Dict[Tuple, Tuple[Tuple, Timeline]] = {}
+
+
+def load_timeline(plan_files=None, cache_dir=None) -> Timeline:
+    """
+    Timeline over the given plan files (default: the project's
+    plans/microbiology.yaml), relative paths taken from the current directory.
+    Missing or malformed files are left out and listed in `timeline.errors`.
+    Reuses the last timeline while no plan file has changed.
+    """
+    paths = [Path(p).resolve() for p in (plan_files or DEFAULT_PLAN_FILES)]
+    key = tuple(paths)
+    stamps = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamps.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamps.append(None)
+    stamps = tuple(stamps)
+    cached = _TIMELINES.get(key)
+    if cached is not None and cached[0] == stamps:
+        return cached[1]
+
+    courses = []
+    errors = []
+    for path, stamp in zip(paths, stamps):
+        if stamp is None:
+            errors.append((path, "not found"))
+            continue
+        try:
+            courses.append(read_plan_file(path, cache_dir))
+        except Exception as e:
+            errors.append((path, str(e)))
+    timeline = Timeline.from_courses(courses, errors)
+    _TIMELINES[key] = (stamps, timeline)
+    return timeline
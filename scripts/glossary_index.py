@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Glossary Index - Persistent on-disk cache of parsed glossary terms and topic metadata
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+INDEX_VERSION = 2
+
+
+def content_hash(path) -> str:
+    """Return a short content hash for a file"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(path, previous: Optional[Dict] = None) -> Optional[Dict]:
+    """
+    Fingerprint a file as {mtime, size, hash}. The hash is only recomputed when
+    mtime or size differ from the previous fingerprint, so unchanged files cost one stat.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if (
+        previous
+        and previous.get("mtime") == st.st_mtime_ns
+        and previous.get("size") == st.st_size
+    ):
+        return previous
+    return {"mtime": st.st_mtime_ns, "size": st.st_size, "hash": content_hash(path)}
+
+
+def same_content(a: Optional[Dict], b: Optional[Dict]) -> bool:
+    """Two fingerprints describe the same content (missing files only match each other)"""
+    if a is None or b is None:
+        return a is b
+    return a.get("size") == b.get("size") and a.get("hash") == b.get("hash")
+
+
+class GlossaryIndex:
+    """
+    Incremental index stored as JSON next to the metadata file.
+
+    - topics: per-file entries keyed by path (relative to notes/), with mtime, size,
+      content hash and the extracted wiki metadata. Only new or changed files are
+      re-extracted; deleted files are dropped.
+    - generations: a counter per scanned directory, bumped whenever one of its
+      entries is added, re-extracted or dropped.
+    - snapshot: the merged term table from the last parse, valid only while the
+      glossary, glossary_config.yaml, the metadata JSON and the topics are unchanged.
+    """
+
+    def __init__(self, index_file, base_dir):
+        self.index_file = Path(index_file)
+        self.base_dir = Path(base_dir)
+        self.topics = {}
+        self.generations = {}
+        self.snapshot = None
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Load the index from disk, discarding it if unreadable or from another version"""
+        self.topics, self.generations, self.snapshot = {}, {}, None
+        if not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable index {self.index_file}: {e}")
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        self.topics = data.get("topics", {})
+        self.generations = data.get("generations", {})
+        self.snapshot = data.get("snapshot")
+
+    def clear(self):
+        """Drop every cached entry (forces a full rebuild on next sync)"""
+        self.topics, self.generations, self.snapshot = {}, {}, None
+        self.dirty = True
+
+    def save(self):
+        """Atomically write the index if anything changed"""
+        if not self.dirty:
+            return
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.index_file.with_name(
+            f"{self.index_file.name}.{os.getpid()}.tmp"
+        )
+        with open(tmp_file, "w") as f:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "topics": self.topics,
+                    "generations": self.generations,
+                    "snapshot": self.snapshot,
+                },
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_file, self.index_file)
+        self.dirty = False
+
+    def sync_directory(
+        self,
+        directory,
+        extract: Callable[[List[Path]], List[Dict]],
+        pattern: str = "*.wiki",
+    ) -> (Dict[str, Dict], bool):
+        """
+        Bring the entries for `directory` up to date and return ({relpath: metadata}, changed).
+        `extract` receives the list of new or modified files and returns their metadata
+        in the same order, which lets the caller batch (or parallelize) the work.
+        """
+        directory = Path(directory)
+        prefix = directory.relative_to(self.base_dir).as_posix() + "/"
+        seen = set()
+        stale = []
+        changed = False
+
+        paths = sorted(directory.glob(pattern)) if directory.exists() else []
+        for path in paths:
+            key = path.relative_to(self.base_dir).as_posix()
+            seen.add(key)
+            entry = self.topics.get(key)
+            fingerprint = source_fingerprint(
+                path, entry["fingerprint"] if entry else None
+            )
+            if fingerprint is None:
+                continue
+            if entry is not None:
+                if fingerprint is entry["fingerprint"]:
+                    continue
+                if same_content(fingerprint, entry["fingerprint"]):
+                    # Touched but not edited: refresh the stat data only
+                    entry["fingerprint"] = fingerprint
+                    self.dirty = True
+                    continue
+            stale.append((key, path, fingerprint))
+
+        if stale:
+            results = extract([path for _, path, _ in stale])
+            for (key, _, fingerprint), metadata in zip(stale, results):
+                self.topics[key] = {"fingerprint": fingerprint, "metadata": metadata}
+            changed = True
+
+        for key in [k for k in self.topics if k.startswith(prefix) and k not in seen]:
+            del self.topics[key]
+            changed = True
+
+        if changed:
+            self.generations[prefix] = self.generations.get(prefix, 0) + 1
+            self.dirty = True
+
+        return {
+            key: entry["metadata"]
+            for key, entry in sorted(self.topics.items())
+            if key.startswith(prefix)
+        }, changed
+
+    def generation(self, directory) -> int:
+        """Change counter for a directory synced with sync_directory()"""
+        prefix = Path(directory).relative_to(self.base_dir).as_posix() + "/"
+        return self.generations.get(prefix, 0)
+
+    def get_snapshot(
+        self, sources: Dict[str, Optional[Dict]], generation: int
+    ) -> Optional[Dict]:
+        """
+        Return the cached term snapshot if it was built from the same topics
+        generation and every source fingerprint still matches
+        """
+        if not self.snapshot or self.snapshot.get("generation") != generation:
+            return None
+        cached_sources = self.snapshot.get("sources", {})
+        if set(cached_sources) != set(sources):
+            return None
+        for name, fingerprint in sources.items():
+            if not same_content(cached_sources[name], fingerprint):
+                return None
+        return self.snapshot
+
+    def store_snapshot(
+        self, sources: Dict[str, Optional[Dict]], generation: int, **payload
+    ):
+        """Replace the term snapshot and record the sources it was built from"""
+        self.snapshot = {"sources": sources, "generation": generation, **payload}
+        self.dirty = True
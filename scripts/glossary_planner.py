@@ -2,15 +2,43 @@
 """
 Glossary-Based Study Planner - Extracts terms from vimwiki glossary and creates study plans
 """
-import json
 import os
-import re
-from datetime import datetime, date, timedelta
+import sys
+from contextlib import nullcontext, redirect_stdout
+from datetime import datetime, date
 from pathlib import Path
-import argparse
-import random
-from typing import Dict, List, Any
-import yaml
+from typing import TYPE_CHECKING, Dict, List, Any
+
+import tracing
+from course_timeline import load_timeline
+from glossary_index import GlossaryIndex, same_content, source_fingerprint
+from metadata_store import open_metadata_store
+from review_schedulers import DEFAULT_GRADE, MAX_MASTERY, get_scheduler
+from priority_scoring import (
+    centrality_factor,
+    score_terms,
+    top_k_indices,
+    weighted_sample_indices,
+)
+from term_filters import TermFilterIndex, scan_terms
+from term_store import (
+    Interner,
+    PlanEntry,
+    TermRecord,
+    review_fields,
+    terms_from_rows,
+    terms_to_rows,
+)
+from yaml_cache import load_yaml
+
+if TYPE_CHECKING:  # annotations only, imported where they are used
+    from review_log import ReviewLog
+    from study_stats import StudyStats
+
+# Modules only some commands need (yaml, argparse, random, csv, the review log,
+# statistics, plan renderers and exporters, the tokenizer and process pool) are
+# imported inside the functions that use them, so each command only pays for
+# what it uses. A warm --mark-reviewed never touches the YAML parser at all.
 
 
 class GlossaryStudyPlanner:
@@ -22,6 +50,14 @@ class GlossaryStudyPlanner:
         metadata_file="data/glossary_metadata.json",
         # ### MODIFIED: Add config_file parameter
         config_file="config/glossary_config.yaml",
+        index_file="data/glossary_index.json",
+        use_index=True,
+        parallel=False,
+        workers=None,
+        metadata_store="json",
+        sqlite_file="data/glossary_metadata.db",
+        plans_files=None,
+        review_scheduler="fixed",
     ):
         # Get the project base directory (assuming script is in scripts/)
         self.project_dir = Path(__file__).parent.parent
@@ -38,7 +74,17 @@ class GlossaryStudyPlanner:
         else:
             self.metadata_file = Path(metadata_file)
 
-        self.plans_file = self.project_dir / "plans" / "microbiology.yaml"
+        if not os.path.isabs(sqlite_file):
+            self.sqlite_file = self.base_dir / sqlite_file
+        else:
+            self.sqlite_file = Path(sqlite_file)
+
+        # Course plan files with assignment deadlines (all are planned together);
+        # given files are taken from the current directory like other CLI paths
+        if plans_files:
+            self.plans_files = [Path(f) for f in plans_files]
+        else:
+            self.plans_files = [self.project_dir / "plans" / "microbiology.yaml"]
 
         # ### MODIFIED: New path for glossary_config.yaml
         if not os.path.isabs(config_file):
@@ -46,200 +92,231 @@ class GlossaryStudyPlanner:
         else:
             self.config_file = Path(config_file)
 
+        if not os.path.isabs(index_file):
+            self.index_file = self.base_dir / index_file
+        else:
+            self.index_file = Path(index_file)
+        self.use_index = use_index
+        # Compiled snapshots of the YAML config/plans files
+        self.cache_dir = self.base_dir / "data" / "cache"
+        # Process-pool topic scanning (falls back to serial for small vaults)
+        self.parallel = parallel
+        self.workers = workers
+
+        # Fingerprints of the config/metadata/glossary as they were loaded, used to
+        # validate the cached term snapshot and to detect changes in refresh()
+        self._source_fingerprints = {}
+        self._index = None
+        # Chapter/importance/tag posting sets for plan filters (see term_filters)
+        self._filter_index = None
+        # Vault-wide wiki link graph, loaded on first use (see link_graph)
+        self._link_graph = None
+        # Multi-day schedule, repaired incrementally between calls (see
+        # horizon_scheduler)
+        self._scheduler = None
+        # Append-only history of every review (see review_log)
+        self._review_log = None
+        # Statistics aggregates, patched by reviews (see study_stats)
+        self._stats = None
+
+        # How the next review date follows from a review (see review_schedulers)
+        self.review_scheduler = get_scheduler(review_scheduler, self.REVIEW_INTERVALS)
+
+        # Dynamic review data lives in a pluggable store (JSON file or SQLite)
+        self.store = open_metadata_store(
+            metadata_store, self.metadata_file, self.sqlite_file
+        )
+        self.store_backend = metadata_store
         self.metadata = self._load_metadata()  # This loads dynamic review data
         # ### MODIFIED: Load static configuration data
         self.config_data = self._load_config_data()
         self.terms = {}
 
     # ### MODIFIED: New method to load config data
+    @tracing.traced("load_config")
     def _load_config_data(self):
         """Load static configuration data for terms from glossary_config.yaml"""
         if self.config_file.exists():
             try:
-                with open(self.config_file, "r") as f:
-                    config = yaml.safe_load(f)
-                    # Return the 'terms' section of the config
-                    return config.get("terms", {})
+                self._source_fingerprints["config"] = source_fingerprint(
+                    self.config_file
+                )
+                config = load_yaml(self.config_file, self.cache_dir)
+                # Return the 'terms' section of the config
+                return config.get("terms", {})
             except Exception as e:
                 print(
                     f"Warning: Could not load or parse config file {self.config_file}: {e}"
                 )
         return {}
 
+    @tracing.traced("load_metadata")
     def _load_metadata(self):
         """Load existing metadata for terms (dynamic review data)"""
-        if self.metadata_file.exists():
-            with open(self.metadata_file, "r") as f:
-                return json.load(f)
-        return {}
+        self._source_fingerprints["metadata"] = self.store.fingerprint()
+        return self.store.load_all()
 
-    def _save_metadata(self):
-        """Save metadata to file (dynamic review data)"""
-        self.metadata_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.metadata_file, "w") as f:
-            json.dump(self.metadata, f, indent=2)
+    @property
+    def review_log_dir(self) -> Path:
+        """Each store backend keeps a review log of its own"""
+        from review_log import log_dir_for
+
+        store_file = self.metadata_file
+        if self.store_backend == "sqlite":
+            store_file = self.sqlite_file
+        return log_dir_for(self.store_backend, store_file.parent)
+
+    def save_review_fields(self, updates: Dict[str, Dict]):
+        """
+        Write review fields outright ({term: fields}, one row upsert each with
+        SQLite) and log them as edit events, so a replay of the review log
+        reproduces them. Raises ValueError, before writing, for a value the log
+        cannot hold (e.g. a next_review that is not a date).
+        """
+        from review_log import edit_events
+
+        events = [
+            event
+            for term_name, fields in updates.items()
+            for event in edit_events(term_name, fields)
+        ]
+        review_log = self._open_review_log()
+        self.store.upsert(updates)
+        # The in-memory metadata now matches the store: refresh() must not reload it
+        self._source_fingerprints["metadata"] = self.store.fingerprint()
+        self._log_reviews(review_log, events)
+        for term_name, fields in updates.items():
+            self.metadata.setdefault(term_name, {}).update(fields)
+            if term_name in self.terms:
+                self.terms[term_name].update(review_fields(fields))
 
     # ======================================================================
-    # DEBUG VERSION of the Deadline-Aware Method
+    # Deadline-Aware Method
     # ======================================================================
+    @tracing.traced("deadlines")
     def _get_upcoming_chapters(self) -> (str, List[str]):
         """
-        Parses the plans YAML file to find the next due assignment
-        and returns its name and a list of relevant chapter numbers as strings.
+        Finds the next due assignment of each course in the plan files and
+        returns a description of them and their chapter numbers as strings.
         """
-        if not self.plans_file.exists():
-            print(f"--- DEBUG: FAILED. Plans file not found at {self.plans_file}")
-            return None, []
-
-        try:
-            with open(self.plans_file, "r") as f:
-                # ### MODIFIED: Load 'assignments' directly if available
-                plans = yaml.safe_load(f)
-                if isinstance(plans, dict) and "assignments" in plans:
-                    assignments = plans["assignments"]
-                elif isinstance(
-                    plans, list
-                ):  # Handle case where it's just a list of assignments
-                    assignments = plans
-                else:
-                    print(
-                        f"--- DEBUG: FAILED. Unexpected plans file structure: {self.plans_file}"
-                    )
-                    return None, []
-
-        except Exception as e:
-            print(f"--- DEBUG: FAILED. Error parsing YAML file {self.plans_file}: {e}")
-            return None, []
+        timeline = load_timeline(self.plans_files, self.cache_dir)
+        for warning in timeline.warnings():
+            print(f"Warning: {warning}")
+        tracing.count("assignments_skipped", len(timeline.skipped))
 
         today = date.today()
-        upcoming_assignment = None
-        min_days_away = float("inf")
-
-        for (
-            assignment
-        ) in assignments:  # ### MODIFIED: Iterate through parsed assignments
-            name = assignment.get("name", "N/A")
-            # ### MODIFIED: Check both 'date' and 'due' for flexibility
-            due_date_str = assignment.get("due") or assignment.get("date")
-
-            if not due_date_str:
-                # ### DEBUG: Added specific skipping message
-                print(
-                    f"[DEBUG] -> Skipping assignment '{name}': No 'due' or 'date' found."
-                )
-                continue
-            try:
-                # Use str() to handle non-string types like dates from YAML
-                due_date = datetime.strptime(str(due_date_str), "%Y-%m-%d").date()
-            except ValueError:
-                print(
-                    f"[DEBUG] -> Skipping assignment '{name}': Date '{due_date_str}' could not be parsed. Ensure format is YYYY-MM-DD."
-                )
-                continue
-
-            days_away = (due_date - today).days
-            if 0 <= days_away < min_days_away:
-                min_days_away = days_away
-                upcoming_assignment = assignment
-
-        if not upcoming_assignment:
-            print("--- DEBUG: No upcoming assignment was selected.")
+        upcoming = timeline.next_due_per_course(today)
+        if not upcoming:
             return None, []
 
         chapters = []
-        # The 'topics' field in your YAML is a list of dictionaries, e.g., {'Chapter 21: ...': None}
-        for topic_entry in upcoming_assignment.get("topics", []):
-            if isinstance(
-                topic_entry, str
-            ):  # Handle cases where topic is just a string
-                match = re.search(r"Chapter\s*(\d+)", topic_entry, re.IGNORECASE)
-                if match:
-                    chapters.append(match.group(1))
-            elif isinstance(topic_entry, dict):  # Handle original dictionary format
-                for key in topic_entry.keys():
-                    match = re.search(r"Chapter\s*(\d+)", key, re.IGNORECASE)
-                    if match:
-                        chapters.append(match.group(1))
-
-        assignment_name = f"'{upcoming_assignment['name']}' due in {min_days_away} days"
-        return assignment_name, chapters
+        descriptions = []
+        for assignment in upcoming:
+            chapters.extend(
+                chap for chap in assignment.chapters if chap not in chapters
+            )
+            course = f" ({assignment.course})" if len(upcoming) > 1 else ""
+            descriptions.append(
+                f"'{assignment.name}'{course} due in {assignment.days_from(today)} days"
+            )
+        return ", ".join(descriptions), chapters
 
     # ======================================================================
 
     def _extract_wiki_metadata(self, wiki_path):
         """Extract metadata from a wiki file"""
-        if not wiki_path.exists():
-            return {}
-        try:
-            with open(wiki_path, "r") as f:
-                content = f.read()
-            metadata = {"chapters": [], "tags": [], "related_terms": []}
-            lines = content.split("\n")
-            for line in lines:
-                line = line.strip()
-                chapter_matches = re.findall(
-                    r"(?:Ch\.?\s*|Chapter\s+)(\d+)", line, re.IGNORECASE
-                )
-                for match in chapter_matches:
-                    if match not in metadata["chapters"]:
-                        metadata["chapters"].append(match)
-                tag_match = re.match(r"^Tags?\s*:\s*(.+)", line, re.IGNORECASE)
-                if tag_match:
-                    tags = [tag.strip() for tag in tag_match.group(1).split(",")]
-                    metadata["tags"].extend(tags)
-                wiki_links = re.findall(r"\[\[([^|\]]+)(?:\|[^\]]+)?\]\]", line)
-                for link in wiki_links:
-                    if link.startswith("topics/"):
-                        term_name = (
-                            link.replace("topics/", "").replace("_", " ").title()
-                        )
-                        if term_name not in metadata["related_terms"]:
-                            metadata["related_terms"].append(term_name)
-            return metadata
-        except Exception as e:
-            print(f"Warning: Could not read {wiki_path}: {e}")
-            return {}
+        from parallel_scan import extract_wiki_metadata
 
-    def _scan_topics_directory(self):
-        """Scan topics directory to associate terms with chapters and tags"""
+        return extract_wiki_metadata(wiki_path)
+
+    def _extract_many(self, paths):
+        """Extract metadata for many wiki files, in a process pool when enabled"""
+        from parallel_scan import extract_many
+
+        return extract_many(paths, parallel=self.parallel, workers=self.workers)
+
+    @tracing.traced("scan_topics")
+    def _scan_topics_directory(self, index: GlossaryIndex = None):
+        """
+        Scan topics directory to associate terms with chapters and tags.
+        With an index, only new or modified topic files are re-extracted.
+        """
         topics_dir = self.base_dir / "topics"
         if not topics_dir.exists():
             return {}
+        if index is None:
+            wiki_files = sorted(topics_dir.glob("*.wiki"))
+            extracted = zip(wiki_files, self._extract_many(wiki_files))
+        else:
+            by_path, _ = index.sync_directory(topics_dir, self._extract_many)
+            extracted = ((Path(key), metadata) for key, metadata in by_path.items())
         topic_metadata = {}
-        for wiki_file in topics_dir.glob("*.wiki"):
+        for wiki_file, metadata in extracted:
             term_name = wiki_file.stem.replace("_", " ").title()
-            metadata = self._extract_wiki_metadata(wiki_file)
             if metadata:
                 topic_metadata[term_name] = metadata
         return topic_metadata
 
-    def parse_glossary(self):
+    def _open_index(self, rebuild: bool = False):
+        """Open the on-disk glossary index (None when indexing is disabled)"""
+        if not self.use_index:
+            return None
+        if self._index is None:
+            with tracing.span("load_index"):
+                self._index = GlossaryIndex(self.index_file, self.base_dir)
+        if rebuild:
+            self._index.clear()
+        return self._index
+
+    @tracing.traced("parse_glossary")
+    def parse_glossary(self, rebuild_index: bool = False):
         """Parse vimwiki glossary file and extract terms, integrating config data"""
         if not self.glossary_file.exists():
             print(f"Glossary file '{self.glossary_file}' not found!")
             print(f"Looking in: {self.glossary_file.absolute()}")
             return
 
-        with open(self.glossary_file, "r") as f:
-            content = f.read()
+        index = self._open_index(rebuild_index)
 
         print("🔍 Scanning topics directory for metadata...")
         # ### MODIFIED: Topic metadata is now a fallback/enrichment
-        topic_metadata = self._scan_topics_directory()
+        topic_metadata = self._scan_topics_directory(index)
+
+        self._source_fingerprints["glossary"] = source_fingerprint(
+            self.glossary_file, self._source_fingerprints.get("glossary")
+        )
+        sources = {
+            "glossary": self._source_fingerprints["glossary"],
+            "config": self._source_fingerprints.get("config"),
+            "metadata": self._source_fingerprints.get("metadata"),
+        }
+        snapshot = None
+        if index is not None:
+            generation = index.generation(self.base_dir / "topics")
+            snapshot = index.get_snapshot(sources, generation)
+        if snapshot is not None:
+            with tracing.span("load_snapshot"):
+                self.terms = terms_from_rows(snapshot["terms"])
+                index.save()
+            self._sync_filter_index()
+            self._report_parse(snapshot["topic_count"])
+            return self.terms
+
+        from wiki_tokenizer import ENTRY, HEADING, tokenize_file
 
         self.terms = {}
+        interner = Interner()
         current_letter = None
-        lines = content.split("\n")
 
-        for line in lines:
-            letter_match = re.match(r"^==\s*([A-Z])\s*==", line)
-            if letter_match:
-                current_letter = letter_match.group(1)
+        for kind, value, _ in tokenize_file(self.glossary_file, inline=False):
+            if kind == HEADING:
+                level, text = value
+                if level == 2 and len(text) == 1 and "A" <= text <= "Z":
+                    current_letter = text
                 continue
 
-            term_match = re.match(r"^\*\s*\[\[([^|]+)\|([^\]]+)\]\]\s*::\s*(.+)", line)
-            if term_match:
-                wiki_link, term_name, definition = term_match.groups()
+            if kind == ENTRY:
+                wiki_link, term_name, definition = value
 
                 # ### MODIFIED: Start with default values
                 term_data = {
@@ -303,25 +380,96 @@ class GlossaryStudyPlanner:
                     term_data["related_terms"] = topic_info.get("related_terms", [])
                     term_data["all_chapters"] = topic_info.get("chapters", [])
 
-                self.terms[term_name] = {
-                    "definition": definition,
-                    "wiki_link": wiki_link,
-                    "letter_section": current_letter,
+                self.terms[sys.intern(term_name)] = TermRecord(
+                    interner,
+                    definition=definition,
+                    wiki_link=wiki_link,
+                    letter_section=current_letter,
                     **term_data,  # Unpack the collected term_data
-                }
+                )
 
+        if index is not None:
+            with tracing.span("store_snapshot"):
+                index.store_snapshot(
+                    sources,
+                    generation,
+                    terms=terms_to_rows(self.terms),
+                    topic_count=len(topic_metadata),
+                )
+                index.save()
+        tracing.count("glossary_terms_parsed", len(self.terms))
+
+        self._sync_filter_index()
+        self._report_parse(len(topic_metadata))
+        return self.terms
+
+    def filter_index(self) -> TermFilterIndex:
+        """
+        Inverted indexes over the current terms, built on first use. Building
+        costs about two linear filter scans, so only callers with repeated
+        queries build it (the daemon right after parsing, --schedule);
+        select_terms scans the terms until it exists.
+        """
+        if self._filter_index is None:
+            with tracing.span("filter_index"):
+                self._filter_index = TermFilterIndex(self.terms)
+        return self._filter_index
+
+    def _sync_filter_index(self):
+        """After a re-parse, re-index only the terms that changed"""
+        if self._filter_index is not None:
+            self._filter_index.sync(self.terms)
+
+    def _report_parse(self, topic_count: int):
+        """Print the summary shown after parsing the glossary"""
         print(f"Parsed {len(self.terms)} terms from glossary")
-        if topic_metadata:
-            print(
-                f"📚 Enhanced {len(topic_metadata)} terms with topics directory metadata"
-            )
+        if topic_count:
+            print(f"📚 Enhanced {topic_count} terms with topics directory metadata")
         # ### MODIFIED: Added message for config file
         if self.config_data:
             print(
                 f"⚙️ Loaded {len(self.config_data)} terms from static config file: {self.config_file}"
             )
 
-        return self.terms
+    @tracing.traced("refresh")
+    def refresh(self) -> bool:
+        """
+        Reload whatever changed on disk since it was loaded: glossary_config.yaml,
+        the metadata store, glossary.wiki and topic files. Used by long-running
+        processes (the planner daemon). Returns True when the terms were re-parsed.
+        """
+        changed = not self.terms
+        loaded = self._source_fingerprints.get("config")
+        if not same_content(source_fingerprint(self.config_file, loaded), loaded):
+            self._source_fingerprints.pop("config", None)
+            self.config_data = self._load_config_data()
+            changed = True
+
+        loaded = self._source_fingerprints.get("metadata")
+        if not same_content(self.store.fingerprint(loaded), loaded):
+            self.metadata = self._load_metadata()
+            changed = True
+
+        loaded = self._source_fingerprints.get("glossary")
+        if not same_content(source_fingerprint(self.glossary_file, loaded), loaded):
+            changed = True
+
+        index = self._open_index()
+        if index is None:
+            changed = True  # no index: topic changes can't be detected cheaply
+        else:
+            topics_dir = self.base_dir / "topics"
+            if topics_dir.exists():
+                _, topics_changed = index.sync_directory(
+                    topics_dir, self._extract_many
+                )
+                changed = changed or topics_changed
+
+        if changed:
+            self.parse_glossary()
+        elif index is not None:
+            index.save()
+        return changed
 
     def update_term_metadata(self, term_name: str, **kwargs):
         """
@@ -343,7 +491,6 @@ class GlossaryStudyPlanner:
         updates_for_metadata = {}
         for key, value in kwargs.items():
             if key in allowed_dynamic_keys:
-                self.terms[term_name][key] = value
                 updates_for_metadata[key] = value
             else:
                 print(
@@ -351,10 +498,7 @@ class GlossaryStudyPlanner:
                 )
 
         if updates_for_metadata:
-            if term_name not in self.metadata:
-                self.metadata[term_name] = {}
-            self.metadata[term_name].update(updates_for_metadata)
-            self._save_metadata()
+            self.save_review_fields({term_name: updates_for_metadata})
             print(
                 f"✅ Updated dynamic metadata for {term_name}: {updates_for_metadata}"
             )
@@ -363,8 +507,13 @@ class GlossaryStudyPlanner:
             print("No valid dynamic updates specified.")
             return False
 
-    def calculate_study_priority(self, term_data: Dict) -> float:
-        """Calculate priority score for studying a term"""
+    def calculate_study_priority(
+        self, term_data: Dict, centrality: float = None
+    ) -> float:
+        """
+        Calculate priority score for studying a term. `centrality` (0..1, from
+        term_centrality) boosts terms whose topic pages are widely linked.
+        """
         importance_weights = {"high": 10, "medium": 5, "low": 2}
         exam_score = importance_weights.get(term_data.get("exam_importance"), 5)
         study_score = importance_weights.get(term_data.get("study_importance"), 5)
@@ -392,8 +541,44 @@ class GlossaryStudyPlanner:
             review_factor = 3.0  # High priority if never reviewed
 
         total_score = base_score * mastery_factor * review_factor
+        if centrality is not None:
+            total_score *= centrality_factor(centrality)
         return round(total_score, 2)
 
+    @tracing.traced("centrality")
+    def term_centrality(self) -> Dict[str, float]:
+        """
+        {term name: 0..1} PageRank of each term's topic page in the vault link
+        graph, relative to the most central term. The graph is cached on disk
+        and re-synced on each call, so only edited files are re-read.
+        """
+        from link_graph import LinkGraph
+
+        if self._link_graph is None:
+            self._link_graph = LinkGraph(
+                self.base_dir, self.cache_dir / "link_graph.pickle"
+            )
+        self._link_graph.update()
+        self._link_graph.save()
+        try:
+            glossary = self.glossary_file.relative_to(self.base_dir).as_posix()
+        except ValueError:  # glossary outside notes/: links are vault-relative
+            glossary = "glossary.wiki"
+        return self._link_graph.term_centrality(self.terms, glossary)
+
+    def select_terms(
+        self, chapters=None, chapter=None, importance=None, tag=None
+    ) -> List[str]:
+        """Names of the terms passing the study plan filters, in glossary order"""
+        if not (chapters or chapter or importance or tag):
+            return list(self.terms)
+        if self._filter_index is None:  # one-shot run: a scan beats a build
+            return scan_terms(self.terms, chapters, chapter, importance, tag)
+        return self._filter_index.select(
+            chapters=chapters, chapter=chapter, importance=importance, tag=tag
+        )
+
+    @tracing.traced("plan")
     def generate_study_plan(
         self,
         target_terms: int = 10,
@@ -402,6 +587,8 @@ class GlossaryStudyPlanner:
         filter_tag: str = None,
         randomize: bool = False,
         auto_filter_by_deadline: bool = True,
+        seed: int = None,
+        use_centrality: bool = False,
     ):
         """Generate a study plan for glossary terms"""
         if not self.terms:
@@ -432,234 +619,633 @@ class GlossaryStudyPlanner:
         else:  # No deadline, no explicit chapter/tag filter
             context_message = "✅ No specific filters or upcoming deadlines. Showing highest priority general terms."
 
-        eligible_terms = []
-        for term_name, term_data in self.terms.items():
-            # Chapter filtering logic
-            if deadline_chapters:
-                # Check if the term's *primary* chapter is in the deadline chapters
-                if term_data.get("chapter") not in deadline_chapters:
-                    # Also check if *any* of the term's associated chapters (all_chapters) match
-                    # This makes it more flexible if a term applies to multiple chapters
-                    if not any(
-                        chap in deadline_chapters
-                        for chap in term_data.get("all_chapters", [])
-                    ):
-                        continue
-            elif filter_chapter and term_data.get("chapter") != filter_chapter:
-                continue
-
-            # Importance filtering
-            if (
-                filter_importance
-                and term_data.get("exam_importance") != filter_importance
-            ):
-                continue
-
-            # Tag filtering
-            if filter_tag:
-                term_tags = term_data.get("tags", [])
-                if not any(filter_tag.lower() in tag.lower() for tag in term_tags):
-                    continue
-
-            # Calculate priority and add to eligible terms
-            priority_score = self.calculate_study_priority(term_data)
-            eligible_terms.append(
-                {
-                    "name": term_name,
-                    "definition": term_data["definition"],
-                    "chapter": term_data.get("chapter", "Unassigned"),
-                    "exam_importance": term_data.get("exam_importance", "medium"),
-                    "study_importance": term_data.get("study_importance", "medium"),
-                    "mastery_level": term_data.get("mastery_level", 0),
-                    "priority_score": priority_score,
-                    "last_reviewed": term_data.get("last_reviewed", "Never"),
-                    "wiki_link": term_data["wiki_link"],
-                    "letter_section": term_data["letter_section"],
-                    "tags": term_data.get("tags", []),
-                    "related_terms": term_data.get("related_terms", []),
-                }
+        # Chapter, importance and tag filters intersect the inverted indexes
+        # (the deadline chapters match a term's primary chapter or any of its
+        # all_chapters); names come back in glossary order
+        with tracing.span("select_terms"):
+            names = self.select_terms(
+                deadline_chapters, filter_chapter, filter_importance, filter_tag
             )
+        matching = [(term_name, self.terms[term_name]) for term_name in names]
 
-        if not eligible_terms:
+        if not matching:
             print("No terms match the specified filters!")
             return [], context_message
 
+        # Score every matching term in one columnar pass (same values as
+        # calculate_study_priority, which remains the per-term reference)
+        centrality = None
+        if use_centrality:
+            term_centrality = self.term_centrality()
+            centrality = [term_centrality.get(name, 0.0) for name, _ in matching]
+        with tracing.span("score"):
+            scores = score_terms(
+                [term_data for _, term_data in matching], centrality=centrality
+            )
+        tracing.count("terms_scored", len(scores))
+
+        # Pick the plan's terms by index; entries are views over the term records
         if randomize:
-            weights = [term["priority_score"] for term in eligible_terms]
-            # Handle case where all weights are zero (e.g., all mastery 5, all recently reviewed)
-            if sum(weights) == 0:
-                study_terms = random.sample(
-                    eligible_terms, min(target_terms, len(eligible_terms))
-                )
-            else:
-                selected_count = min(target_terms, len(eligible_terms))
-                study_terms = random.choices(
-                    eligible_terms, weights=weights, k=selected_count
-                )
+            import random
+
+            selected = weighted_sample_indices(
+                scores, target_terms, random.Random(seed)
+            )
         else:
-            eligible_terms.sort(key=lambda x: x["priority_score"], reverse=True)
-            study_terms = eligible_terms[:target_terms]
+            selected = top_k_indices(scores, target_terms)
+
+        study_terms = [
+            PlanEntry(matching[index][0], matching[index][1], scores[index])
+            for index in selected
+        ]
 
         return study_terms, context_message
 
-    def print_study_plan(
+    @tracing.traced("schedule")
+    def generate_schedule(self, days: int = 30, capacity: int = 20):
+        """
+        Assign the terms of every assignment due in the next `days` days to
+        study days before it (at most `capacity` terms a day). Returns the
+        scheduler (None when nothing is due) and a context message.
+        """
+        from horizon_scheduler import HorizonScheduler, build_tasks, term_inputs
+
+        if not self.terms:
+            self.parse_glossary()
+        if not self.terms:
+            print("No terms found to study!")
+            return None, None
+
+        today = date.today()
+        timeline = load_timeline(self.plans_files, self.cache_dir)
+        for plans_file, error in timeline.errors:
+            print(f"Warning: Could not read plan file {plans_file}: {error}")
+        assignments = timeline.due_within(today, days)
+        if not assignments:
+            return None, f"✅ No deadlines in the next {days} days."
+
+        def label(assignment):
+            if len(timeline.courses) > 1:
+                return f"{assignment.name} ({assignment.course})"
+            return assignment.name
+
+        filter_index = self.filter_index()
+        tasks = build_tasks(
+            assignments, lambda chapters: filter_index.select(chapters=chapters), label
+        )
+        names = list(tasks)
+        with tracing.span("score"):
+            scores = score_terms([self.terms[name] for name in names], today=today)
+        tracing.count("terms_scored", len(scores))
+        inputs = term_inputs(tasks, self.terms, dict(zip(names, scores)), today)
+
+        if self._scheduler is None:
+            self._scheduler = HorizonScheduler(
+                self.cache_dir / "schedule.pickle", self.REVIEW_INTERVALS
+            )
+        with tracing.span("assign_days"):
+            self._scheduler.update(today, days, capacity, inputs)
+            self._scheduler.save()
+        context_message = (
+            f"🎯 {len(assignments)} assignments due in the next {days} days, "
+            f"{len(tasks)} terms to cover (up to {capacity} a day)"
+        )
+        return self._scheduler, context_message
+
+    @tracing.traced("output")
+    def print_schedule(
         self,
-        study_terms: List[Dict],
+        scheduler,
         context_message: str = None,
         format_type: str = "text",
+        output: str = None,
     ):
-        """Print the study plan in specified format"""
-        if not study_terms:
+        """
+        Print one checklist per study day (vimwiki checkboxes with --format wiki),
+        or write it to the file `output`
+        """
+        if scheduler is None:
             if context_message:
                 print(context_message)
-            print("No terms to study!")
             return
-        today = datetime.now().strftime("%Y-%m-%d")
-        if format_type == "text":
-            print(f"📚 Glossary Study Plan - {today}")
-            print("=" * 50)
-            if context_message:
-                print(context_message)
-            print(f"\n🎯 Focus Terms ({len(study_terms)} selected):")
-            for i, term in enumerate(study_terms, 1):
-                importance_emoji = {"high": "🔥", "medium": "⚡", "low": "📝"}
-                emoji = importance_emoji.get(term["exam_importance"], "📝")
-                print(f"\n{i}. {emoji} **{term['name']}**")
-                print(f"    📖 Definition: {term['definition']}")
-                print(f"    📚 Chapter: {term['chapter']}")
-                print(f"    🎯 Exam Importance: {term['exam_importance']}")
-                print(f"    📊 Mastery Level: {term['mastery_level']}/5")
-                print(f"    📅 Last Reviewed: {term['last_reviewed']}")
-                print(
-                    f"    🔗 Wiki: {term['wiki_link']}"
-                )  # ### MODIFIED: Ensure proper wiki link format
-                if term.get("tags"):
-                    print(f"    🏷️  Tags: {', '.join(term['tags'])}")
-                if term.get("related_terms"):
-                    print(f"    🔗 Related: {', '.join(term['related_terms'])}")
-        elif format_type == "wiki":
-            # (omitted for brevity, this part is unchanged)
-            pass
-        elif format_type == "json":
-            # (omitted for brevity, this part is unchanged)
-            pass
-        if format_type != "json":
-            print(f"\n📝 Study Commands:")
-            print("Mark terms as reviewed:")
-            script_name = Path(__file__).name
-            for term in study_terms:
-                print(
-                    f"  python scripts/{script_name} --mark-reviewed \"{term['name']}\""
-                )
-            print("\nUpdate term metadata:")
-            # ### MODIFIED: Updated command examples to reflect static vs. dynamic
-            print(
-                f'  python scripts/{script_name} --mark-reviewed "Term Name" --mastery-gain 1'
-            )
-            print(
-                "  (For static properties like chapter/importance, edit config/glossary_config.yaml directly)"
-            )
+        unscheduled = sorted(
+            (deadline, term_name, label)
+            for term_name, jobs in scheduler.unscheduled.items()
+            for deadline, label in jobs
+        )
+        from plan_renderers import render_schedule, write_rendered
+
+        write_rendered(
+            render_schedule(
+                format_type,
+                scheduler.by_day(),
+                unscheduled,
+                self.terms,
+                context_message,
+            ),
+            output,
+        )
 
-    def mark_term_reviewed(self, term_name: str, mastery_gained: int = 1):
-        """Mark a term as reviewed and update mastery"""
-        if term_name not in self.terms:
-            print(f"Term '{term_name}' not found!")
-            return False
-        today = datetime.now().strftime("%Y-%m-%d")
-        current_mastery = self.terms[term_name].get("mastery_level", 0)
-        review_count = self.terms[term_name].get("review_count", 0) + 1
-        new_mastery = min(5, current_mastery + mastery_gained)
-        review_intervals = [1, 3, 7, 14, 30, 60]
-        interval_index = min(review_count - 1, len(review_intervals) - 1)
-        next_review_date = datetime.now() + timedelta(
-            days=review_intervals[interval_index]
+    @tracing.traced("output")
+    def print_study_plan(
+        self,
+        study_terms: List[PlanEntry],
+        context_message: str = None,
+        format_type: str = "text",
+        output: str = None,
+    ):
+        """Print the study plan in specified format, or write it to the file `output`"""
+        from plan_renderers import render_plan, write_rendered
+
+        write_rendered(
+            render_plan(
+                format_type,
+                study_terms,
+                context_message,
+                script_name=Path(__file__).name,
+            ),
+            output,
         )
-        next_review_str = next_review_date.strftime("%Y-%m-%d")
-        update_data = {
-            "last_reviewed": today,
-            "review_count": review_count,
+
+    REVIEW_INTERVALS = [1, 3, 7, 14, 30, 60]
+
+    def _compute_review(
+        self,
+        stored: Dict,
+        mastery_gained: int,
+        reviewed_on: date,
+        grade: int = DEFAULT_GRADE,
+    ):
+        """New review fields for a term whose current stored fields are `stored`"""
+        current_mastery = stored.get("mastery_level", 0)
+        new_mastery = max(0, min(MAX_MASTERY, current_mastery + mastery_gained))
+        review = self.review_scheduler.review(stored, grade, reviewed_on)
+        return {
+            "last_reviewed": review.pop("last_reviewed"),
+            "review_count": review.pop("review_count"),
             "mastery_level": new_mastery,
-            "next_review": next_review_str,
+            "next_review": review.pop("next_review"),
+            **review,  # the scheduler's own state (ease, stability, ...)
         }
-        # Update in-memory terms dictionary
-        self.terms[term_name].update(update_data)
-        # Update metadata dictionary for saving to JSON
+
+    def _open_review_log(self) -> "ReviewLog":
+        """The review event log; a new one starts from the stored review data"""
+        from review_log import ReviewLog
+
+        if self._review_log is None:
+            self._review_log = ReviewLog(self.review_log_dir)
+        if not self._review_log.exists():
+            self._review_log.create(self.store.load_all())
+        return self._review_log
+
+    def _log_reviews(self, review_log: "ReviewLog", events: List[tuple]):
+        with tracing.span("review_log"):
+            review_log.append(events)
+            review_log.maybe_compact()
+
+    @tracing.traced("review")
+    def mark_term_reviewed(
+        self, term_name: str, mastery_gained: int = 1, grade: int = DEFAULT_GRADE
+    ):
+        """Mark a term as reviewed (recalled with `grade`, 1-4) and update mastery"""
+        if term_name not in self.terms:
+            print(f"Term '{term_name}' not found!")
+            return False
+        from review_log import review_event
+
+        review_log = self._open_review_log()
+        stats = self._current_stats()
+        previous = {}
+
+        events = []
+
+        def apply_review(stored: Dict) -> Dict:
+            # Computed from the stored row inside the store's write transaction,
+            # so a concurrent reviewer's update is never overwritten. The event
+            # is built here too: if it cannot be logged, nothing is stored
+            previous.update(stored)
+            update = self._compute_review(stored, mastery_gained, date.today(), grade)
+            events.append(
+                review_event(
+                    term_name,
+                    stored,
+                    update,
+                    grade,
+                    self.review_scheduler.name,
+                    date.today(),
+                )
+            )
+            return update
+
+        update_data = self.store.update(term_name, apply_review)
+        self._source_fingerprints["metadata"] = self.store.fingerprint()
+        self._log_reviews(review_log, events)
+        if stats is not None:
+            record = self.terms[term_name]
+            stats.update_term(
+                record.chapter,
+                record.tags,
+                (previous.get("mastery_level", 0), previous.get("next_review")),
+                (update_data["mastery_level"], update_data["next_review"]),
+            )
+            stats.add_reviews([date.today()])
+            self._stamp_stats(stats)
+        # Update in-memory terms and metadata dictionaries (scheduler state such
+        # as ease or stability only lives in the metadata)
+        self.terms[term_name].update(review_fields(update_data))
         self.metadata[term_name] = self.metadata.get(term_name, {})
         self.metadata[term_name].update(update_data)
-        self._save_metadata()
         print(f"✅ Reviewed '{term_name}'")
-        print(f"    📊 Mastery: {current_mastery} → {new_mastery}")
-        print(f"    📅 Next review: {next_review_str}")
+        print(
+            f"    📊 Mastery: {previous.get('mastery_level', 0)} → {update_data['mastery_level']}"
+        )
+        print(f"    📅 Next review: {update_data['next_review']}")
         return True
 
+    @tracing.traced("review_batch")
+    def mark_terms_reviewed(self, records: List[tuple]) -> Dict[str, List]:
+        """
+        Apply many reviews at once: `records` is a list of (term, mastery_gained,
+        review_date[, grade]) tuples, applied in order (a term may appear several
+        times).
+        Everything is written in a single store transaction. Returns
+        {"results": [(term, old_mastery, new_mastery, next_review)], "unknown": [terms]}.
+        """
+        from review_log import review_event
+
+        known = [record for record in records if record[0] in self.terms]
+        unknown = list(dict.fromkeys(r[0] for r in records if r[0] not in self.terms))
+        results = []
+        events = []
+        before = {}
+
+        def apply_reviews(stored_by_term: Dict[str, Dict]) -> Dict[str, Dict]:
+            state = {term: dict(fields) for term, fields in stored_by_term.items()}
+            before.update(
+                (term, (fields.get("mastery_level", 0), fields.get("next_review")))
+                for term, fields in stored_by_term.items()
+            )
+            for term_name, mastery_gained, reviewed_on, *grade in known:
+                current = state[term_name]
+                grade = grade[0] if grade else DEFAULT_GRADE
+                update_data = self._compute_review(
+                    current, mastery_gained, reviewed_on, grade
+                )
+                events.append(
+                    review_event(
+                        term_name,
+                        current,
+                        update_data,
+                        grade,
+                        self.review_scheduler.name,
+                        reviewed_on,
+                    )
+                )
+                results.append(
+                    (
+                        term_name,
+                        current.get("mastery_level", 0),
+                        update_data["mastery_level"],
+                        update_data["next_review"],
+                    )
+                )
+                current.update(update_data)
+            return state
+
+        if known:
+            review_log = self._open_review_log()
+            stats = self._current_stats()
+            updated = self.store.update_many(
+                list(dict.fromkeys(r[0] for r in known)), apply_reviews
+            )
+            self._source_fingerprints["metadata"] = self.store.fingerprint()
+            self._log_reviews(review_log, events)
+            tracing.count("reviews", len(events))
+            for term_name, update_data in updated.items():
+                self.terms[term_name].update(review_fields(update_data))
+                self.metadata.setdefault(term_name, {}).update(update_data)
+                if stats is not None:
+                    record = self.terms[term_name]
+                    stats.update_term(
+                        record.chapter,
+                        record.tags,
+                        before[term_name],
+                        (update_data["mastery_level"], update_data["next_review"]),
+                    )
+            if stats is not None:
+                stats.add_reviews(record[2] for record in known)
+                self._stamp_stats(stats)
+        return {"results": results, "unknown": unknown}
+
+    @tracing.traced("due")
+    def due_terms(self, limit: int = None, on: date = None) -> List[tuple]:
+        """
+        [(term, next_review)] of terms due on or before `on` (default today), most
+        overdue first. Read from the store's next_review index, so only the
+        returned terms are touched; terms no longer in the glossary are skipped
+        once it has been parsed.
+        """
+        from itertools import islice
+
+        due = (
+            (term_name, next_review)
+            for next_review, term_name in self.store.iter_due(
+                (on or date.today()).isoformat()
+            )
+            if not self.terms or term_name in self.terms
+        )
+        return list(islice(due, limit))
+
+    def print_due_terms(self, due: List[tuple], on: date = None):
+        on = on or date.today()
+        if not due:
+            print(f"✅ Nothing due for review on {on.isoformat()}")
+            return
+        print(
+            f"📅 Due for review on {on.isoformat()} "
+            f"({len(due)} shown, most overdue first)"
+        )
+        for i, (term_name, next_review) in enumerate(due, 1):
+            try:
+                overdue = (on - date.fromisoformat(next_review)).days
+            except ValueError:
+                overdue = 0
+            when = f"{overdue} days overdue" if overdue else "due today"
+            print(f"  {i}. {term_name} ({when}, next_review {next_review})")
+
+    def _stats_sources(self, previous: Dict = None) -> Dict:
+        """What the statistics depend on (`previous` fingerprints skip re-hashing)"""
+        from study_stats import tree_stamp
+
+        previous = previous or {}
+        return {
+            "glossary": source_fingerprint(
+                self.glossary_file, previous.get("glossary")
+            ),
+            "config": source_fingerprint(self.config_file, previous.get("config")),
+            "metadata": self.store.fingerprint(previous.get("metadata")),
+            "topics": tree_stamp(self.base_dir / "topics"),
+        }
+
+    def _load_stats(self) -> "StudyStats":
+        """The statistics cache, read once per process"""
+        if self._stats is None:
+            from study_stats import StudyStats
+
+            self._stats = StudyStats(self.cache_dir / "study_stats.pickle")
+        return self._stats
+
+    def _current_stats(self):
+        """
+        The cached statistics when they were built from the review data now in
+        the store (so a review can patch them), else None. Only the store is
+        checked: a review re-stamps just the review data, so a changed glossary,
+        config or topics tree is still found when the statistics are reported.
+        """
+        stats = self._load_stats()
+        if not stats.sources or "metadata" not in stats.sources:
+            return None
+        stamped = stats.sources["metadata"]
+        if not same_content(self.store.fingerprint(stamped), stamped):
+            return None
+        return stats
+
+    def _stamp_stats(self, stats: "StudyStats"):
+        """Record that patched statistics match the review data just written"""
+        stats.sources = {
+            **stats.sources,
+            "metadata": self._source_fingerprints["metadata"],
+        }
+        stats.save()
+
+    @tracing.traced("aggregates")
+    def study_stats(self) -> "StudyStats":
+        """Statistics aggregates, rebuilt from the terms only when a source changed"""
+        stats = self._load_stats()
+        sources = self._stats_sources(stats.sources)
+        if not stats.current(sources):
+            if not self.terms:
+                self.parse_glossary()
+            from review_log import ReviewLog
+
+            review_log = ReviewLog(self.review_log_dir)
+            with tracing.span("build"):
+                stats.build(self.terms, sources, review_log.review_days())
+        stats.save()
+        return stats
+
+    @tracing.traced("statistics")
     def show_statistics(self):
         """Show study statistics for glossary terms"""
-        # (omitted for brevity, this part is unchanged)
-        pass
+        from study_stats import MASTERY_LEVELS, READY_MASTERY
 
-    def export_to_json(self, filename: str = None):
-        """Export all glossary data to JSON"""
-        # (omitted for brevity, this part is unchanged)
-        pass
+        stats = self.study_stats()
+        today = date.today()
+        total = stats.total()
+        terms = sum(total.values())
+        if not terms:
+            print("No glossary terms to report on")
+            return
 
+        def row(label: str, counts) -> str:
+            size = sum(counts.values())
+            mean = sum(level * n for level, n in counts.items()) / size
+            cells = "".join(f"{counts.get(level, 0):>6}" for level in MASTERY_LEVELS)
+            return f"  {label:<24}{cells}{size:>8}{mean:>7.1f}"
+
+        header = "".join(f"{level:>6}" for level in MASTERY_LEVELS)
+        print(f"📊 Study statistics for {terms} terms")
+        print(f"\n🎯 Mastery by chapter:\n  {'':<24}{header}{'terms':>8}{'mean':>7}")
+        for chapter, counts in stats.chapters():
+            label = f"Chapter {chapter}" if chapter is not None else "(no chapter)"
+            print(row(label, counts))
+        print(row("All terms", total))
+
+        tags = stats.tags(limit=15)
+        if tags:
+            print(f"\n🏷️  Mastery by tag (top {len(tags)}):")
+            for tag, counts in tags:
+                print(row(str(tag), counts))
+
+        overdue, due_today, unreviewed = stats.due(today)
+        print(
+            f"\n⏰ {overdue} overdue, {due_today} due today, "
+            f"{unreviewed} never reviewed"
+        )
+        overdue_chapters = stats.overdue_by_chapter(today)
+        if overdue_chapters:
+            print(
+                "  Overdue by chapter: "
+                + ", ".join(
+                    f"{chapter if chapter is not None else '(no chapter)'}: {n}"
+                    for chapter, n in overdue_chapters
+                )
+            )
 
-def main():
-    parser = argparse.ArgumentParser(description="Glossary-Based Study Planner")
-    # (omitted for brevity, this part is unchanged)
-    parser.add_argument(
-        "--terms", type=int, default=10, help="Number of terms to study (default: 10)"
-    )
-    parser.add_argument(
-        "--glossary", default="glossary.wiki", help="Glossary file path"
-    )
-    parser.add_argument(
-        "--format",
-        choices=["text", "wiki", "json"],
-        default="text",
-        help="Output format",
-    )
-    parser.add_argument(
-        "--chapter", help="Filter by chapter (disables auto deadline filtering)"
-    )
-    parser.add_argument(
-        "--importance", choices=["high", "medium", "low"], help="Filter by importance"
-    )
-    parser.add_argument(
-        "--tag", help="Filter by tag (disables auto deadline filtering)"
-    )
-    parser.add_argument(
-        "--randomize", action="store_true", help="Randomize selection (weighted)"
-    )
-    parser.add_argument(
-        "--no-deadline",
-        action="store_true",
-        help="Disable automatic filtering by upcoming deadlines",
-    )
-    parser.add_argument("--mark-reviewed", metavar="TERM", help="Mark term as reviewed")
-    parser.add_argument(
-        "--mastery-gain",
-        type=int,
-        default=1,
-        help="Mastery points to add when reviewing",
+        recent = stats.reviews_per_day(today, 14)
+        reviewed = sum(n for _, n in recent)
+        print(f"\n📅 Reviews per day (last 14 days, {reviewed} total):")
+        if reviewed:
+            peak = max(n for _, n in recent)
+            for day, n in recent:
+                bar = "█" * max(1 if n else 0, round(n * 30 / peak))
+                print(f"  {day.isoformat()} {day:%a}  {bar} {n}")
+        else:
+            print("  No reviews logged")
+
+        timeline = load_timeline(self.plans_files, self.cache_dir)
+        upcoming = timeline.next_due_per_course(today)
+        if not upcoming:
+            print("\n📝 No upcoming assignments in the course plan")
+        for assignment in upcoming:
+            ready = stats.readiness(assignment.chapters, today)
+            course = f" ({assignment.course})" if len(upcoming) > 1 else ""
+            chapters = ", ".join(assignment.chapters) or "no chapters"
+            print(
+                f"\n📝 Readiness for '{assignment.name}'{course}, due in "
+                f"{assignment.days_from(today)} days (chapters {chapters}):"
+            )
+            if not ready["terms"]:
+                print("  No terms filed under these chapters")
+                continue
+            print(
+                f"  {ready['terms']} terms, mean mastery "
+                f"{ready['mean_mastery']:.1f}/5, "
+                f"{ready['ready'] * 100 // ready['terms']}% at level "
+                f"{READY_MASTERY}+"
+            )
+            print(
+                f"  {ready['overdue']} overdue, {ready['due_today']} due today, "
+                f"{ready['unreviewed']} never reviewed"
+            )
+
+    @tracing.traced("export")
+    def export_to_json(
+        self,
+        filename: str = None,
+        export_format: str = None,
+        filter_chapter: str = None,
+        filter_importance: str = None,
+        filter_tag: str = None,
+    ) -> int:
+        """
+        Stream every term (or those passing the plan filters) with its review
+        state to `filename` ("-" or None for stdout) as NDJSON, JSON, CSV or
+        columnar chunks (see term_export). Returns the number of terms written.
+        """
+        if not self.terms:
+            self.parse_glossary()
+        names = self.select_terms(
+            chapter=filter_chapter, importance=filter_importance, tag=filter_tag
+        )
+        from term_export import export_format_for, export_rows, term_rows
+
+        export_format = export_format_for(filename, export_format)
+        count = export_rows(
+            term_rows(self.terms, names, self.metadata), filename, export_format
+        )
+        tracing.count("terms_exported", count)
+        return count
+
+
+def read_review_records(lines, default_gain: int = 1, default_grade: int = None):
+    """
+    Parse 'term[,mastery_gain[,YYYY-MM-DD[,grade]]]' CSV lines (quote terms
+    containing commas; grade is 1-4 or again/hard/good/easy).
+    Blank lines and '#' comments are skipped. Returns (records, errors).
+    """
+    import csv
+
+    from review_schedulers import parse_grade, parse_mastery_gain
+
+    today = date.today()
+    default_grade = default_grade or DEFAULT_GRADE
+    records, errors = [], []
+    for lineno, row in enumerate(csv.reader(lines), 1):
+        if not row or not row[0].strip() or row[0].lstrip().startswith("#"):
+            continue
+        term_name = row[0].strip()
+        try:
+            gain = default_gain
+            if len(row) > 1 and row[1].strip():
+                gain = parse_mastery_gain(row[1])
+            reviewed_on = (
+                datetime.strptime(row[2].strip(), "%Y-%m-%d").date()
+                if len(row) > 2 and row[2].strip()
+                else today
+            )
+            grade = default_grade
+            if len(row) > 3 and row[3].strip():
+                grade = parse_grade(row[3])
+        except ValueError as e:
+            errors.append(f"line {lineno}: {e}")
+            continue
+        records.append((term_name, gain, reviewed_on, grade))
+    return records, errors
+
+
+def run_review_batch(
+    planner: "GlossaryStudyPlanner", lines, default_gain: int, default_grade: int = None
+):
+    """Apply review records from CSV lines in one write and report the outcome"""
+    records, errors = read_review_records(lines, default_gain, default_grade)
+    outcome = planner.mark_terms_reviewed(records)
+    for term_name, old_mastery, new_mastery, next_review in outcome["results"]:
+        print(
+            f"✅ {term_name}: mastery {old_mastery} → {new_mastery}, next review {next_review}"
+        )
+    print(
+        f"\n📊 Applied {len(outcome['results'])} reviews to "
+        f"{len(set(r[0] for r in outcome['results']))} terms in one write"
     )
-    parser.add_argument("--update-term", metavar="TERM", help="Update term metadata")
-    # ### MODIFIED: Removed --set-chapter, --exam-importance, --study-importance args from argparse
-    # This is because these are now managed directly in glossary_config.yaml
-    # If you still want to allow dynamic updates for these, we'd need to re-add them
-    # and adjust update_term_metadata logic to save to both config and metadata JSON.
-    # For now, I'm assuming these are *static* and should be edited in YAML.
+    if outcome["unknown"]:
+        print(f"❌ Unknown terms ({len(outcome['unknown'])}):")
+        for term_name in outcome["unknown"]:
+            print(f"  - {term_name}")
+    if errors:
+        print(f"⚠️  Skipped {len(errors)} malformed lines:")
+        for error in errors:
+            print(f"  - {error}")
+
+
+def _progress_output(format_type: str, output: str = None):
+    """Where parsing/progress messages go: stderr when stdout carries JSON"""
+    if format_type == "json" and output in (None, "-"):
+        return redirect_stdout(sys.stderr)
+    return nullcontext()
+
 
-    parser.add_argument("--stats", action="store_true", help="Show statistics")
-    parser.add_argument("--export", help="Export to JSON file")
-    args = parser.parse_args()
+def _plan_output(planner: "GlossaryStudyPlanner", args):
+    """(format, output file) of a plan or schedule: --diary means today's page"""
+    if args.diary:
+        from plan_renderers import diary_path
 
-    planner = GlossaryStudyPlanner(glossary_file=args.glossary)
+        return "wiki", str(diary_path(planner.base_dir))
+    return args.format, args.output
 
+
+def run_command(planner: "GlossaryStudyPlanner", args):
+    """Run the command selected by parsed CLI args against a planner"""
     if args.mark_reviewed:
-        planner.parse_glossary()
-        planner.mark_term_reviewed(args.mark_reviewed, args.mastery_gain)
+        if not planner.terms:
+            planner.parse_glossary()
+        planner.mark_term_reviewed(
+            args.mark_reviewed, args.mastery_gain, args.grade or DEFAULT_GRADE
+        )
+    elif args.review_batch:
+        from planner_cli import read_review_source
+
+        if not planner.terms:
+            planner.parse_glossary()
+        run_review_batch(
+            planner,
+            read_review_source(args.review_batch),
+            args.mastery_gain,
+            args.grade,
+        )
     elif args.update_term:
-        planner.parse_glossary()
+        if not planner.terms:
+            planner.parse_glossary()
         updates = {}
         # ### MODIFIED: Removed logic for static updates;
         # Now only dynamic updates are handled by --update-term command
@@ -698,21 +1284,80 @@ def main():
                 "Use --mark-reviewed for review data, or edit config/glossary_config.yaml for static properties."
             )
 
+    elif args.export_metadata:
+        planner.store.export_json(args.export_metadata)
+        print(
+            f"✅ Exported review data for {len(planner.metadata)} terms to {args.export_metadata}"
+        )
+    elif args.due:
+        planner.print_due_terms(planner.due_terms(args.terms))
     elif args.stats:
         planner.show_statistics()
     elif args.export:
-        planner.export_to_json(args.export)
+        from term_export import export_format_for
+
+        try:
+            export_format = export_format_for(args.export, args.export_format)
+        except ValueError as error:
+            print(f"❌ {error}")
+            return
+        # Progress messages go to stderr so an export to stdout stays clean
+        with redirect_stdout(sys.stderr):
+            if not planner.terms:
+                planner.parse_glossary()
+        count = planner.export_to_json(
+            args.export,
+            export_format,
+            args.chapter,
+            args.importance,
+            args.tag,
+        )
+        if args.export != "-":
+            print(f"✅ Exported {count} terms to {args.export}")
+    elif args.schedule:
+        format_type, output = _plan_output(planner, args)
+        with _progress_output(format_type, output):
+            scheduler, context_message = planner.generate_schedule(
+                days=args.days, capacity=args.capacity
+            )
+        planner.print_schedule(scheduler, context_message, format_type, output)
     else:
         # ### MODIFIED: Removed redundant checks and simplified logic based on arg parsing
-        study_terms, context_message = planner.generate_study_plan(
-            target_terms=args.terms,
-            filter_chapter=args.chapter,
-            filter_importance=args.importance,
-            filter_tag=args.tag,
-            randomize=args.randomize,
-            auto_filter_by_deadline=not args.no_deadline,  # Correctly pass the inverted flag
+        format_type, output = _plan_output(planner, args)
+        with _progress_output(format_type, output):
+            study_terms, context_message = planner.generate_study_plan(
+                target_terms=args.terms,
+                filter_chapter=args.chapter,
+                filter_importance=args.importance,
+                filter_tag=args.tag,
+                randomize=args.randomize,
+                auto_filter_by_deadline=not args.no_deadline,  # Correctly pass the inverted flag
+                seed=args.seed,
+                use_centrality=args.centrality,
+            )
+        planner.print_study_plan(study_terms, context_message, format_type, output)
+
+
+def main():
+    from planner_cli import build_parser
+
+    args = build_parser().parse_args()
+    tracing.start_from_args(args)
+
+    with tracing.span("startup"):
+        planner = GlossaryStudyPlanner(
+            glossary_file=args.glossary,
+            use_index=not args.no_index,
+            parallel=args.parallel,
+            workers=args.workers,
+            metadata_store=args.store,
+            plans_files=args.plans,
+            review_scheduler=args.scheduler,
         )
-        planner.print_study_plan(study_terms, context_message, args.format)
+    if args.rebuild_index:
+        planner.parse_glossary(rebuild_index=True)
+    run_command(planner, args)
+    tracing.finish(args)
 
 
 if __name__ == "__main__":
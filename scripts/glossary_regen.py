@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Glossary Regen - Incremental rebuild of glossary.wiki from notes/topics/*.wiki
+
+Produces the same file as the original update_glossary.sh: one
+"* [[topics/x|X]] :: description" entry per topic page (file name with its
+first letter capitalized; description = first non-empty line not starting with
+"=", leading spaces removed), grouped under "== L ==" sections and sorted
+case-insensitively like `sort -f`.
+
+Each topic's entry is cached with the file's mtime/size
+(notes/data/cache/glossary_regen.pickle), so only new, changed or deleted
+topics are re-read and only their letter sections are re-rendered. The
+glossary is replaced through a temp file + rename, and not at all when no
+entry changed, so it is cheap enough to run on every save.
+
+Usage:
+    python3 scripts/glossary_regen.py
+    python3 scripts/glossary_regen.py --full
+    python3 scripts/glossary_regen.py --quiet notes/topics/plasmid.wiki  # on save
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PROJECT_DIR = Path(__file__).parent.parent
+NOTES_DIR = PROJECT_DIR / "notes"
+DEFAULT_CACHE_FILE = NOTES_DIR / "data" / "cache" / "glossary_regen.pickle"
+CACHE_VERSION = 1
+
+HEADER = "= Glossary =\n\n"
+NO_DESCRIPTION = "No description yet."
+
+
+def topic_entry(path: str, filename: str) -> Tuple[str, str]:
+    """(letter, glossary line) for one topic page"""
+    display_name = filename[:1].upper() + filename[1:]
+    description = ""
+    with open(path, "r", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line and line[0] != "=":
+                description = line.lstrip(" ")
+                break
+    description = description or NO_DESCRIPTION
+    return display_name[:1], f"* [[topics/{filename}|{display_name}]] :: {description}"
+
+
+def render_section(letter: str, entries: List[str]) -> str:
+    # sort -f: case-folded order, ties broken by the raw line
+    lines = sorted(entries, key=lambda entry: (entry.upper(), entry))
+    return f"== {letter.upper()} ==\n" + "".join(f"{e}\n" for e in lines) + "\n"
+
+
+def file_stamp(path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class GlossaryRegenerator:
+    """
+    Cached state:
+      - topics:   {file name: (mtime, size, letter, entry)}
+      - sections: {letter: rendered "== L ==" section}
+      - written:  (mtime, size) of the glossary as last written, to notice edits
+      - dir_stamp: (mtime, size) of the topics directory at the last full scan
+    """
+
+    def __init__(self, topics_dir: Path, glossary_file: Path, cache_file: Path):
+        self.topics_dir = Path(topics_dir)
+        self.glossary_file = Path(glossary_file)
+        self.cache_file = Path(cache_file)
+        self.clear()
+        self.load()
+
+    def clear(self):
+        self.topics: Dict[str, Tuple] = {}
+        self.sections: Dict[str, str] = {}
+        self.written: Optional[Tuple[int, int]] = None
+        self.dir_stamp: Optional[Tuple[int, int]] = None
+        self.dirty = True
+
+    def load(self):
+        try:
+            with open(self.cache_file, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            print(f"Warning: Ignoring unreadable glossary cache {self.cache_file}: {e}")
+            return
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            self.topics = data["topics"]
+            self.sections = data["sections"]
+            self.written = data["written"]
+            self.dir_stamp = data["dir_stamp"]
+            self.dirty = False
+
+    def save(self):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_name(
+            f"{self.cache_file.name}.{os.getpid()}.tmp"
+        )
+        with open(tmp_file, "wb") as f:
+            pickle.dump(
+                {
+                    "version": CACHE_VERSION,
+                    "topics": self.topics,
+                    "sections": self.sections,
+                    "written": self.written,
+                    "dir_stamp": self.dir_stamp,
+                },
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_file, self.cache_file)
+        self.dirty = False
+
+    def _refresh(self, filename: str, path: str, st, affected: set) -> bool:
+        """Re-read one topic if its mtime/size changed; True when it was re-read"""
+        cached = self.topics.get(filename)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return False
+        try:
+            letter, entry = topic_entry(path, filename)
+        except OSError as e:
+            print(f"Warning: Could not read {path}: {e}")
+            return False
+        self.topics[filename] = (st.st_mtime_ns, st.st_size, letter, entry)
+        self.dirty = True
+        # A touched file with the same entry leaves its section alone
+        if cached is None or cached[2:] != (letter, entry):
+            affected.add(letter)
+            if cached is not None:
+                affected.add(cached[2])
+        return True
+
+    def scan(self, paths: List[str] = None) -> Tuple[int, set]:
+        """
+        Re-read new/changed topics and drop deleted ones; (changed, letters).
+        With `paths` (e.g. the file just saved) only those topics are checked,
+        unless the directory itself changed (a topic was added, removed or
+        renamed), which always triggers a full scan.
+        """
+        changed = 0
+        affected = set()
+        dir_stamp = file_stamp(self.topics_dir)
+        if paths and self.topics and dir_stamp == self.dir_stamp:
+            for path in paths:
+                path = Path(path)
+                if path.parent.resolve() != self.topics_dir.resolve():
+                    continue
+                if path.suffix != ".wiki":
+                    continue
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                changed += self._refresh(path.stem, str(path), st, affected)
+            return changed, affected
+
+        seen = set()
+        with os.scandir(self.topics_dir) as it:
+            for dir_entry in it:
+                name = dir_entry.name
+                if not name.endswith(".wiki") or not dir_entry.is_file():
+                    continue
+                filename = name[:-5]
+                seen.add(filename)
+                changed += self._refresh(
+                    filename, dir_entry.path, dir_entry.stat(), affected
+                )
+        topics = self.topics
+        for filename in [f for f in topics if f not in seen]:
+            affected.add(topics.pop(filename)[2])
+            self.dirty = True
+            changed += 1
+        if dir_stamp != self.dir_stamp:  # checked without a full scan from now on
+            self.dir_stamp = dir_stamp
+            self.dirty = True
+        return changed, affected
+
+    def render(self, letters: set):
+        """Re-render the given letter sections from the cached entries"""
+        entries = {letter: [] for letter in letters}
+        for _, _, letter, entry in self.topics.values():
+            if letter in entries:
+                entries[letter].append(entry)
+        for letter, letter_entries in entries.items():
+            if letter_entries:
+                self.sections[letter] = render_section(letter, letter_entries)
+            else:
+                self.sections.pop(letter, None)
+
+    def text(self) -> str:
+        return HEADER + "".join(self.sections[l] for l in sorted(self.sections))
+
+    def regenerate(self, paths: List[str] = None) -> Tuple[int, int, bool]:
+        """Bring glossary.wiki up to date; (topics re-read, sections redone, written)"""
+        changed, affected = self.scan(paths)
+        self.render(affected)
+        # Rewrite when sections changed or the glossary is missing or hand-edited
+        written = False
+        if affected or file_stamp(self.glossary_file) != self.written:
+            self.glossary_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.glossary_file.with_name(
+                f".{self.glossary_file.name}.{os.getpid()}.tmp"
+            )
+            with open(tmp_file, "w") as f:
+                f.write(self.text())
+            os.replace(tmp_file, self.glossary_file)
+            self.written = file_stamp(self.glossary_file)
+            written = True
+        if self.dirty or written:
+            self.save()
+        return changed, len(affected), written
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Regenerate glossary.wiki from topic pages"
+    )
+    parser.add_argument(
+        "--topics", default=str(NOTES_DIR / "topics"), help="Topic pages directory"
+    )
+    parser.add_argument(
+        "--glossary", default=str(NOTES_DIR / "glossary.wiki"), help="Glossary file"
+    )
+    parser.add_argument(
+        "--cache-file", default=str(DEFAULT_CACHE_FILE), help="Entry cache location"
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="Ignore the cache and re-read every topic"
+    )
+    parser.add_argument("--quiet", action="store_true", help="Only report errors")
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        metavar="TOPIC",
+        help="Topic file(s) just saved: check only these (full scan if any "
+        "topic was added, removed or renamed)",
+    )
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.topics):
+        print(f"❌ Topics directory not found: {args.topics}")
+        return 1
+    start = time.perf_counter()
+    regen = GlossaryRegenerator(args.topics, args.glossary, args.cache_file)
+    if args.full:
+        regen.clear()
+    changed, sections, written = regen.regenerate(args.paths)
+    elapsed = (time.perf_counter() - start) * 1000
+    if args.quiet:
+        return 0
+    if written:
+        print(
+            f"✅ Glossary regenerated at {args.glossary} ({len(regen.topics)} topics, "
+            f"{changed} re-read, {sections} sections updated, {elapsed:.0f} ms)"
+        )
+    else:
+        print(f"✅ Glossary up to date ({len(regen.topics)} topics, {elapsed:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
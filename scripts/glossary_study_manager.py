@@ -3,31 +3,52 @@
 Glossary Configuration Manager - Bulk update term metadata from YAML/JSON config
 """
 import json
-import yaml
 import argparse
+import os
 import sys
+from datetime import date
 from pathlib import Path
+from typing import Dict, List, Optional
 
 # Add the scripts directory to Python path for importing
 sys.path.insert(0, str(Path(__file__).parent))
+import tracing
+from config_validator import (
+    DYNAMIC_FIELDS,
+    IMPORTANCE_LEVELS,
+    STATIC_FIELDS,
+    load_yaml_plain_dates,
+    locate_issues,
+    split_issues,
+    validate_config,
+)
 from glossary_planner import GlossaryStudyPlanner
+from yaml_cache import load_yaml
 
 
-def load_config(config_file):
-    """Load configuration from YAML or JSON file"""
+def resolve_config_path(config_file) -> Path:
+    """Config paths are relative to the project directory (not scripts/)"""
     config_path = Path(config_file)
-
-    # If relative path, resolve from parent directory (not scripts/)
     if not config_path.is_absolute():
         config_path = Path(__file__).parent.parent / config_file
+    return config_path
+
+
+@tracing.traced("load_config_file")
+def load_config(config_file):
+    """Load configuration from YAML or JSON file"""
+    config_path = resolve_config_path(config_file)
 
+    if config_path.suffix.lower() in [".yaml", ".yml"]:
+        try:
+            return load_yaml(config_path)
+        except ValueError:  # impossible date: load it as text for the validator
+            return load_yaml_plain_dates(config_path)
     with open(config_path, "r") as f:
-        if config_path.suffix.lower() in [".yaml", ".yml"]:
-            return yaml.safe_load(f)
-        else:
-            return json.load(f)
+        return json.load(f)
 
 
+@tracing.traced("generate_config")
 def generate_sample_config(planner, output_file="glossary_config.yaml"):
     """Generate a sample configuration file with all terms"""
     if not planner.terms:
@@ -76,46 +97,7 @@ def generate_sample_config(planner, output_file="glossary_config.yaml"):
 
     # Save to parent directory (not scripts/)
     output_path = Path(__file__).parent.parent / "config" / output_file
-
-    # Save as YAML with custom formatting for better readability
-    with open(output_path, "w") as f:
-        f.write("# Glossary Term Metadata Configuration\n")
-        f.write(
-            "# This file controls chapter assignments, importance levels, and tags\n"
-        )
-        f.write("# for all glossary terms.\n\n")
-
-        f.write(f"metadata_version: '{config['metadata_version']}'\n")
-        f.write(f"description: {config['description']}\n\n")
-        f.write("terms:\n")
-
-        current_chapter = None
-        for term_name in sorted(
-            config["terms"].keys(),
-            key=lambda x: (config["terms"][x].get("chapter") or "ZZZ", x),
-        ):
-            term_config = config["terms"][term_name]
-            term_chapter = term_config.get("chapter")
-
-            # Add chapter header comment
-            if term_chapter != current_chapter:
-                if term_chapter:
-                    f.write(f"\n  # === Chapter {term_chapter} Terms ===\n")
-                else:
-                    f.write(f"\n  # === Unassigned Terms ===\n")
-                current_chapter = term_chapter
-
-            f.write(f"  {term_name}:\n")
-            f.write(f"    chapter: {term_chapter or 'null'}\n")
-            f.write(f"    exam_importance: {term_config['exam_importance']}\n")
-            f.write(f"    study_importance: {term_config['study_importance']}\n")
-
-            if term_config["tags"]:
-                f.write(f"    tags: {term_config['tags']}\n")
-            else:
-                f.write(f"    tags: []\n")
-
-            f.write(f"    notes: '{term_config['notes']}'\n")
+    write_config(output_path, config["terms"], config)
 
     print(
         f"✅ Generated organized config with {len(config['terms'])} terms: {output_path}"
@@ -127,63 +109,390 @@ def generate_sample_config(planner, output_file="glossary_config.yaml"):
     print("✏️  Edit this file to customize chapters, importance levels, and tags")
 
 
-def apply_config(planner, config_file):
-    """Apply configuration to glossary terms"""
+def _yaml_text(value) -> str:
+    """Single-quoted YAML scalar (quotes doubled), safe for any string"""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _yaml_key(name) -> str:
+    name = str(name)
+    if not name or name != name.strip() or any(c in name for c in ":#'\"[]{},&*!|>%@`"):
+        return _yaml_text(name)
+    return name
+
+
+def _yaml_value(value) -> str:
+    """Flow-style YAML for any loaded config value (strings always quoted)"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        if value != value:
+            return ".nan"
+        if value in (float("inf"), float("-inf")):
+            return ".inf" if value > 0 else "-.inf"
+        return repr(value)
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_yaml_value(item) for item in value) + "]"
+    if isinstance(value, dict):
+        items = (f"{_yaml_key(k)}: {_yaml_value(v)}" for k, v in value.items())
+        return "{" + ", ".join(items) + "}"
+    return _yaml_text(value)
+
+
+def _yaml_chapter(chapter) -> str:
+    if chapter in (None, ""):
+        return "null"
+    if isinstance(chapter, str) and chapter.isdigit():
+        return chapter
+    return _yaml_value(chapter)
+
+
+def _yaml_importance(level) -> str:
+    return level if level in IMPORTANCE_LEVELS else _yaml_value(level)
+
+
+def _yaml_field(field: str, value) -> str:
+    """A term field's value as glossary_config.yaml writes it"""
+    if field == "chapter":
+        return _yaml_chapter(value)
+    if field in ("exam_importance", "study_importance"):
+        return _yaml_importance(value)
+    if field == "tags":
+        return "[" + ", ".join(_yaml_text(tag) for tag in value or []) + "]"
+    if field == "notes":
+        return _yaml_text(value or "")
+    return _yaml_value(value)
+
+
+def _term_lines(term_name, term_config: Dict, indent: str = "  ") -> List[str]:
+    """A term's entry: the static fields first, then any others as they are"""
+    fields = {
+        "chapter": term_config.get("chapter"),
+        "exam_importance": term_config.get("exam_importance", "medium"),
+        "study_importance": term_config.get("study_importance", "medium"),
+        "tags": term_config.get("tags"),
+        "notes": term_config.get("notes"),
+    }
+    fields.update(
+        (field, value)
+        for field, value in term_config.items()
+        if field not in STATIC_FIELDS
+    )
+    return [f"{indent}{_yaml_key(term_name)}:"] + [
+        f"{indent}  {_yaml_key(field)}: {_yaml_field(field, value)}"
+        for field, value in fields.items()
+    ]
+
+
+def render_config(terms: Dict, header: Dict = None) -> str:
+    """
+    glossary_config.yaml text: terms grouped under chapter comments. Top-level
+    keys of `header` other than the terms and per-term fields other than the
+    static ones are written back as they are, after the known ones.
+    """
+    header = header or {}
+    lines = [
+        "# Glossary Term Metadata Configuration",
+        "# This file controls chapter assignments, importance levels, and tags",
+        "# for all glossary terms.",
+        "",
+        f"metadata_version: {_yaml_text(header.get('metadata_version', '1.0'))}",
+        "description: "
+        + _yaml_text(
+            header.get("description", "Glossary term metadata configuration")
+        ),
+    ]
+    for key, value in header.items():
+        if key not in ("metadata_version", "description", "terms"):
+            lines.append(f"{_yaml_key(key)}: {_yaml_value(value)}")
+    lines += ["", "terms:"]
+
+    def chapter_of(term_name):
+        chapter = (terms[term_name] or {}).get("chapter")
+        return None if chapter in (None, "") else chapter
+
+    current_chapter = None
+    for term_name in sorted(
+        terms, key=lambda x: (str(chapter_of(x) or "ZZZ"), str(x))
+    ):
+        term_chapter = chapter_of(term_name)
+
+        # Add chapter header comment
+        if term_chapter != current_chapter:
+            if term_chapter:
+                lines.append(f"\n  # === Chapter {term_chapter} Terms ===")
+            else:
+                lines.append("\n  # === Unassigned Terms ===")
+            current_chapter = term_chapter
+
+        term_config = {**(terms[term_name] or {}), "chapter": term_chapter}
+        lines += _term_lines(term_name, term_config)
+    return "\n".join(lines) + "\n"
+
+
+def _content_end(text: str, start: int, end: int) -> int:
+    """`end` moved back over the blank characters ending text[start:end]"""
+    while end > start and text[end - 1] in " \t\r\n":
+        end -= 1
+    return end
+
+
+def _line_end(text: str, start: int, end: int) -> int:
+    """End of the line holding the last non-blank character of text[start:end]"""
+    newline = text.find("\n", _content_end(text, start, end))
+    return len(text) if newline == -1 else newline
+
+
+def _node_end(node) -> int:
+    """
+    Where a node's own text ends: block collections end at their last item,
+    not at the next token (which would take in the comments after them)
+    """
+    import yaml
+
+    while isinstance(node, yaml.CollectionNode) and not node.flow_style and node.value:
+        node = node.value[-1]
+        if isinstance(node, tuple):  # mapping item: (key, value)
+            node = node[1]
+    return node.end_mark.index
+
+
+def edit_config_text(text: str, changes: Dict[str, Dict]) -> Optional[str]:
+    """
+    `text` of a glossary_config.yaml with the changed term fields rewritten in
+    place, so comments and layout survive; missing fields are added after a
+    term's last field and new terms after the last term. None when the terms
+    are not block mappings (the caller renders the whole config instead).
+    """
+    import yaml
+    from yaml_cache import _yaml_loader
+
+    try:
+        root = yaml.compose(text, Loader=_yaml_loader())
+    except yaml.YAMLError:
+        return None
+    if not isinstance(root, yaml.MappingNode) or root.flow_style:
+        return None
+    terms_node = next(
+        (value for key, value in root.value if key.value == "terms"), None
+    )
+    if not isinstance(terms_node, yaml.MappingNode) or terms_node.flow_style:
+        return None
+    entries = {key.value: (key, value) for key, value in terms_node.value}
+    edits = []  # (start, end, replacement), applied back to front
+    new_terms = {}
+    for term_name, fields in changes.items():
+        if str(term_name) not in entries:
+            new_terms[term_name] = fields
+            continue
+        key_node, entry = entries[str(term_name)]
+        if not isinstance(entry, yaml.MappingNode) or entry.flow_style:
+            return None
+        present = {key.value: (key, value) for key, value in entry.value}
+        added = []
+        for field, value in fields.items():
+            if field not in present:
+                added.append(f"{_yaml_key(field)}: {_yaml_field(field, value)}")
+                continue
+            key, node = present[field]
+            rendered = _yaml_field(field, value)
+            start = node.start_mark.index
+            if isinstance(node, yaml.CollectionNode) and not node.flow_style:
+                # block list or mapping: the flow value goes right after the colon
+                start = text.index(":", key.end_mark.index) + 1
+                rendered = " " + rendered
+            elif start == node.end_mark.index and text[start - 1 : start] == ":":
+                rendered = " " + rendered  # empty value
+            end = _content_end(text, start, _node_end(node))
+            edits.append((start, end, rendered))
+        if added:
+            indent = " " * entry.value[0][0].start_mark.column
+            position = _line_end(text, 0, _node_end(entry))
+            edits.append(
+                (position, position, "".join(f"\n{indent}{line}" for line in added))
+            )
+    if new_terms:
+        indent = " " * terms_node.value[0][0].start_mark.column
+        position = _line_end(text, 0, _node_end(terms_node))
+        lines = []
+        for term_name, fields in new_terms.items():
+            lines += _term_lines(term_name, fields, indent)
+        edits.append((position, position, "".join(f"\n{line}" for line in lines)))
+    for start, end, replacement in sorted(edits, reverse=True):
+        text = text[:start] + replacement + text[end:]
+    return text
+
+
+def config_text(config_file: Path, terms: Dict, changes: Dict[str, Dict]) -> str:
+    """
+    New text of `config_file` after `changes` (`terms` is the whole merged
+    config): edited into the existing text where possible, else rendered from
+    `terms` with the file's top-level keys
+    """
+    if not config_file.exists():
+        return render_config(terms)
+    edited = edit_config_text(config_file.read_text(), changes)
+    if edited is not None:
+        return edited
+    return render_config(terms, load_config(config_file) or {})
+
+
+def write_config(output_path: Path, terms: Dict, header: Dict = None) -> Path:
+    """Write the config to a temp file and rename it over `output_path`"""
+    tmp_path = stage_config(output_path, render_config(terms, header))
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def stage_config(output_path: Path, text: str) -> Path:
+    """Write config `text` next to `output_path` without replacing it yet"""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f"{output_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    return tmp_path
+
+
+def print_issues(errors, warnings):
+    if errors:
+        print("❌ Validation errors:")
+        for error in errors:
+            print(f"  - {error}")
+    if warnings:
+        print("⚠️  Warnings:")
+        for warning in warnings:
+            print(f"  - {warning}")
+
+
+def _plain(value):
+    """Values as stored: YAML dates become YYYY-MM-DD strings"""
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def diff_config(planner, config_terms: Dict):
+    """
+    Changes a config would make, as ({term: {field: value}} for
+    glossary_config.yaml, same for the metadata store, report lines).
+    Terms not in the glossary are skipped (validation warns about them).
+    """
+    static_changes = {}
+    dynamic_changes = {}
+    report = []
+    for term_name, entry in config_terms.items():
+        if term_name not in planner.terms or not entry:
+            continue
+        current_static = planner.config_data.get(term_name) or {}
+        current_dynamic = planner.metadata.get(term_name) or {}
+        for field, value in entry.items():
+            value = _plain(value)
+            if field in STATIC_FIELDS:
+                # An empty chapter leaves the current assignment alone
+                if field == "chapter" and value in (None, ""):
+                    continue
+                old = current_static.get(field)
+                changes = static_changes
+            elif field in DYNAMIC_FIELDS:
+                old = current_dynamic.get(field)
+                changes = dynamic_changes
+            else:
+                continue
+            if value != old and not (field == "chapter" and str(value) == str(old)):
+                changes.setdefault(term_name, {})[field] = value
+                report.append(f"{term_name}: {field} {old!r} → {value!r}")
+    return static_changes, dynamic_changes, report
+
+
+@tracing.traced("apply_config")
+def apply_config(planner, config_file, dry_run: bool = False) -> bool:
+    """
+    Apply a configuration to glossary terms: static fields are edited into
+    glossary_config.yaml (only the changed values, so comments and layout are
+    kept), review fields go to the metadata store (one upsert, logged in the
+    review log). The new config is staged in a temp file first, then the store
+    is written, and only then is the config renamed into place, so a failed
+    store write leaves the config untouched. Nothing is written if validation
+    finds errors, and applying the same file twice changes nothing the second
+    time.
+    """
     config = load_config(config_file)
 
     if not planner.terms:
         planner.parse_glossary()
 
-    if "terms" not in config:
-        print("❌ Config file must have 'terms' section")
-        return
-
-    updated_count = 0
-    errors = []
-
-    for term_name, term_config in config["terms"].items():
-        if term_name not in planner.terms:
-            errors.append(f"Term '{term_name}' not found in glossary")
-            continue
-
-        # Prepare updates
-        updates = {}
-
-        # Chapter
-        if "chapter" in term_config and term_config["chapter"]:
-            updates["chapter"] = term_config["chapter"]
-
-        # Importance levels
-        if "exam_importance" in term_config:
-            if term_config["exam_importance"] in ["high", "medium", "low"]:
-                updates["exam_importance"] = term_config["exam_importance"]
-            else:
-                errors.append(
-                    f"Invalid exam_importance for '{term_name}': {term_config['exam_importance']}"
-                )
+    with tracing.span("validate"):
+        issues = validate_config(config, planner.terms)
+        locate_issues(resolve_config_path(config_file), issues)
+    errors, warnings = split_issues(issues)
+    print_issues(errors, warnings)
+    if errors:
+        print("\n❌ Nothing applied: fix the errors above first")
+        return False
 
-        if "study_importance" in term_config:
-            if term_config["study_importance"] in ["high", "medium", "low"]:
-                updates["study_importance"] = term_config["study_importance"]
-            else:
-                errors.append(
-                    f"Invalid study_importance for '{term_name}': {term_config['study_importance']}"
-                )
+    with tracing.span("diff"):
+        static_changes, dynamic_changes, report = diff_config(
+            planner, config.get("terms") or {}
+        )
+    tracing.count("config_terms_checked", len(config.get("terms") or {}))
+    if not report:
+        print("\n✅ Nothing to change: configuration already applied")
+        return True
+
+    print(f"\n📝 Changes ({len(report)}):")
+    for line in report:
+        print(f"  - {line}")
+    if dry_run:
+        print("\n(dry run, nothing written)")
+        return True
+
+    staged = None
+    if static_changes:
+        merged = {
+            name: dict(entry or {}) for name, entry in planner.config_data.items()
+        }
+        for term_name, fields in static_changes.items():
+            merged.setdefault(term_name, {}).update(fields)
+        with tracing.span("stage_config"):
+            text = config_text(planner.config_file, merged, static_changes)
+            staged = stage_config(planner.config_file, text)
+    try:
+        if dynamic_changes:
+            with tracing.span("write_review_data"):
+                planner.save_review_fields(dynamic_changes)
+    except BaseException:
+        if staged is not None:
+            staged.unlink(missing_ok=True)
+        raise
+    if staged is not None:
+        os.replace(staged, planner.config_file)
+        planner.config_data = merged
 
-        # Tags
-        if "tags" in term_config and isinstance(term_config["tags"], list):
-            updates["tags"] = term_config["tags"]
+    print(
+        f"\n✅ Updated {len(set(static_changes) | set(dynamic_changes))} terms "
+        f"({len(static_changes)} in {planner.config_file.name}, "
+        f"{len(dynamic_changes)} in review data)"
+    )
+    return True
 
-        # Apply updates
-        if updates:
-            planner.update_term_metadata(term_name, **updates)
-            updated_count += 1
 
-    print(f"\n✅ Updated {updated_count} terms")
-    if errors:
-        print(f"\n❌ Errors encountered:")
-        for error in errors:
-            print(f"  - {error}")
+@tracing.traced("validate_config")
+def validate_config_file(planner, config_file) -> bool:
+    """Report every problem in a config file with its line number"""
+    config = load_config(config_file)
+    planner.parse_glossary()
+    issues = validate_config(config, planner.terms)
+    locate_issues(resolve_config_path(config_file), issues)
+    errors, warnings = split_issues(issues)
+    print_issues(errors, warnings)
+    if not errors and not warnings:
+        print("✅ Configuration file is valid!")
+    return not errors
 
 
 def main():
@@ -205,12 +514,16 @@ def main():
     # Apply config
     apply_parser = subparsers.add_parser("apply", help="Apply configuration to terms")
     apply_parser.add_argument("config_file", help="Configuration file to apply")
+    apply_parser.add_argument(
+        "--dry-run", action="store_true", help="Show the changes without writing"
+    )
 
     # Validate config
     validate_parser = subparsers.add_parser(
         "validate", help="Validate configuration file"
     )
     validate_parser.add_argument("config_file", help="Configuration file to validate")
+    tracing.add_profile_arguments(parser)
 
     args = parser.parse_args()
 
@@ -218,55 +531,20 @@ def main():
         parser.print_help()
         return
 
-    planner = GlossaryStudyPlanner(glossary_file=args.glossary)
+    tracing.start_from_args(args)
+    with tracing.span("startup"):
+        planner = GlossaryStudyPlanner(glossary_file=args.glossary)
 
     if args.command == "generate":
         generate_sample_config(planner, args.output)
     elif args.command == "apply":
-        apply_config(planner, args.config_file)
+        apply_config(planner, args.config_file, args.dry_run)
     elif args.command == "validate":
         try:
-            config = load_config(args.config_file)
-            planner.parse_glossary()
-
-            errors = []
-            warnings = []
-
-            if "terms" not in config:
-                errors.append("Missing 'terms' section in config")
-            else:
-                for term_name, term_config in config["terms"].items():
-                    if term_name not in planner.terms:
-                        warnings.append(f"Term '{term_name}' not found in glossary")
-
-                    # Validate importance values
-                    for importance_field in ["exam_importance", "study_importance"]:
-                        if importance_field in term_config:
-                            if term_config[importance_field] not in [
-                                "high",
-                                "medium",
-                                "low",
-                            ]:
-                                errors.append(
-                                    f"Invalid {importance_field} for '{term_name}': {term_config[importance_field]}"
-                                )
-
-            if errors:
-                print("❌ Validation errors:")
-                for error in errors:
-                    print(f"  - {error}")
-
-            if warnings:
-                print("⚠️  Warnings:")
-                for warning in warnings:
-                    print(f"  - {warning}")
-
-            if not errors and not warnings:
-                print("✅ Configuration file is valid!")
-
+            validate_config_file(planner, args.config_file)
         except Exception as e:
             print(f"❌ Failed to validate config: {e}")
-
+    tracing.finish(args)
 
 if __name__ == "__main__":
     main()
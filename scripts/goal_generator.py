@@ -1,7 +1,9 @@
-import yaml
 from datetime import datetime
+from pathlib import Path
 import argparse
 
+from course_timeline import DEFAULT_PLAN_FILES, load_timeline
+
 
 # --- Helper function to parse topics ---
 def parse_topics(topics_list):
@@ -22,35 +24,33 @@ def parse_topics(topics_list):
 
 
 # --- Main Generator Logic ---
-def generate_study_plan(plan_file, output_format="text"):
-    with open(plan_file, "r") as f:
-        plan = yaml.safe_load(f)
+def generate_study_plan(plan_files, output_format="text"):
+    if isinstance(plan_files, (str, Path)):
+        plan_files = [plan_files]
+    timeline = load_timeline(plan_files)
+    for warning in timeline.warnings():
+        print(f"Warning: {warning}")
 
     today = datetime.now()
     today_date = today.date()  # Get just the date part for accurate day calculations
+    multi_course = len(timeline.courses) > 1
 
-    # Get today's assignments
-    todays_assignments = [
-        a
-        for a in plan.get("assignments", [])
-        if datetime.strptime(a["date"], "%Y-%m-%d").date() == today_date
-    ]
-
-    # Get upcoming assignments
-    upcoming_assignments = sorted(
-        [
-            a
-            for a in plan.get("assignments", [])
-            if datetime.strptime(a["date"], "%Y-%m-%d").date() > today_date
-        ],
-        key=lambda x: datetime.strptime(x["date"], "%Y-%m-%d"),
-    )
+    def label(assignment):
+        # Name the course when several plans are combined
+        if multi_course:
+            return f"{assignment.name} ({assignment.course})"
+        return assignment.name
+
+    # Due dates are parsed once by the timeline; these are bisect lookups
+    todays_assignments = timeline.due_on(today_date)
+    upcoming_assignments = timeline.after(today_date)
 
     # --- Generate Output ---
+    course = ", ".join(timeline.courses)
     if output_format == "wiki":
-        print(f"% {plan['course']} Study Plan for {today.strftime('%Y-%m-%d')}\n")
+        print(f"% {course} Study Plan for {today.strftime('%Y-%m-%d')}\n")
     else:
-        print(f"Study Plan for {plan['course']} - {today.strftime('%Y-%m-%d')}")
+        print(f"Study Plan for {course} - {today.strftime('%Y-%m-%d')}")
         print("=" * 40)
 
     # --- Today's Deadlines ---
@@ -62,9 +62,9 @@ def generate_study_plan(plan_file, output_format="text"):
             print(f"\n- {header} -")
 
         for assignment in todays_assignments:
-            item = f"**{assignment['name']}**"
+            item = f"**{label(assignment)}**"
             if assignment.get("location"):
-                item += f" at {assignment['location']}"
+                item += f" at {assignment.get('location')}"
             if output_format == "wiki":
                 print(f"* {item}")
             else:
@@ -86,11 +86,7 @@ def generate_study_plan(plan_file, output_format="text"):
     # --- Study Topics for Soon Assignments ---
     if upcoming_assignments:
         # Get assignments due within the next 5 days
-        soon_assignments = [
-            a
-            for a in upcoming_assignments
-            if (datetime.strptime(a["date"], "%Y-%m-%d").date() - today_date).days <= 5
-        ]
+        soon_assignments = timeline.due_within(today_date, 5)
 
         if soon_assignments:
             header = "Study for Upcoming Assignments"
@@ -100,25 +96,24 @@ def generate_study_plan(plan_file, output_format="text"):
                 print(f"- {header} -")
 
             for assignment in soon_assignments:
-                due_date = datetime.strptime(assignment["date"], "%Y-%m-%d").date()
-                days_left = (due_date - today_date).days
+                days_left = assignment.days_from(today_date)
 
                 if output_format == "wiki":
                     print(
-                        f"* *{assignment['name']}* - Due in {days_left} day(s) ({assignment['date']})"
+                        f"* *{label(assignment)}* - Due in {days_left} day(s) ({assignment.date_str})"
                     )
                     if assignment.get("location"):
-                        print(f"  Location: {assignment['location']}")
+                        print(f"  Location: {assignment.get('location')}")
                     topics = parse_topics(assignment.get("topics", []))
                     if topics:
                         for topic in topics:
                             print(f"  - [ ] {topic}")
                 else:
                     print(
-                        f"\n*{assignment['name']}* (Due in {days_left} days - {assignment['date']})"
+                        f"\n*{label(assignment)}* (Due in {days_left} days - {assignment.date_str})"
                     )
                     if assignment.get("location"):
-                        print(f"  Location: {assignment['location']}")
+                        print(f"  Location: {assignment.get('location')}")
                     topics = parse_topics(assignment.get("topics", []))
                     if topics:
                         print("  Topics:")
@@ -127,11 +122,7 @@ def generate_study_plan(plan_file, output_format="text"):
                 print()
 
         # Show other upcoming assignments (beyond 5 days) in a summary
-        later_assignments = [
-            a
-            for a in upcoming_assignments
-            if (datetime.strptime(a["date"], "%Y-%m-%d").date() - today_date).days > 5
-        ]
+        later_assignments = upcoming_assignments[len(soon_assignments) :]
 
         if later_assignments:
             header = "Later This Month"
@@ -141,16 +132,15 @@ def generate_study_plan(plan_file, output_format="text"):
                 print(f"- {header} -")
 
             for assignment in later_assignments[:5]:  # Show next 5
-                due_date = datetime.strptime(assignment["date"], "%Y-%m-%d").date()
-                days_left = (due_date - today_date).days
+                days_left = assignment.days_from(today_date)
 
                 if output_format == "wiki":
                     print(
-                        f"* *{assignment['name']}* - {assignment['date']} ({days_left} days)"
+                        f"* *{label(assignment)}* - {assignment.date_str} ({days_left} days)"
                     )
                 else:
                     print(
-                        f"  {assignment['name']} - {assignment['date']} ({days_left} days)"
+                        f"  {label(assignment)} - {assignment.date_str} ({days_left} days)"
                     )
 
     if not todays_assignments and not upcoming_assignments:
@@ -168,9 +158,15 @@ if __name__ == "__main__":
         action="store_true",
         help="Output the plan in VimWiki checklist format.",
     )
+    parser.add_argument(
+        "--plans",
+        nargs="+",
+        metavar="FILE",
+        default=DEFAULT_PLAN_FILES,
+        help="Course plan file(s) to combine (default: plans/microbiology.yaml)",
+    )
     args = parser.parse_args()
 
     output_mode = "wiki" if args.wiki else "text"
 
-    # You could make this an argument as well
-    generate_study_plan("plans/microbiology.yaml", output_format=output_mode)
+    generate_study_plan(args.plans, output_format=output_mode)
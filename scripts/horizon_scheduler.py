@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Horizon Scheduler - Spread glossary terms over the days before each upcoming deadline
+
+Every term in a chapter of an assignment due within the horizon gets one study
+slot on a day before that assignment; a term in several assignments gets one
+slot per assignment, spaced by its review interval (halfway to the next
+deadline when the interval is too long) and never before its next_review date
+(unless that would miss the deadline).
+
+Days are filled earliest-deadline-first at an even pace: each day takes just
+enough terms to finish every deadline's pending terms at a steady rate, never
+more than the per-day capacity. Within a deadline, high exam_importance terms
+(then higher priority scores) come first, so they land on the earliest days.
+Terms that cannot fit before their deadline are listed as unscheduled.
+
+The schedule is cached (notes/data/cache/schedule.pickle) together with the
+inputs of every term. When only a few terms changed since (typically a review),
+just their slots are removed and re-placed on the least loaded allowed days;
+the rest of the schedule stays as it was.
+"""
+import heapq
+import os
+import pickle
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+CACHE_VERSION = 1
+REVIEW_INTERVALS = [1, 3, 7, 14, 30, 60]
+IMPORTANCE_RANK = {"high": 0, "medium": 1, "low": 2}
+# Above this share of changed terms a full solve is cheaper (and better spread)
+REPAIR_LIMIT = 0.1
+
+# Per-term scheduler input:
+#   (jobs, importance rank, priority score, review count, release ordinal)
+# where jobs is a tuple of (deadline ordinal, assignment label), soonest first.
+TermInput = Tuple[Tuple[Tuple[int, str], ...], int, float, int, int]
+
+
+def build_tasks(assignments, select: Callable, label: Callable = None) -> Dict:
+    """
+    {term: ((deadline ordinal, label), ...)} for the given assignments.
+    `select(chapters)` returns the term names of those chapters; assignments due
+    on the same day are merged into one slot ("Exam 2, Quiz 6").
+    """
+    by_term: Dict[str, Dict[int, List[str]]] = {}
+    for assignment in assignments:
+        if not assignment.chapters:
+            continue
+        name = label(assignment) if label else assignment.name
+        for term_name in select(assignment.chapters):
+            jobs = by_term.setdefault(term_name, {})
+            jobs.setdefault(assignment.ordinal, []).append(name)
+    return {
+        term_name: tuple(
+            (deadline, ", ".join(labels)) for deadline, labels in sorted(jobs.items())
+        )
+        for term_name, jobs in by_term.items()
+    }
+
+
+def _ordinal(value) -> Optional[int]:
+    if isinstance(value, date):
+        return value.toordinal()
+    try:
+        return date.fromisoformat(str(value)).toordinal()
+    except ValueError:
+        return None
+
+
+def term_inputs(tasks: Dict, terms: Dict, scores: Dict, today: date) -> Dict:
+    """Scheduler inputs ({term: TermInput}) from tasks, term records and scores"""
+    start = today.toordinal()
+    inputs = {}
+    for term_name, jobs in tasks.items():
+        record = terms[term_name]
+        review_count = record.get("review_count") or 0
+        if not isinstance(review_count, int):
+            review_count = 0
+        next_review = record.get("next_review")
+        next_review = _ordinal(next_review) if next_review else None
+        inputs[term_name] = (
+            jobs,
+            IMPORTANCE_RANK.get(record.get("exam_importance"), 1),
+            scores.get(term_name, 0.0),
+            review_count,
+            max(start, next_review or start),
+        )
+    return inputs
+
+
+class HorizonScheduler:
+    """
+    Cached state:
+      - params:      (start ordinal, days, capacity, intervals) of the schedule
+      - inputs:      {term: TermInput} the schedule was built from
+      - placed:      {term: [(day ordinal, deadline ordinal, label)]}
+      - unscheduled: {term: [(deadline ordinal, label)]} that did not fit
+    """
+
+    def __init__(self, cache_file: Path = None, intervals: List[int] = None):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.intervals = list(intervals or REVIEW_INTERVALS)
+        self.clear()
+        self.load()
+
+    def clear(self):
+        self.params: Optional[Tuple] = None
+        self.inputs: Dict[str, TermInput] = {}
+        self.placed: Dict[str, List[Tuple[int, int, str]]] = {}
+        self.unscheduled: Dict[str, List[Tuple[int, str]]] = {}
+        self.dirty = True
+
+    def load(self):
+        if self.cache_file is None:
+            return
+        try:
+            with open(self.cache_file, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            print(f"Warning: Ignoring unreadable schedule cache {self.cache_file}: {e}")
+            return
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            self.params = data["params"]
+            self.inputs = data["inputs"]
+            self.placed = data["placed"]
+            self.unscheduled = data["unscheduled"]
+            self.dirty = False
+
+    def save(self):
+        if self.cache_file is None or not self.dirty:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_name(
+            f"{self.cache_file.name}.{os.getpid()}.tmp"
+        )
+        with open(tmp_file, "wb") as f:
+            pickle.dump(
+                {
+                    "version": CACHE_VERSION,
+                    "params": self.params,
+                    "inputs": self.inputs,
+                    "placed": self.placed,
+                    "unscheduled": self.unscheduled,
+                },
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_file, self.cache_file)
+        self.dirty = False
+
+    def _next_release(self, day: int, review_count: int, planned: int, deadline):
+        """
+        First day for the review after the `planned`-th one (studied on `day`):
+        a review interval later, or halfway to the next deadline when the interval
+        would not fit before it (so such reviews do not all pile up on its eve).
+        """
+        interval = self.intervals[min(review_count + planned, len(self.intervals) - 1)]
+        if day + interval < deadline:
+            return day + interval
+        return max(day + 1, (day + deadline) // 2)
+
+    def update(self, today: date, days: int, capacity: int, inputs: Dict) -> str:
+        """
+        Bring the schedule up to date; returns how: "cached" (nothing changed),
+        "repaired" (only changed terms re-placed) or "solved" (full solve).
+        """
+        params = (today.toordinal(), days, capacity, tuple(self.intervals))
+        if params == self.params:
+            old = self.inputs
+            changed = [t for t, new in inputs.items() if old.get(t) != new]
+            changed += [t for t in old if t not in inputs]
+            if not changed:
+                return "cached"
+            if len(changed) <= max(1, len(inputs) * REPAIR_LIMIT):
+                self._repair(changed, inputs)
+                return "repaired"
+        self.params = params
+        self._solve(inputs)
+        return "solved"
+
+    def _solve(self, inputs: Dict):
+        start, days, capacity, _ = self.params
+        end = start + days
+        placed = {term_name: [] for term_name in inputs}
+        unscheduled = {}
+        pending: Dict[int, int] = {}
+        waiting = []  # (release, term, job index) of each term's next job
+        for term_name, (jobs, _, _, _, release) in inputs.items():
+            for deadline, _ in jobs:
+                pending[deadline] = pending.get(deadline, 0) + 1
+            waiting.append((min(release, jobs[0][0] - 1), term_name, 0))
+        heapq.heapify(waiting)
+        deadlines = sorted(pending)
+        ready = []  # (deadline, importance rank, -score, term, job index)
+
+        def advance(term_name: str, index: int, studied_on: Optional[int] = None):
+            """Queue a term's next job after job `index` was placed or missed"""
+            jobs, _, _, review_count, release = inputs[term_name]
+            if index + 1 >= len(jobs):
+                return
+            deadline = jobs[index + 1][0]
+            if studied_on is not None:
+                release = self._next_release(
+                    studied_on, review_count, len(placed[term_name]) - 1, deadline
+                )
+            release = max(start, min(release, deadline - 1))
+            heapq.heappush(waiting, (release, term_name, index + 1))
+
+        for day in range(start, end):
+            while waiting and waiting[0][0] <= day:
+                _, term_name, index = heapq.heappop(waiting)
+                jobs, rank, score, _, _ = inputs[term_name]
+                heapq.heappush(ready, (jobs[index][0], rank, -score, term_name, index))
+            while ready and ready[0][0] <= day:  # deadline reached: did not fit
+                deadline, _, _, term_name, index = heapq.heappop(ready)
+                pending[deadline] -= 1
+                unscheduled.setdefault(term_name, []).append(
+                    inputs[term_name][0][index]
+                )
+                advance(term_name, index)
+            if not ready:
+                continue
+            # Even pace: the busiest rate any deadline needs from today on
+            quota = 0
+            cumulative = 0
+            for deadline in deadlines:
+                cumulative += pending[deadline]
+                if deadline > day and cumulative:
+                    quota = max(quota, -(-cumulative // (deadline - day)))
+            for _ in range(min(quota, capacity)):
+                if not ready:
+                    break
+                deadline, _, _, term_name, index = heapq.heappop(ready)
+                pending[deadline] -= 1
+                placed[term_name].append((day, *inputs[term_name][0][index]))
+                advance(term_name, index, day)
+        # Whatever is left (and the rest of its term's jobs) ran out of days
+        for entry in ready + waiting:
+            term_name, index = entry[-2:]
+            unscheduled.setdefault(term_name, []).extend(inputs[term_name][0][index:])
+
+        self.inputs = dict(inputs)
+        self.placed = {t: slots for t, slots in placed.items() if slots}
+        self.unscheduled = unscheduled
+        self.dirty = True
+
+    def _repair(self, changed: List[str], inputs: Dict):
+        """Re-place only the changed terms, each job on its least loaded allowed day"""
+        start, days, capacity, _ = self.params
+        end = start + days
+        for term_name in changed:
+            self.placed.pop(term_name, None)
+            self.unscheduled.pop(term_name, None)
+            self.inputs.pop(term_name, None)
+        load: Dict[int, int] = {}
+        for slots in self.placed.values():
+            for day, _, _ in slots:
+                load[day] = load.get(day, 0) + 1
+
+        for term_name in changed:
+            if term_name not in inputs:
+                continue
+            jobs, _, _, review_count, release = inputs[term_name]
+            slots = []
+            for deadline, label in jobs:
+                if slots:
+                    release = self._next_release(
+                        slots[-1][0], review_count, len(slots) - 1, deadline
+                    )
+                last = min(deadline, end) - 1
+                best = None
+                for day in range(max(start, min(release, last)), last + 1):
+                    if load.get(day, 0) < capacity and (
+                        best is None or load.get(day, 0) < load.get(best, 0)
+                    ):
+                        best = day
+                if best is None:
+                    self.unscheduled.setdefault(term_name, []).append((deadline, label))
+                    continue
+                load[best] = load.get(best, 0) + 1
+                slots.append((best, deadline, label))
+            if slots:
+                self.placed[term_name] = slots
+            self.inputs[term_name] = inputs[term_name]
+        self.dirty = True
+
+    def by_day(self) -> List[Tuple[int, List[Tuple[str, int, str]]]]:
+        """[(day ordinal, [(term, deadline ordinal, label)])] in day and plan order"""
+        days: Dict[int, List] = {}
+        for term_name, slots in self.placed.items():
+            for day, deadline, label in slots:
+                days.setdefault(day, []).append((term_name, deadline, label))
+        inputs = self.inputs
+
+        def order(entry):
+            term_name, deadline, _ = entry
+            _, rank, score, _, _ = inputs[term_name]
+            return deadline, rank, -score, term_name
+
+        return [(day, sorted(days[day], key=order)) for day in sorted(days)]
+
+    def slot_count(self) -> int:
+        return sum(len(slots) for slots in self.placed.values())
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Link Graph - Every [[wiki link]] in the vault resolved into one file-level graph
+
+Links are resolved the way vimwiki follows them: relative to the linking file's
+directory ("../../topics/plasmid" from a chapter note), from the vault root when
+they start with "/", with "#anchors" dropped and ".wiki" added to bare names.
+Each file's resolved links are cached (notes/data/cache/link_graph.pickle) and
+only new or changed files are re-read; the graph itself is rebuilt from the
+cache as compact CSR arrays (offsets + targets). On top of it:
+  - dangling links: targets that do not exist (wiki pages and assets)
+  - orphan topics: topic pages no other file links to
+  - PageRank centrality, which the study planner can fold into term priority
+
+Usage:
+    python3 scripts/link_graph.py check
+    python3 scripts/link_graph.py rank --limit 20
+"""
+import argparse
+import os
+import pickle
+import posixpath
+import re
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from glossary_index import source_fingerprint
+from wiki_tokenizer import LINK, tokenize_file
+
+PROJECT_DIR = Path(__file__).parent.parent
+NOTES_DIR = PROJECT_DIR / "notes"
+DEFAULT_CACHE_FILE = NOTES_DIR / "data" / "cache" / "link_graph.pickle"
+CACHE_VERSION = 1
+
+# "https://...", "mailto:...", "file:...", "diary:..." are not vault pages
+SCHEME_RE = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:")
+# A real file extension (".png", ".pdf"); "E. coli" is still a page name
+EXTENSION_RE = re.compile(r"\.[A-Za-z0-9]{1,5}$")
+
+DAMPING = 0.85
+TOLERANCE = 1e-10
+MAX_ITERATIONS = 100
+
+
+def resolve_link(target: str, source: str) -> Optional[str]:
+    """
+    Vault-relative path a link in `source` points to, or None for external links
+    and same-page anchors. Paths escaping the vault start with "../".
+    """
+    target = target.strip()
+    if SCHEME_RE.match(target):
+        return None
+    path = target.split("#", 1)[0].strip()
+    if not path:
+        return None
+    if path.startswith("/"):
+        base, path = "", path.lstrip("/")
+    else:
+        base = posixpath.dirname(source)
+    if path.endswith("/"):
+        path += "index"
+    resolved = posixpath.normpath(posixpath.join(base, path))
+    if not EXTENSION_RE.search(resolved):
+        resolved += ".wiki"
+    return resolved
+
+
+def read_links(path: Path, relpath: str) -> List[Tuple[str, int, str]]:
+    """(resolved target, line, link as written) for every internal link in a file"""
+    links = []
+    for kind, value, lineno in tokenize_file(path):
+        if kind == LINK:
+            resolved = resolve_link(value[0], relpath)
+            if resolved is not None:
+                links.append((resolved, lineno, value[0]))
+    return links
+
+
+def wiki_files(notes_dir: Path) -> List[Tuple[str, str]]:
+    """(path, vault-relative path) of every .wiki file, in no particular order"""
+    files = []
+    for root, _, names in os.walk(notes_dir):
+        prefix = os.path.relpath(root, notes_dir).replace(os.sep, "/")
+        prefix = "" if prefix == "." else prefix + "/"
+        for name in names:
+            if name.endswith(".wiki"):
+                files.append((os.path.join(root, name), prefix + name))
+    return files
+
+
+def link_key(relpath: str) -> str:
+    """Loose page key for "did you mean" hints: case, spaces and underscores ignored"""
+    return relpath.lower().replace(" ", "_")
+
+
+class LinkGraph:
+    """
+    Cached per-file links plus the CSR graph built from them:
+      - nodes:   vault-relative paths of every .wiki file, sorted
+      - offsets: node i links to targets[offsets[i]:offsets[i + 1]]
+      - targets: node ids, deduplicated and sorted per source (no self-links)
+    """
+
+    def __init__(self, notes_dir: Path = None, cache_file: Path = None):
+        self.notes_dir = Path(notes_dir or NOTES_DIR)
+        self.cache_file = Path(cache_file or DEFAULT_CACHE_FILE)
+        self.files: Dict[str, Dict] = {}
+        self.dirty = True
+        self.load()
+        self._build()
+
+    def load(self):
+        """Load cached links; an unreadable or outdated cache is ignored"""
+        try:
+            with open(self.cache_file, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            print(f"Warning: Ignoring unreadable link cache {self.cache_file}: {e}")
+            return
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return
+        self.files = data["files"]
+        self.dirty = False
+
+    def save(self):
+        """Atomically write the link cache if anything changed"""
+        if not self.dirty:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_name(
+            f"{self.cache_file.name}.{os.getpid()}.tmp"
+        )
+        with open(tmp_file, "wb") as f:
+            pickle.dump(
+                {"version": CACHE_VERSION, "files": self.files},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_file, self.cache_file)
+        self.dirty = False
+
+    def clear(self):
+        self.files = {}
+        self.dirty = True
+
+    def update(self) -> Tuple[int, int]:
+        """Re-read new and changed files and drop deleted ones; (changed, removed)"""
+        changed = 0
+        seen = set()
+        for path, relpath in wiki_files(self.notes_dir):
+            seen.add(relpath)
+            entry = self.files.get(relpath)
+            previous = entry["fingerprint"] if entry else None
+            fingerprint = source_fingerprint(path, previous)
+            if fingerprint is None or fingerprint is previous:
+                continue
+            if previous is not None and previous.get("hash") == fingerprint["hash"]:
+                entry["fingerprint"] = fingerprint  # touched, not edited
+                self.dirty = True
+                continue
+            try:
+                links = read_links(path, relpath)
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Warning: Could not read {path}: {e}")
+                links = []
+            self.files[relpath] = {"fingerprint": fingerprint, "links": links}
+            self.dirty = True
+            changed += 1
+        removed = [relpath for relpath in self.files if relpath not in seen]
+        for relpath in removed:
+            del self.files[relpath]
+            self.dirty = True
+        if changed or removed:
+            self._build()
+        return changed, len(removed)
+
+    def _build(self):
+        self.nodes: List[str] = sorted(self.files)
+        self.node_ids: Dict[str, int] = {n: i for i, n in enumerate(self.nodes)}
+        self.offsets = array("I", [0])
+        self.targets = array("I")
+        # (source, line, link as written, resolved path)
+        self.dangling: List[Tuple[str, int, str, str]] = []
+        node_ids = self.node_ids
+        assets = {}
+        for source_id, source in enumerate(self.nodes):
+            linked = set()
+            for resolved, lineno, raw in self.files[source]["links"]:
+                target_id = node_ids.get(resolved)
+                if target_id is not None:
+                    if target_id != source_id:
+                        linked.add(target_id)
+                    continue
+                if not resolved.endswith(".wiki") and not resolved.startswith("../"):
+                    exists = assets.get(resolved)
+                    if exists is None:
+                        exists = (self.notes_dir / resolved).exists()
+                        assets[resolved] = exists
+                    if exists:
+                        continue
+                self.dangling.append((source, lineno, raw, resolved))
+            self.targets.extend(sorted(linked))
+            self.offsets.append(len(self.targets))
+        self._ranks = None
+        self._keys = None
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def links_from(self, relpath: str) -> List[str]:
+        node_id = self.node_ids[relpath]
+        targets = self.targets[self.offsets[node_id] : self.offsets[node_id + 1]]
+        return [self.nodes[target_id] for target_id in targets]
+
+    def in_degrees(self) -> List[int]:
+        degrees = [0] * len(self.nodes)
+        for target_id in self.targets:
+            degrees[target_id] += 1
+        return degrees
+
+    def orphans(self, prefix: str = "topics/") -> List[str]:
+        """Pages under `prefix` that no other file links to"""
+        degrees = self.in_degrees()
+        return [
+            node
+            for node_id, node in enumerate(self.nodes)
+            if node.startswith(prefix) and not degrees[node_id]
+        ]
+
+    def suggestion(self, resolved: str) -> Optional[str]:
+        """An existing page matching a dangling target up to case/spaces/underscores"""
+        if self._keys is None:
+            self._keys = {link_key(node): node for node in self.nodes}
+        return self._keys.get(link_key(resolved))
+
+    def pagerank(self) -> List[float]:
+        """
+        PageRank of every node (sums to 1). Pages without outgoing links spread
+        their rank over all pages, as usual. Computed once per build.
+        """
+        if self._ranks is not None:
+            return self._ranks
+        n = len(self.nodes)
+        if not n:
+            self._ranks = []
+            return self._ranks
+        offsets, targets = self.offsets, self.targets
+        degrees = [offsets[i + 1] - offsets[i] for i in range(n)]
+        sinks = [i for i in range(n) if not degrees[i]]
+        # Reverse CSR (who links to each page) so every iteration pulls its
+        # incoming shares with one C-level sum per page
+        in_offsets = [0] * (n + 1)
+        for target_id in targets:
+            in_offsets[target_id + 1] += 1
+        for i in range(n):
+            in_offsets[i + 1] += in_offsets[i]
+        sources = array("I", bytes(4 * len(targets)))
+        fill = in_offsets[:-1]
+        for source_id in range(n):
+            for target_id in targets[offsets[source_id] : offsets[source_id + 1]]:
+                sources[fill[target_id]] = source_id
+                fill[target_id] += 1
+        incoming = [
+            sources[in_offsets[i] : in_offsets[i + 1]].tolist() for i in range(n)
+        ]
+
+        ranks = [1.0 / n] * n
+        for _ in range(MAX_ITERATIONS):
+            sink_rank = sum(ranks[i] for i in sinks)
+            base = (1.0 - DAMPING) / n + DAMPING * sink_rank / n
+            shares = [
+                DAMPING * rank / degree if degree else 0.0
+                for rank, degree in zip(ranks, degrees)
+            ]
+            share = shares.__getitem__
+            new_ranks = [base + sum(map(share, links)) for links in incoming]
+            delta = sum(abs(a - b) for a, b in zip(new_ranks, ranks))
+            ranks = new_ranks
+            if delta < TOLERANCE:
+                break
+        self._ranks = ranks
+        return ranks
+
+    def term_centrality(self, terms: Dict, glossary: str = "glossary.wiki") -> Dict:
+        """
+        {term name: centrality in [0, 1]} for terms with a topic page: the page's
+        PageRank relative to the most central term page. `glossary` is the
+        vault-relative glossary path the terms' wiki_link values are relative to.
+        """
+        ranks = self.pagerank()
+        term_ranks = {}
+        for term_name, term_data in terms.items():
+            wiki_link = term_data.get("wiki_link")
+            resolved = resolve_link(wiki_link, glossary) if wiki_link else None
+            node_id = self.node_ids.get(resolved)
+            if node_id is not None:
+                term_ranks[term_name] = ranks[node_id]
+        top = max(term_ranks.values(), default=0.0)
+        if not top:
+            return {}
+        return {term_name: rank / top for term_name, rank in term_ranks.items()}
+
+
+def load_link_graph(notes_dir: Path = None, cache_file: Path = None) -> LinkGraph:
+    """Link graph brought up to date with the vault (cache saved if it changed)"""
+    graph = LinkGraph(notes_dir, cache_file)
+    graph.update()
+    graph.save()
+    return graph
+
+
+def print_check(graph: LinkGraph) -> int:
+    """Report dangling links and orphan topics; returns how many problems were found"""
+    print(f"📊 {len(graph)} pages, {len(graph.targets)} links between them")
+    if graph.dangling:
+        print(f"\n❌ {len(graph.dangling)} dangling links:")
+        for source, lineno, raw, resolved in graph.dangling:
+            hint = graph.suggestion(resolved)
+            line = f"  {source}:{lineno}  [[{raw}]] -> {resolved}"
+            if resolved.startswith("../"):
+                line += "  (outside the vault)"
+            elif hint:
+                line += f"  (did you mean {hint}?)"
+            print(line)
+    orphans = graph.orphans()
+    if orphans:
+        print(f"\n⚠️  {len(orphans)} orphan topics (nothing links to them):")
+        for orphan in orphans:
+            print(f"  {orphan}")
+    if not graph.dangling and not orphans:
+        print("✅ No dangling links or orphan topics")
+    return len(graph.dangling) + len(orphans)
+
+
+def print_ranking(graph: LinkGraph, limit: int, prefix: str):
+    ranks = graph.pagerank()
+    degrees = graph.in_degrees()
+    ranked = sorted(
+        (i for i, node in enumerate(graph.nodes) if node.startswith(prefix)),
+        key=lambda node_id: -ranks[node_id],
+    )
+    print(f"{'rank':>4}  {'pagerank':>9}  {'in':>4}  page")
+    for position, node_id in enumerate(ranked[:limit], 1):
+        print(
+            f"{position:>4}  {ranks[node_id] * len(graph):>9.3f}  "
+            f"{degrees[node_id]:>4}  {graph.nodes[node_id]}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wiki link graph of the notes vault")
+    parser.add_argument(
+        "--cache-file", default=str(DEFAULT_CACHE_FILE), help="Link cache location"
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Discard the cache and re-read every file",
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+    subparsers.add_parser("check", help="List dangling links and orphan topics")
+    rank_parser = subparsers.add_parser("rank", help="Most central pages (PageRank)")
+    rank_parser.add_argument("--limit", type=int, default=20, help="Pages to show")
+    rank_parser.add_argument(
+        "--prefix",
+        default="topics/",
+        help="Only pages under this path (default: topics/; '' for all)",
+    )
+
+    args = parser.parse_args()
+    if not args.command:
+        parser.print_help()
+        return 0
+
+    graph = LinkGraph(cache_file=args.cache_file)
+    if args.rebuild:
+        graph.clear()
+    graph.update()
+    graph.save()
+    if args.command == "check":
+        return 1 if print_check(graph) else 0
+    print_ranking(graph, args.limit, args.prefix)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
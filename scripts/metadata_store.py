@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Metadata Store - Pluggable persistence for dynamic review data (mastery, review dates)
+
+Two backends share one interface:
+  - JsonMetadataStore:   the original notes/data/glossary_metadata.json, now written
+                         atomically under a file lock
+  - SqliteMetadataStore: notes/data/glossary_metadata.db in WAL mode with per-term
+                         row upserts, so concurrent writers never lose updates
+The JSON file stays available as an export format for either backend.
+
+Both answer "which terms are due by a date" without scanning every term: SQLite
+through its next_review index, the JSON store through a DueIndex (sorted
+(next_review, term) lines in notes/data/cache, patched on each write).
+"""
+import bisect
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Columns with their own SQLite column; anything else a term carries goes in `extra`
+REVIEW_FIELDS = ["mastery_level", "last_reviewed", "review_count", "next_review"]
+
+
+@contextmanager
+def _file_lock(lock_path: Path):
+    """Exclusive advisory lock held for the duration of the block (no-op without fcntl)"""
+    try:
+        import fcntl
+    except ImportError:  # not available on Windows
+        yield
+        return
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def write_json_atomic(path: Path, data, indent: Optional[int] = 2):
+    """Write JSON to a temp file and rename it over `path`"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _due_key(record: Dict) -> Optional[str]:
+    """A record's next_review as a sortable YYYY-MM-DD string (None if unset)"""
+    next_review = record.get("next_review")
+    return str(next_review) if next_review else None
+
+
+class DueIndex:
+    """
+    Due dates of a JSON store as a sorted text file: a header line with the
+    store's fingerprint, then one "YYYY-MM-DD<TAB>term" line per term. Terms due
+    by a date are a prefix of the file, so a query reads just the lines it
+    returns. A write patches the sorted entries and rewrites the file; a
+    fingerprint mismatch (the store was edited elsewhere) means a rebuild.
+    Entries are re-read from the file on every patch (under the store's lock),
+    never kept in memory: another process may have rewritten the file since.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def _source(self) -> Optional[Dict]:
+        try:
+            with open(self.path, "r") as f:
+                header = json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(header, dict) or header.get("version") != self.VERSION:
+            return None
+        return header.get("source")
+
+    def current(self, fingerprint_of: Callable) -> bool:
+        """
+        Whether the index matches the store; `fingerprint_of(previous)` is the
+        store's fingerprint, a single stat while the file is unchanged.
+        """
+        from glossary_index import same_content
+
+        source = self._source()
+        return source is not None and same_content(fingerprint_of(source), source)
+
+    def _load_entries(self) -> List[Tuple[str, str]]:
+        with open(self.path, "r") as f:
+            f.readline()
+            return [tuple(line[:-1].split("\t", 1)) for line in f]
+
+    def _write(self, entries: List[Tuple[str, str]], fingerprint: Optional[Dict]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps({"version": self.VERSION, "source": fingerprint}))
+            f.write("\n")
+            f.writelines(f"{key}\t{term}\n" for key, term in entries)
+        os.replace(tmp_path, self.path)
+
+    def rebuild(self, data: Dict[str, Dict], fingerprint: Optional[Dict]):
+        entries = sorted(
+            (_due_key(record), term_name)
+            for term_name, record in data.items()
+            if _due_key(record) is not None and "\n" not in term_name
+        )
+        self._write(entries, fingerprint)
+
+    def patch(
+        self, old: Dict[str, Dict], new: Dict[str, Dict], fingerprint: Optional[Dict]
+    ):
+        """Move the given terms from their `old` to their `new` due dates"""
+        entries = self._load_entries()
+        for term_name, record in new.items():
+            key = _due_key(old.get(term_name) or {})
+            if key is not None:
+                index = bisect.bisect_left(entries, (key, term_name))
+                if index < len(entries) and entries[index] == (key, term_name):
+                    del entries[index]
+            key = _due_key(record)
+            if key is not None and "\n" not in term_name:
+                bisect.insort(entries, (key, term_name))
+        self._write(entries, fingerprint)
+
+    def iter_due(self, on: str) -> Iterator[Tuple[str, str]]:
+        """(next_review, term) with next_review <= `on`, most overdue first"""
+        with open(self.path, "r") as f:
+            f.readline()
+            for line in f:
+                key, term_name = line[:-1].split("\t", 1)
+                if key > on:
+                    return
+                yield key, term_name
+
+
+class MetadataStore:
+    """Interface for dynamic term metadata: {term_name: {field: value}}"""
+
+    def load_all(self) -> Dict[str, Dict]:
+        """Return the metadata for every term"""
+        raise NotImplementedError
+
+    def upsert(self, updates: Dict[str, Dict]):
+        """Merge field updates for many terms in one durable write"""
+        raise NotImplementedError
+
+    def update(self, term_name: str, updater: Callable[[Dict], Dict]) -> Dict:
+        """
+        Atomic read-modify-write of one term: `updater` receives the term's current
+        stored fields and returns the fields to merge. Returns the merged record.
+        """
+        raise NotImplementedError
+
+    def update_many(
+        self,
+        term_names: List[str],
+        updater: Callable[[Dict[str, Dict]], Dict[str, Dict]],
+    ) -> Dict[str, Dict]:
+        """
+        Atomic read-modify-write of several terms in one transaction: `updater`
+        receives {term: stored fields} and returns {term: fields to merge}.
+        Returns the merged records.
+        """
+        raise NotImplementedError
+
+    def fingerprint(self, previous: Optional[Dict] = None) -> Optional[Dict]:
+        """Cheap change token, compatible with glossary_index.same_content()"""
+        raise NotImplementedError
+
+    def iter_due(self, on: str) -> Iterator[Tuple[str, str]]:
+        """
+        (next_review, term) for every term due on or before `on` (YYYY-MM-DD),
+        most overdue first. Lazy: taking k of them costs O(k log n), not O(n).
+        """
+        raise NotImplementedError
+
+    def export_json(self, path):
+        """Write every term's metadata to a JSON file (the legacy format)"""
+        write_json_atomic(Path(path), self.load_all())
+
+
+class JsonMetadataStore(MetadataStore):
+    """Whole-file JSON store; writes re-read the file under a lock before merging"""
+
+    def __init__(self, path, due_index_file=None):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        if due_index_file is None:
+            due_index_file = self.path.parent / "cache" / "due_index.txt"
+        self.due_index = DueIndex(due_index_file)
+
+    def load_all(self) -> Dict[str, Dict]:
+        if self.path.exists():
+            with open(self.path, "r") as f:
+                return json.load(f)
+        return {}
+
+    def _write(self, data: Dict[str, Dict], old: Dict[str, Dict], terms):
+        """
+        Write the file (under the lock) and move `terms` in the due index from
+        their `old` records to their new ones in `data`
+        """
+        index_current = self.due_index.current(self.fingerprint)
+        write_json_atomic(self.path, data)
+        if index_current:
+            self.due_index.patch(
+                old, {term: data[term] for term in terms}, self.fingerprint()
+            )
+
+    def upsert(self, updates: Dict[str, Dict]):
+        with _file_lock(self.lock_path):
+            data = self.load_all()
+            old = {term: dict(data.get(term, {})) for term in updates}
+            for term_name, fields in updates.items():
+                data.setdefault(term_name, {}).update(fields)
+            self._write(data, old, updates)
+
+    def update(self, term_name: str, updater: Callable[[Dict], Dict]) -> Dict:
+        with _file_lock(self.lock_path):
+            data = self.load_all()
+            record = data.setdefault(term_name, {})
+            old = {term_name: dict(record)}
+            record.update(updater(dict(record)))
+            self._write(data, old, [term_name])
+            return record
+
+    def update_many(self, term_names, updater):
+        with _file_lock(self.lock_path):
+            data = self.load_all()
+            old = {term: dict(data.get(term, {})) for term in term_names}
+            updates = updater({term: dict(old[term]) for term in term_names})
+            for term_name, fields in updates.items():
+                old.setdefault(term_name, dict(data.get(term_name, {})))
+                data.setdefault(term_name, {}).update(fields)
+            self._write(data, old, updates)
+            return {term_name: data[term_name] for term_name in updates}
+
+    def fingerprint(self, previous: Optional[Dict] = None) -> Optional[Dict]:
+        from glossary_index import source_fingerprint
+
+        return source_fingerprint(self.path, previous)
+
+    def iter_due(self, on: str) -> Iterator[Tuple[str, str]]:
+        if not self.due_index.current(self.fingerprint):
+            self.due_index.rebuild(self.load_all(), self.fingerprint())
+        return self.due_index.iter_due(on)
+
+
+class SqliteMetadataStore(MetadataStore):
+    """SQLite store in WAL mode: one row per term, indexed by review dates"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS term_metadata (
+            term TEXT PRIMARY KEY,
+            mastery_level REAL,
+            last_reviewed TEXT,
+            review_count INTEGER,
+            next_review TEXT,
+            extra TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_term_metadata_next_review
+            ON term_metadata (next_review);
+        CREATE INDEX IF NOT EXISTS idx_term_metadata_last_reviewed
+            ON term_metadata (last_reviewed);
+        CREATE TABLE IF NOT EXISTS store_info (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        INSERT OR IGNORE INTO store_info (key, value) VALUES ('revision', '0');
+    """
+
+    def __init__(self, path, migrate_from=None):
+        import sqlite3
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        if migrate_from is not None and self._info("migrated_from_json") is None:
+            self.migrate_from_json(migrate_from)
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that takes the write lock up front and bumps the revision"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+            self.conn.execute(
+                "UPDATE store_info SET value = CAST(value AS INTEGER) + 1 "
+                "WHERE key = 'revision'"
+            )
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _to_record(row) -> Dict:
+        term, mastery, last_reviewed, review_count, next_review, extra = row
+        record = json.loads(extra) if extra else {}
+        for key, value in zip(
+            REVIEW_FIELDS, (mastery, last_reviewed, review_count, next_review)
+        ):
+            if value is not None:
+                # Keep integral mastery levels as ints, like the JSON store
+                if key == "mastery_level" and float(value).is_integer():
+                    value = int(value)
+                record[key] = value
+        return record
+
+    @staticmethod
+    def _to_row(term_name: str, record: Dict):
+        extra = {k: v for k, v in record.items() if k not in REVIEW_FIELDS}
+        return (
+            term_name,
+            *(record.get(key) for key in REVIEW_FIELDS),
+            json.dumps(extra) if extra else None,
+        )
+
+    def _get(self, term_name: str) -> Dict:
+        row = self.conn.execute(
+            "SELECT * FROM term_metadata WHERE term = ?", (term_name,)
+        ).fetchone()
+        return self._to_record(row) if row else {}
+
+    def _put_many(self, records: Dict[str, Dict]):
+        self.conn.executemany(
+            "INSERT INTO term_metadata "
+            "(term, mastery_level, last_reviewed, review_count, next_review, extra) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(term) DO UPDATE SET "
+            "mastery_level = excluded.mastery_level, "
+            "last_reviewed = excluded.last_reviewed, "
+            "review_count = excluded.review_count, "
+            "next_review = excluded.next_review, "
+            "extra = excluded.extra",
+            [self._to_row(term, record) for term, record in records.items()],
+        )
+
+    def load_all(self) -> Dict[str, Dict]:
+        return {
+            row[0]: self._to_record(row)
+            for row in self.conn.execute("SELECT * FROM term_metadata ORDER BY rowid")
+        }
+
+    def upsert(self, updates: Dict[str, Dict]):
+        with self._transaction():
+            merged = {}
+            for term_name, fields in updates.items():
+                record = self._get(term_name)
+                record.update(fields)
+                merged[term_name] = record
+            self._put_many(merged)
+
+    def update(self, term_name: str, updater: Callable[[Dict], Dict]) -> Dict:
+        with self._transaction():
+            record = self._get(term_name)
+            record.update(updater(dict(record)))
+            self._put_many({term_name: record})
+            return record
+
+    def update_many(self, term_names, updater):
+        with self._transaction():
+            stored = {term: self._get(term) for term in term_names}
+            merged = {}
+            for term_name, fields in updater(
+                {term: dict(record) for term, record in stored.items()}
+            ).items():
+                record = stored.get(term_name) or self._get(term_name)
+                record.update(fields)
+                merged[term_name] = record
+            self._put_many(merged)
+            return merged
+
+    def iter_due(self, on: str) -> Iterator[Tuple[str, str]]:
+        # Walks idx_term_metadata_next_review; rows are fetched as consumed
+        return iter(
+            self.conn.execute(
+                "SELECT next_review, term FROM term_metadata "
+                "WHERE next_review IS NOT NULL AND next_review <= ? "
+                "ORDER BY next_review",
+                (on,),
+            )
+        )
+
+    def _info(self, key: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT value FROM store_info WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def fingerprint(self, previous: Optional[Dict] = None) -> Optional[Dict]:
+        return {"size": 0, "hash": f"sqlite-revision-{self._info('revision')}"}
+
+    def migrate_from_json(self, json_path):
+        """One-shot import of an existing glossary_metadata.json (no-op once done)"""
+        with self._transaction():
+            # Re-checked under the write lock: concurrent first runs import only once
+            if self._info("migrated_from_json") is not None:
+                return
+            data = {}
+            if Path(json_path).exists():
+                with open(json_path, "r") as f:
+                    data = json.load(f)
+                self._put_many(data)
+            self.conn.execute(
+                "INSERT INTO store_info (key, value) VALUES ('migrated_from_json', ?)",
+                (str(json_path),),
+            )
+        if data:
+            print(f"📦 Migrated {len(data)} terms from {json_path} to {self.path}")
+
+
+STORE_BACKENDS = ["json", "sqlite"]
+
+
+def open_metadata_store(backend: str, json_path, sqlite_path) -> MetadataStore:
+    """Create the requested backend; SQLite imports the JSON file on first use"""
+    if backend == "sqlite":
+        return SqliteMetadataStore(sqlite_path, migrate_from=json_path)
+    if backend == "json":
+        return JsonMetadataStore(json_path)
+    raise ValueError(f"Unknown metadata store: {backend}")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Parallel Scan - Wiki metadata extraction spread across a process pool
+"""
+import os
+from pathlib import Path
+from typing import Dict, List
+
+import tracing
+from wiki_tokenizer import CHAPTER, LINK, TAGS, tokenize_file
+
+# Below this many files the pool startup costs more than the scan itself
+PARALLEL_MIN_FILES = 1000
+# Each worker gets roughly this many batches so slow files even out
+BATCHES_PER_WORKER = 4
+MIN_BATCH_SIZE = 64
+
+
+def extract_wiki_metadata(wiki_path) -> Dict:
+    """Extract chapters, tags and related topic terms from a wiki file"""
+    wiki_path = Path(wiki_path)
+    if not wiki_path.exists():
+        return {}
+    try:
+        chapters = {}  # dicts keep first-seen order with O(1) dedup
+        tags = []
+        related_terms = {}
+        seen_links = set()
+        for kind, value, _ in tokenize_file(wiki_path):
+            if kind == CHAPTER:
+                chapters[value] = None
+            elif kind == LINK:
+                link = value[0]
+                if link not in seen_links:
+                    seen_links.add(link)
+                    if link.startswith("topics/"):
+                        term_name = (
+                            link.replace("topics/", "").replace("_", " ").title()
+                        )
+                        related_terms[term_name] = None
+            elif kind == TAGS:
+                tags.extend(value)
+        return {
+            "chapters": list(chapters),
+            "tags": tags,
+            "related_terms": list(related_terms),
+        }
+    except Exception as e:
+        print(f"Warning: Could not read {wiki_path}: {e}")
+        return {}
+
+
+def _extract_batch(paths: List[str]) -> List[Dict]:
+    """Worker entry point: extract one batch of files"""
+    return [extract_wiki_metadata(path) for path in paths]
+
+
+def default_workers() -> int:
+    """Number of worker processes to use when none is given"""
+    return os.cpu_count() or 1
+
+
+def extract_many(
+    paths: List[Path],
+    parallel: bool = False,
+    workers: int = None,
+    min_files: int = PARALLEL_MIN_FILES,
+) -> List[Dict]:
+    """
+    Extract metadata for every path, returning results in the same order as `paths`.
+
+    With `parallel`, files are split into contiguous batches and handed to a process
+    pool; batches are collected in submission order, so the merged result is identical
+    to the serial scan. Small inputs (fewer than `min_files`) always run serially.
+    """
+    workers = workers or default_workers()
+    if not parallel or workers < 2 or len(paths) < min_files:
+        return [extract_wiki_metadata(path) for path in paths]
+
+    # Imported lazily: only the parallel path needs the pool machinery
+    from concurrent.futures import ProcessPoolExecutor
+
+    batch_size = max(MIN_BATCH_SIZE, -(-len(paths) // (workers * BATCHES_PER_WORKER)))
+    batches = [
+        [str(path) for path in paths[i : i + batch_size]]
+        for i in range(0, len(paths), batch_size)
+    ]
+    # Pool workers keep their own tracing state: only the file count reaches it
+    tracing.count("files_read_in_pool", len(paths))
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as pool:
+        for batch_result in pool.map(_extract_batch, batches):
+            results.extend(batch_result)
+    return results
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Plan Renderers - Text, vimwiki checklist and JSON output for study plans and schedules
+
+Renderers are generators of text chunks (a header, one chunk per term or day,
+a footer) and never print. write_chunks() joins the chunks into buffers of
+WRITE_BUFFER characters and hands each buffer to one out.write(), so stdout and
+files (open_output in term_export: temporary file, renamed when complete) go
+through the same single write path, and a plan costs one write, a 10k-term
+plan a few dozen.
+
+Formats:
+  - text: the terminal plan with definitions, review state and study commands
+  - wiki: a vimwiki page with one checkbox per term, e.g. today's diary page
+          (notes/diary/YYYY-MM-DD.wiki, see diary_path); links are root-absolute
+          so they work from any page
+  - json: {"date", "context", "terms": [...]}, one term object per line
+"""
+import json
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from term_export import open_output
+
+# Characters gathered before each write (one write for any everyday plan)
+WRITE_BUFFER = 1 << 16
+IMPORTANCE_EMOJI = {"high": "🔥", "medium": "⚡", "low": "📝"}
+PLAN_FORMATS = ("text", "wiki", "json")
+
+
+def write_chunks(chunks: Iterable[str], out: TextIO, buffer_size: int = WRITE_BUFFER):
+    """Write rendered chunks to `out` in as few write calls as the buffer allows"""
+    parts = []
+    size = 0
+    for chunk in chunks:
+        parts.append(chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            out.write("".join(parts))
+            parts.clear()
+            size = 0
+    if parts:
+        out.write("".join(parts))
+
+
+def write_rendered(chunks: Iterable[str], path: Optional[str] = None):
+    """Write chunks to stdout (None or "-") or atomically to the file `path`"""
+    with open_output(path) as out:
+        write_chunks(chunks, out)
+    if path not in (None, "-"):
+        print(f"✅ Wrote {path}")
+
+
+def diary_path(base_dir: Path, day: date = None) -> Path:
+    """vimwiki's diary page for `day` (default today) under the wiki root"""
+    return Path(base_dir) / "diary" / f"{(day or date.today()).isoformat()}.wiki"
+
+
+def wiki_target(link: str) -> str:
+    """
+    `link` made root-absolute (topics/x -> /topics/x): wiki pages may be written
+    anywhere under the wiki root (e.g. notes/diary/), and vimwiki resolves
+    relative links from the page's own directory. Scheme links stay as they are.
+    """
+    if link.startswith("/") or ":" in link.split("/", 1)[0]:
+        return link
+    return "/" + link
+
+
+# --- study plans -------------------------------------------------------------
+# Entries are PlanEntry views (see term_store): fields are read straight from
+# the term record instead of through the mapping interface
+def _no_terms(context: str) -> Iterator[str]:
+    if context:
+        yield f"{context}\n"
+    yield "No terms to study!\n"
+
+
+def render_plan_text(
+    entries: List, context: str, today: str, script_name: str
+) -> Iterator[str]:
+    if not entries:
+        yield from _no_terms(context)
+        return
+    header = f"📚 Glossary Study Plan - {today}\n{'=' * 50}\n"
+    if context:
+        header += f"{context}\n"
+    yield header + f"\n🎯 Focus Terms ({len(entries)} selected):\n"
+    for i, entry in enumerate(entries, 1):
+        record = entry.record
+        emoji = IMPORTANCE_EMOJI.get(record.exam_importance, "📝")
+        chunk = (
+            f"\n{i}. {emoji} **{entry.name}**\n"
+            f"    📖 Definition: {record.definition}\n"
+            f"    📚 Chapter: {record.chapter}\n"
+            f"    🎯 Exam Importance: {record.exam_importance}\n"
+            f"    📊 Mastery Level: {record.mastery_level}/5\n"
+            f"    📅 Last Reviewed: {record.last_reviewed}\n"
+            f"    🔗 Wiki: {record.wiki_link}\n"
+        )
+        if record.tags:
+            chunk += f"    🏷️  Tags: {', '.join(record.tags)}\n"
+        if record.related_terms:
+            chunk += f"    🔗 Related: {', '.join(record.related_terms)}\n"
+        yield chunk
+    command = f"  python scripts/{script_name} --mark-reviewed"
+    yield "\n📝 Study Commands:\nMark terms as reviewed:\n" + "".join(
+        [f'{command} "{entry.name}"\n' for entry in entries]
+    )
+    yield (
+        "\nUpdate term metadata:\n"
+        f'{command} "Term Name" --mastery-gain 1\n'
+        "  (For static properties like chapter/importance, edit "
+        "config/glossary_config.yaml directly)\n"
+    )
+
+
+def render_plan_wiki(
+    entries: List, context: str, today: str, script_name: str = None
+) -> Iterator[str]:
+    """One checkbox per term, linked to its topic page, grouped by chapter"""
+    if not entries:
+        yield from _no_terms(context)
+        return
+    header = f"= Glossary Study Plan ({today}) =\n\n"
+    if context:
+        header += f"{context}\n"
+    yield header
+    by_chapter: Dict[object, List] = {}
+    for entry in entries:
+        by_chapter.setdefault(entry.record.chapter, []).append(entry)
+    for chapter, chapter_entries in by_chapter.items():
+        heading = f"Chapter {chapter}" if chapter is not None else "Other terms"
+        lines = [f"\n== {heading} ==\n"]
+        for entry in chapter_entries:
+            record = entry.record
+            emoji = IMPORTANCE_EMOJI.get(record.exam_importance, "📝")
+            lines.append(
+                f"- [ ] {emoji} [[{wiki_target(record.wiki_link)}|{entry.name}]] :: "
+                f"{record.definition} (mastery {record.mastery_level}/5)\n"
+            )
+        yield "".join(lines)
+
+
+def _json_rows(header: Dict, key: str, rows: Iterable[Dict]) -> Iterator[str]:
+    """
+    {**header, key: [rows]} as JSON: the header indented, each row compact on
+    its own line (the C encoder only runs without indentation)
+    """
+    encode = json.JSONEncoder(ensure_ascii=False, default=str).encode
+    opening = json.dumps({**header, key: []}, ensure_ascii=False, indent=2)
+    yield opening[: opening.rindex("[") + 1]
+    separator = "\n    "
+    for row in rows:
+        yield separator + encode(row)
+        separator = ",\n    "
+    yield "\n  ]\n}\n"
+
+
+def render_plan_json(
+    entries: List, context: str, today: str, script_name: str = None
+) -> Iterator[str]:
+    return _json_rows(
+        {"date": today, "context": context},
+        "terms",
+        (entry.to_dict() for entry in entries),
+    )
+
+
+PLAN_RENDERERS = {
+    "text": render_plan_text,
+    "wiki": render_plan_wiki,
+    "json": render_plan_json,
+}
+
+
+def render_plan(
+    format_type: str,
+    entries: List,
+    context: str = None,
+    today: str = None,
+    script_name: str = "glossary_planner.py",
+) -> Iterator[str]:
+    """Chunks of a study plan in one of PLAN_FORMATS"""
+    if format_type not in PLAN_RENDERERS:
+        raise ValueError(
+            f"Unknown plan format: {format_type} (use {', '.join(PLAN_RENDERERS)})"
+        )
+    today = today or date.today().isoformat()
+    return PLAN_RENDERERS[format_type](entries, context, today, script_name)
+
+
+# --- multi-day schedules -------------------------------------------------------
+def render_schedule(
+    format_type: str,
+    by_day: List,
+    unscheduled: List,
+    terms: Dict,
+    context: str = None,
+    today: date = None,
+) -> Iterator[str]:
+    """
+    Chunks of a schedule: `by_day` is [(day ordinal, [(term, deadline ordinal,
+    assignment label)])] and `unscheduled` [(deadline ordinal, term, label)]
+    """
+    today = today or date.today()
+    if format_type == "json":
+
+        def job(term_name, deadline, label):
+            return {
+                "term": term_name,
+                "assignment": label,
+                "due": date.fromordinal(deadline).isoformat(),
+            }
+
+        document = {
+            "days": {
+                date.fromordinal(day).isoformat(): [job(*entry) for entry in entries]
+                for day, entries in by_day
+            },
+            "unscheduled": [
+                job(term_name, deadline, label)
+                for deadline, term_name, label in unscheduled
+            ],
+        }
+        yield json.dumps(document, indent=2, ensure_ascii=False) + "\n"
+        return
+
+    wiki = format_type == "wiki"
+    if wiki:
+        header = f"= Study Schedule ({today.isoformat()}) =\n\n"
+    else:
+        header = f"📅 Study Schedule - {today.isoformat()}\n{'=' * 50}\n"
+    if context:
+        header += f"{context}\n"
+    yield header
+    for day, entries in by_day:
+        heading = date.fromordinal(day).strftime("%Y-%m-%d %a")
+        if wiki:
+            lines = [f"\n== {heading} ==\n"]
+        else:
+            lines = [f"\n📆 {heading} ({len(entries)})\n"]
+        for term_name, deadline, label in entries:
+            term = terms.get(term_name)
+            due = f"{label} on {date.fromordinal(deadline).isoformat()}"
+            if wiki:
+                link = wiki_target(term["wiki_link"] if term else term_name)
+                lines.append(f"- [ ] [[{link}|{term_name}]] :: {due}\n")
+            else:
+                emoji = IMPORTANCE_EMOJI.get(
+                    term["exam_importance"] if term else None, "📝"
+                )
+                lines.append(f"  - [ ] {emoji} {term_name} ({due})\n")
+        yield "".join(lines)
+    if unscheduled:
+        title = f"Not scheduled ({len(unscheduled)}): raise --capacity"
+        lines = [f"\n== {title} ==\n" if wiki else f"\n⚠️  {title}\n"]
+        for deadline, term_name, label in unscheduled:
+            lines.append(f"- {term_name} ({label} on {date.fromordinal(deadline)})\n")
+        yield "".join(lines)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Planner CLI - Command-line interface of glossary_planner.py, without the planner
+
+build_parser() is shared by glossary_planner.py, the planner daemon and the thin
+planner client. It only imports the option choices (formats, schedulers, store
+backends), so the client parses a command without loading the planner.
+"""
+import argparse
+import sys
+from typing import List
+
+import tracing
+from metadata_store import STORE_BACKENDS
+from plan_renderers import PLAN_FORMATS
+from review_schedulers import SCHEDULERS, parse_grade, parse_mastery_gain
+from term_export import EXPORT_FORMATS
+
+
+def read_review_source(source: str) -> List[str]:
+    """Lines of a review batch file, or of stdin for '-'"""
+    if source == "-":
+        return sys.stdin.readlines()
+    with open(source, "r", newline="") as f:
+        return f.readlines()
+
+
+def build_parser():
+    """Command-line interface shared by glossary_planner.py and the daemon/client"""
+    parser = argparse.ArgumentParser(description="Glossary-Based Study Planner")
+    # (omitted for brevity, this part is unchanged)
+    parser.add_argument(
+        "--terms", type=int, default=10, help="Number of terms to study (default: 10)"
+    )
+    parser.add_argument(
+        "--glossary", default="glossary.wiki", help="Glossary file path"
+    )
+    parser.add_argument(
+        "--plans",
+        nargs="+",
+        metavar="FILE",
+        help="Course plan file(s) with assignment deadlines "
+        "(default: the project's plans/microbiology.yaml)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=PLAN_FORMATS,
+        default="text",
+        help="Output format",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        help="Write the plan or schedule to FILE instead of stdout",
+    )
+    parser.add_argument(
+        "--diary",
+        action="store_true",
+        help="Write the plan or schedule as a vimwiki checklist to today's diary "
+        "page (notes/diary/YYYY-MM-DD.wiki)",
+    )
+    parser.add_argument(
+        "--chapter", help="Filter by chapter (disables auto deadline filtering)"
+    )
+    parser.add_argument(
+        "--importance", choices=["high", "medium", "low"], help="Filter by importance"
+    )
+    parser.add_argument(
+        "--tag", help="Filter by tag (disables auto deadline filtering)"
+    )
+    parser.add_argument(
+        "--randomize",
+        action="store_true",
+        help="Randomize selection (weighted by priority, no repeated terms)",
+    )
+    parser.add_argument(
+        "--seed", type=int, help="Random seed for reproducible --randomize plans"
+    )
+    parser.add_argument(
+        "--centrality",
+        action="store_true",
+        help="Boost terms whose topic pages are central in the vault's link graph",
+    )
+    parser.add_argument(
+        "--no-deadline",
+        action="store_true",
+        help="Disable automatic filtering by upcoming deadlines",
+    )
+    parser.add_argument(
+        "--schedule",
+        action="store_true",
+        help="Spread the terms of upcoming assignments over the days before them",
+    )
+    parser.add_argument(
+        "--days", type=int, default=30, help="Schedule horizon in days (default: 30)"
+    )
+    parser.add_argument(
+        "--capacity",
+        type=int,
+        default=20,
+        help="Most terms scheduled on one day (default: 20)",
+    )
+    parser.add_argument("--mark-reviewed", metavar="TERM", help="Mark term as reviewed")
+    parser.add_argument(
+        "--mastery-gain",
+        type=parse_mastery_gain,
+        default=1,
+        help="Mastery points to add when reviewing (-5 to 5)",
+    )
+    parser.add_argument(
+        "--grade",
+        type=parse_grade,
+        help="How well the term was recalled: 1-4 or again/hard/good/easy (default: good)",
+    )
+    parser.add_argument(
+        "--scheduler",
+        choices=list(SCHEDULERS),
+        default="fixed",
+        help="Review scheduler: fixed intervals, sm2 or fsrs (default: fixed)",
+    )
+    parser.add_argument(
+        "--review-batch",
+        metavar="FILE",
+        help="Mark many terms reviewed from 'term[,mastery_gain[,YYYY-MM-DD[,grade]]]' lines ('-' for stdin)",
+    )
+    parser.add_argument(
+        "--due",
+        action="store_true",
+        help="List terms due for review today or overdue (up to --terms)",
+    )
+    parser.add_argument("--update-term", metavar="TERM", help="Update term metadata")
+    # ### MODIFIED: Removed --set-chapter, --exam-importance, --study-importance args from argparse
+    # This is because these are now managed directly in glossary_config.yaml
+    # If you still want to allow dynamic updates for these, we'd need to re-add them
+    # and adjust update_term_metadata logic to save to both config and metadata JSON.
+    # For now, I'm assuming these are *static* and should be edited in YAML.
+
+    parser.add_argument("--stats", action="store_true", help="Show statistics")
+    parser.add_argument(
+        "--export",
+        metavar="FILE",
+        help="Stream terms and their review state to FILE ('-' for stdout), "
+        "honoring --chapter, --importance and --tag",
+    )
+    parser.add_argument(
+        "--export-format",
+        choices=EXPORT_FORMATS,
+        help="Export format (default: from the file suffix: .ndjson/.jsonl, .json "
+        "or .csv; ndjson on stdout)",
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Always re-parse the glossary and topics instead of using the on-disk index",
+    )
+    parser.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Discard the on-disk index and re-extract every topic file",
+    )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Scan topic files in a process pool (large vaults only)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes for --parallel (default: CPU count)",
+    )
+    parser.add_argument(
+        "--store",
+        choices=STORE_BACKENDS,
+        default="json",
+        help="Review data backend (sqlite imports the JSON file on first use)",
+    )
+    parser.add_argument(
+        "--export-metadata",
+        metavar="FILE",
+        help="Write review data from the selected store to a JSON file",
+    )
+    tracing.add_profile_arguments(parser)
+    return parser
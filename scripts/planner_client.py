@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Planner Client - Thin client that forwards glossary_planner.py commands to the planner daemon
+
+Accepts the same flags as glossary_planner.py (parsed with planner_cli, so the
+planner itself is only imported for a local run). Plan, --mark-reviewed and
+--stats requests are answered by a running planner_daemon.py; anything else (or
+no daemon to connect to) runs locally exactly like glossary_planner.py. Once a
+request has been sent it is never re-run locally: a lost reply is reported, so a
+review the daemon already applied is not applied twice.
+"""
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Protocol: one JSON object per line in each direction.
+#   request:  {"op": "plan" | "mark-reviewed" | "review-batch" | "stats" | "ping"
+#              | "shutdown", ...}
+#   response: {"ok": true, "output": "..."} or {"ok": false, "error": "..."}
+PLAN_OPTIONS = [
+    "terms",
+    "chapter",
+    "importance",
+    "tag",
+    "randomize",
+    "seed",
+    "centrality",
+    "no_deadline",
+    "format",
+    "schedule",
+    "days",
+    "capacity",
+    "due",
+]
+CONNECT_TIMEOUT = 0.5
+RESPONSE_TIMEOUT = 120
+
+
+def default_socket_path() -> str:
+    """Socket location: $PLANNER_SOCKET, else the user's runtime dir, else /tmp"""
+    if os.environ.get("PLANNER_SOCKET"):
+        return os.environ["PLANNER_SOCKET"]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        import tempfile
+
+        runtime_dir = tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"microbio-planner-{os.getuid()}.sock")
+
+
+def send_request(request: dict, socket_path: str = None) -> dict:
+    """
+    Send one request to the daemon and return its decoded response. Raises
+    FileNotFoundError or ConnectionRefusedError when no daemon is listening,
+    other OSErrors / ValueError when the request was sent but no valid reply came
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(socket_path or default_socket_path())
+        sock.settimeout(RESPONSE_TIMEOUT)
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b"\n"):
+                break
+    finally:
+        sock.close()
+    if not chunks:
+        raise ConnectionError("daemon closed the connection without replying")
+    return json.loads(b"".join(chunks))
+
+
+def request_from_args(args, defaults) -> dict:
+    """Translate parsed glossary_planner.py args into a daemon request (None = run locally)"""
+    # Options that change how the vault is loaded only make sense in-process
+    for local_only in [
+        "glossary",
+        "plans",
+        "no_index",
+        "rebuild_index",
+        "parallel",
+        "workers",
+        "store",
+        "scheduler",
+        "profile",  # profiles cover the whole local pipeline
+        "cprofile",
+        "output",  # files are written by this process, not the daemon
+        "diary",
+    ]:
+        if getattr(args, local_only) != getattr(defaults, local_only):
+            return None
+    if args.mark_reviewed:
+        return {
+            "op": "mark-reviewed",
+            "term": args.mark_reviewed,
+            "mastery_gain": args.mastery_gain,
+            "grade": args.grade,
+        }
+    if args.review_batch:
+        from planner_cli import read_review_source
+
+        return {
+            "op": "review-batch",
+            "lines": read_review_source(args.review_batch),
+            "mastery_gain": args.mastery_gain,
+            "grade": args.grade,
+        }
+    if args.stats:
+        return {"op": "stats"}
+    if args.update_term or args.export or args.export_metadata:
+        return None
+    return {"op": "plan", **{option: getattr(args, option) for option in PLAN_OPTIONS}}
+
+
+def main():
+    from planner_cli import build_parser
+
+    parser = build_parser()
+    args = parser.parse_args()
+    request = request_from_args(args, parser.parse_args([]))
+
+    if request is not None:
+        try:
+            response = send_request(request)
+        except (FileNotFoundError, ConnectionRefusedError):
+            response = None  # no daemon running: fall through to a local run
+        except (OSError, ValueError) as e:
+            # The daemon may already have applied the request: don't run it again
+            print(f"❌ No reply from the daemon: {e}", file=sys.stderr)
+            return 1
+        if response is not None:
+            if response.get("ok"):
+                sys.stdout.write(response.get("output", ""))
+                return 0
+            print(f"❌ Daemon error: {response.get('error')}", file=sys.stderr)
+            return 1
+
+    import glossary_planner
+
+    glossary_planner.main()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
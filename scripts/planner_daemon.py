@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Planner Daemon - Keeps a parsed GlossaryStudyPlanner in memory and serves it over a Unix socket
+
+Start it once per session:
+    python3 scripts/planner_daemon.py &
+then use scripts/planner_client.py with the usual glossary_planner.py flags.
+Every request first reloads only the files that changed on disk (config,
+metadata, glossary, topics) before answering.
+"""
+import argparse
+import io
+import json
+import os
+import signal
+import socketserver
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from glossary_planner import GlossaryStudyPlanner, run_command, run_review_batch
+from planner_cli import build_parser
+from metadata_store import STORE_BACKENDS
+from review_schedulers import SCHEDULERS
+from planner_client import PLAN_OPTIONS, default_socket_path, send_request
+
+
+def handle_request(planner: GlossaryStudyPlanner, request: dict) -> dict:
+    """Answer one protocol request against the resident planner"""
+    op = request.get("op")
+    if op == "ping":
+        return {"ok": True, "output": "pong\n", "terms": len(planner.terms)}
+
+    # Start from the CLI defaults so commands behave exactly like glossary_planner.py
+    args = build_parser().parse_args([])
+    if op == "plan":
+        for option in PLAN_OPTIONS:
+            if option in request:
+                setattr(args, option, request[option])
+    elif op == "mark-reviewed":
+        if not request.get("term"):
+            return {"ok": False, "error": "mark-reviewed requires 'term'"}
+        args.mark_reviewed = request["term"]
+        args.mastery_gain = int(request.get("mastery_gain", 1))
+        args.grade = request.get("grade")
+    elif op == "stats":
+        args.stats = True
+    elif op != "review-batch":
+        return {"ok": False, "error": f"unknown op: {op!r}"}
+
+    planner.refresh()
+    output = io.StringIO()
+    with redirect_stdout(output):
+        if op == "review-batch":
+            run_review_batch(
+                planner,
+                request.get("lines", []),
+                int(request.get("mastery_gain", 1)),
+                request.get("grade"),
+            )
+        else:
+            run_command(planner, args)
+    return {"ok": True, "output": output.getvalue()}
+
+
+class PlannerRequestHandler(socketserver.StreamRequestHandler):
+    """Reads newline-delimited JSON requests and writes one JSON response per line"""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if request.get("op") == "shutdown":
+                    response = {"ok": True, "output": "Daemon stopping\n"}
+                    self.server.stop_requested = True
+                else:
+                    response = handle_request(self.server.planner, request)
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class PlannerServer(socketserver.UnixStreamServer):
+    """Single-threaded server: requests are handled one at a time, so reviews never race"""
+
+    timeout = 0.5  # handle_request() wakes up this often to check stop_requested
+
+    def __init__(self, socket_path, planner):
+        self.planner = planner
+        self.stop_requested = False
+        super().__init__(socket_path, PlannerRequestHandler)
+
+
+def _claim_socket(socket_path: str) -> bool:
+    """Remove a stale socket file; return False if a daemon is already listening"""
+    if not os.path.exists(socket_path):
+        return True
+    try:
+        send_request({"op": "ping"}, socket_path)
+        return False
+    except OSError:
+        os.unlink(socket_path)
+        return True
+
+
+def serve(socket_path: str, planner: GlossaryStudyPlanner):
+    """Parse the vault once, then serve requests until stopped"""
+    if not _claim_socket(socket_path):
+        print(f"❌ A planner daemon is already listening on {socket_path}")
+        return 1
+
+    planner.parse_glossary()
+    planner.filter_index()  # re-synced term by term after each re-parse
+    server = PlannerServer(socket_path, planner)
+    os.chmod(socket_path, 0o600)
+    signal.signal(signal.SIGTERM, lambda *_: setattr(server, "stop_requested", True))
+    print(f"🟢 Planner daemon listening on {socket_path}")
+    try:
+        while not server.stop_requested:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        print("🔴 Planner daemon stopped")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident glossary planner daemon")
+    parser.add_argument(
+        "--socket", default=default_socket_path(), help="Unix socket path"
+    )
+    parser.add_argument(
+        "--glossary", default="glossary.wiki", help="Glossary file path"
+    )
+    parser.add_argument(
+        "--plans",
+        nargs="+",
+        metavar="FILE",
+        help="Course plan file(s) with assignment deadlines "
+        "(default: the project's plans/microbiology.yaml)",
+    )
+    parser.add_argument(
+        "--parallel", action="store_true", help="Scan topic files in a process pool"
+    )
+    parser.add_argument("--workers", type=int, help="Worker processes for --parallel")
+    parser.add_argument(
+        "--store",
+        choices=STORE_BACKENDS,
+        default="json",
+        help="Review data backend",
+    )
+    parser.add_argument(
+        "--scheduler",
+        choices=list(SCHEDULERS),
+        default="fixed",
+        help="Review scheduler used for --mark-reviewed and --review-batch",
+    )
+    parser.add_argument(
+        "--stop", action="store_true", help="Stop the daemon listening on --socket"
+    )
+    args = parser.parse_args()
+
+    if args.stop:
+        try:
+            print(send_request({"op": "shutdown"}, args.socket)["output"], end="")
+        except OSError:
+            print(f"No planner daemon listening on {args.socket}")
+        return 0
+
+    planner = GlossaryStudyPlanner(
+        glossary_file=args.glossary,
+        parallel=args.parallel,
+        workers=args.workers,
+        metadata_store=args.store,
+        plans_files=args.plans,
+        review_scheduler=args.scheduler,
+    )
+    return serve(args.socket, planner)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,634 @@
+#!/usr/bin/env python3
+"""
+Review Log - Append-only history of every review, replayed into the current review data
+
+Each review appends one fixed-size binary event (term id, timestamp, review
+day, interval, mastery delta, grade, scheduler and its two state values) to
+notes/data/review_log/events.bin: a single O_APPEND write under a shared lock,
+so appends are O(1) and concurrent writers never interleave. Term names get
+small ids from terms.txt (one name per line).
+
+The current review data is a materialized snapshot (snapshot.pickle, seeded
+from the metadata store when the log is created) plus the events appended
+since. Events carry their outcome (interval, scheduler state), so replay is a
+column-wise fold over the packed events with no scheduler math. Compaction
+folds the active events into a new snapshot and moves them to
+archive/events-NNNNNN.bin, which bounds replay time while keeping the full
+history for `history`. The planner compacts once COMPACT_EVENTS are active.
+
+Review fields written outright rather than by a review (glossary_study_manager
+apply, --update-term) are logged as edit events, one per field, so replaying
+the log reproduces them too.
+
+Usage:
+    python3 scripts/review_log.py history "Plasmid"
+    python3 scripts/review_log.py replay            # compare with the store
+    python3 scripts/review_log.py replay --restore  # write it into the store
+    python3 scripts/review_log.py --store sqlite replay  # the SQLite store's log
+    python3 scripts/review_log.py compact
+"""
+import os
+import pickle
+import struct
+import sys
+import time
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime
+from itertools import compress
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+PROJECT_DIR = Path(__file__).parent.parent
+DEFAULT_LOG_DIR = PROJECT_DIR / "notes" / "data" / "review_log"
+
+SNAPSHOT_VERSION = 2
+HEADER = struct.Struct("<4sHxxI")  # magic, format version, generation
+MAGIC = b"MBRL"
+# term id, unix time, review day ordinal, interval days, mastery delta, grade,
+# scheduler id, kind (0 for reviews), scheduler state (sm2: ease, repetitions;
+# fsrs: stability, difficulty); padded to 7 words so the term ids can be read
+# as a column
+EVENT = struct.Struct("<IIIHhBBBxff")
+EVENT_WORDS = EVENT.size // 4
+DELTA_OFFSET = 14
+KIND_OFFSET = 18
+SCHEDULER_IDS = {"fixed": 0, "sm2": 1, "fsrs": 2}
+SCHEDULER_NAMES = {value: key for key, value in SCHEDULER_IDS.items()}
+# Active events folded into the snapshot by maybe_compact()
+COMPACT_EVENTS = 100_000
+# Edit events: the kind is 1 + the field's index here (CLEARED added when the
+# field was set to None) and the value is the first state slot, dates as ordinals
+EDIT_FIELDS = ("mastery_level", "last_reviewed", "review_count", "next_review")
+CLEARED = 0x80
+_EDIT_MARKS = bytes([0] + [1] * 255)  # kind byte -> 1 for edit events
+_REVIEW_MARKS = bytes([1] + [0] * 255)
+_SIGN_BYTES = bytes([0] * 128 + [255] * 128)  # low byte -> high byte of -128..127
+
+
+def log_dir_for(backend: str, data_dir: Path) -> Path:
+    """
+    The review log of a store backend: each backend keeps its own, since a log
+    is seeded from (and replayed into) one store
+    """
+    if backend == "json":
+        return Path(data_dir) / "review_log"
+    return Path(data_dir) / f"review_log_{backend}"
+
+
+def _checked(event: Tuple) -> Tuple:
+    """`event`, or ValueError if one of its values does not fit the event format"""
+    try:
+        EVENT.pack(0, *event[1:])
+    except struct.error as e:
+        raise ValueError(f"Cannot log an event for '{event[0]}': {e}") from None
+    return event
+
+
+def _timestamp(day: date) -> int:
+    if day == date.today():
+        return int(time.time())
+    return int(time.mktime(day.timetuple()))
+
+
+def review_event(
+    term_name: str,
+    previous: Dict,
+    update: Dict,
+    grade: int,
+    scheduler: str,
+    reviewed_on: date,
+) -> Tuple:
+    """
+    Event tuple for a review that turned `previous` stored fields into `update`;
+    raises ValueError if it cannot be logged (build it before writing the store)
+    """
+    day = reviewed_on.toordinal()
+    interval = date.fromisoformat(update["next_review"]).toordinal() - day
+    delta = update["mastery_level"] - (previous.get("mastery_level") or 0)
+    if scheduler == "sm2":
+        state = (update["sm2_ease"], update["sm2_repetitions"])
+    elif scheduler == "fsrs":
+        state = (update["fsrs_stability"], update["fsrs_difficulty"])
+    else:
+        state = (0.0, 0.0)
+    return _checked(
+        (
+            term_name,
+            _timestamp(reviewed_on),
+            day,
+            interval,
+            int(round(delta)),
+            grade,
+            SCHEDULER_IDS.get(scheduler, 0),
+            0,
+            *state,
+        )
+    )
+
+
+def edit_events(term_name: str, fields: Dict, edited_on: date = None) -> List[Tuple]:
+    """
+    Event tuples setting review `fields` of a term outright; raises ValueError
+    for a field or value the log cannot hold (so nothing is written)
+    """
+    edited_on = edited_on or date.today()
+    events = []
+    for field, value in fields.items():
+        if field not in EDIT_FIELDS:
+            raise ValueError(f"'{field}' is not a review field")
+        kind = EDIT_FIELDS.index(field) + 1
+        if value is None:
+            kind |= CLEARED
+            value = 0.0
+        elif field in ("last_reviewed", "next_review"):
+            if not isinstance(value, date):
+                value = date.fromisoformat(str(value))
+            value = float(value.toordinal())
+        else:
+            value = float(value)
+        events.append(
+            _checked(
+                (
+                    term_name,
+                    _timestamp(edited_on),
+                    edited_on.toordinal(),
+                    0,
+                    0,
+                    0,
+                    0,
+                    kind,
+                    value,
+                    0.0,
+                )
+            )
+        )
+    return events
+
+
+def _edit(kind: int, value: float) -> Tuple[str, object]:
+    """(field, value) set by an edit event"""
+    field = EDIT_FIELDS[(kind & ~CLEARED) - 1]
+    if kind & CLEARED:
+        return field, None
+    if field == "mastery_level":
+        value = round(value, 4)
+        return field, int(value) if value.is_integer() else value
+    if field == "review_count":
+        return field, int(value)
+    return field, date.fromordinal(int(value)).isoformat()
+
+
+def _state_fields(state: List) -> Dict:
+    """Review fields of one folded term state"""
+    mastery, review_count, day, interval, scheduler, a, b = state
+    fields = {
+        "last_reviewed": date.fromordinal(day).isoformat(),
+        "review_count": review_count,
+        "mastery_level": mastery,
+        "next_review": date.fromordinal(day + interval).isoformat(),
+    }
+    if scheduler == SCHEDULER_IDS["sm2"]:
+        fields.update(
+            sm2_ease=round(a, 4), sm2_repetitions=int(b), interval_days=interval
+        )
+    elif scheduler == SCHEDULER_IDS["fsrs"]:
+        fields.update(
+            fsrs_stability=round(a, 4),
+            fsrs_difficulty=round(b, 4),
+            interval_days=interval,
+        )
+    return fields
+
+
+def fold(records: Dict[str, Dict], terms: List[str], data) -> Dict[str, Dict]:
+    """
+    Apply packed events to {term: review fields}; returns the new records.
+    Runs of reviews between edit events are folded by _fold_reviews, each edit
+    is applied where it falls.
+    """
+    if not data:
+        return records
+    records = dict(records)
+    marks = bytes(data[KIND_OFFSET :: EVENT.size]).translate(_EDIT_MARKS)
+    start = 0
+    index = marks.find(1)
+    while index != -1:
+        _fold_reviews(records, terms, data[start * EVENT.size : index * EVENT.size])
+        term_id, *_, kind, value, _ = EVENT.unpack_from(data, index * EVENT.size)
+        field, value = _edit(kind, value)
+        records[terms[term_id]] = {**(records.get(terms[term_id]) or {}), field: value}
+        start = index + 1
+        index = marks.find(1, start)
+    _fold_reviews(records, terms, data[start * EVENT.size :])
+    return records
+
+
+def _fold_reviews(records: Dict[str, Dict], terms: List[str], data):
+    """
+    Apply packed review events to `records` in place. Only the review count and
+    mastery delta add up over a term's events, the other fields come from its
+    last event, so the events are folded column-wise (term ids, deltas) and
+    just each term's last event is unpacked.
+    """
+    if not data:
+        return
+    words = array("I")
+    words.frombytes(data)
+    if sys.byteorder == "big":
+        words.byteswap()
+    ids = words[0::EVENT_WORDS]
+    last = dict(zip(ids, range(len(ids))))
+    counts = Counter(ids)
+    mastery = Counter()
+    deltas = bytes(data[DELTA_OFFSET :: EVENT.size])  # low bytes
+    if bytes(data[DELTA_OFFSET + 1 :: EVENT.size]) == deltas.translate(_SIGN_BYTES):
+        # Every delta fits in -128..127 (the usual case): one pass per value
+        for value in set(deltas) - {0}:
+            selected = deltas.translate(bytes(int(b == value) for b in range(256)))
+            signed = value - 256 if value > 127 else value
+            for term_id, count in Counter(compress(ids, selected)).items():
+                mastery[term_id] += count * signed
+    else:
+        halves = array("h")
+        halves.frombytes(data)
+        if sys.byteorder == "big":
+            halves.byteswap()
+        for term_id, delta in zip(ids, halves[DELTA_OFFSET // 2 :: EVENT.size // 2]):
+            if delta:
+                mastery[term_id] += delta
+
+    for term_id, index in last.items():
+        term_name = terms[term_id]
+        base = records.get(term_name) or {}
+        _, _, day, interval, _, _, scheduler, _, a, b = EVENT.unpack_from(
+            data, index * EVENT.size
+        )
+        state = [
+            (base.get("mastery_level") or 0) + mastery[term_id],
+            (base.get("review_count") or 0) + counts[term_id],
+            day,
+            interval,
+            scheduler,
+            a,
+            b,
+        ]
+        records[term_name] = {**base, **_state_fields(state)}
+
+
+class ReviewLog:
+    """
+    Files in `directory`:
+      - events.bin:    header (magic, version, generation) + active events
+      - snapshot.pickle: {generation, records} with every event of earlier
+                       generations folded in
+      - archive/events-NNNNNN.bin: the events of each compacted generation
+      - terms.txt:     term names, the line number is the term id
+      - lock:          flock target (shared for appends, exclusive otherwise)
+    """
+
+    def __init__(self, directory: Path = DEFAULT_LOG_DIR):
+        self.directory = Path(directory)
+        self.events_file = self.directory / "events.bin"
+        self.snapshot_file = self.directory / "snapshot.pickle"
+        self.terms_file = self.directory / "terms.txt"
+        self.archive_dir = self.directory / "archive"
+        self.lock_file = self.directory / "lock"
+        self._terms: List[str] = []
+        self._term_ids: Dict[str, int] = {}
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        try:
+            import fcntl
+        except ImportError:  # not available on Windows
+            yield
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_file, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def exists(self) -> bool:
+        return self.snapshot_file.exists()
+
+    def create(self, baseline: Dict[str, Dict]):
+        """Start a log whose snapshot is `baseline` (a no-op if one exists)"""
+        with self._locked(exclusive=True):
+            if self.exists():
+                return
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            self.terms_file.touch()
+            self._write_snapshot(0, baseline)
+            self._new_segment(0)
+
+    # --- files -----------------------------------------------------------
+    def _write_snapshot(self, generation: int, records: Dict[str, Dict]):
+        tmp_file = self.snapshot_file.with_name(f"snapshot.{os.getpid()}.tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump(
+                {
+                    "version": SNAPSHOT_VERSION,
+                    "generation": generation,
+                    "records": records,
+                },
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.snapshot_file)
+
+    def _read_snapshot(self) -> Tuple[int, Dict[str, Dict]]:
+        with open(self.snapshot_file, "rb") as f:
+            data = pickle.load(f)
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported review log snapshot: {self.snapshot_file}")
+        return data["generation"], data["records"]
+
+    def _new_segment(self, generation: int):
+        tmp_file = self.events_file.with_name(f"events.{os.getpid()}.tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(HEADER.pack(MAGIC, SNAPSHOT_VERSION, generation))
+        os.replace(tmp_file, self.events_file)
+
+    def _archived(self, generation: int) -> Path:
+        return self.archive_dir / f"events-{generation:06d}.bin"
+
+    @staticmethod
+    def _read_segment(path: Path) -> Tuple[Optional[int], bytes]:
+        """(generation, whole events) of a segment file; (None, b"") if missing"""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None, b""
+        magic, version, generation = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"Not a review log segment: {path}")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported review log segment version: {path}")
+        body = memoryview(data)[HEADER.size :]
+        # A torn final append (crash mid-write) is ignored
+        return generation, body[: len(body) - len(body) % EVENT.size]
+
+    def _load_terms(self):
+        with open(self.terms_file, "r") as f:
+            names = f.read().split("\n")[:-1]
+        for name in names[len(self._terms) :]:
+            self._term_ids[name] = len(self._terms)
+            self._terms.append(name)
+
+    def _ids(self, names) -> List[int]:
+        missing = [name for name in names if name not in self._term_ids]
+        if missing:
+            self._load_terms()
+            missing = [name for name in missing if name not in self._term_ids]
+        if missing:
+            with self._locked(exclusive=True):
+                self._load_terms()  # another writer may have added them
+                new = list(dict.fromkeys(n for n in missing if n not in self._term_ids))
+                with open(self.terms_file, "a") as f:
+                    f.write("".join(f"{name}\n" for name in new))
+                self._load_terms()
+        return [self._term_ids[name] for name in names]
+
+    def _recover(self):
+        """
+        Finish an interrupted compaction (events.bin missing): fold the archived
+        segment of the snapshot's generation if it was not folded yet, then
+        start the next segment. Called with the exclusive lock held.
+        """
+        generation, records = self._read_snapshot()
+        pending = self._archived(generation)
+        if pending.exists():
+            _, data = self._read_segment(pending)
+            self._load_terms()
+            generation += 1
+            self._write_snapshot(generation, fold(records, self._terms, data))
+        self._new_segment(generation)
+
+    # --- public API -------------------------------------------------------
+    def append(self, events: List[Tuple]):
+        """Append review events (see review_event) in one write"""
+        if not events:
+            return
+        ids = self._ids([event[0] for event in events])
+        data = b"".join(
+            EVENT.pack(term_id, *event[1:]) for term_id, event in zip(ids, events)
+        )
+        while True:
+            with self._locked(exclusive=False):
+                try:
+                    fd = os.open(self.events_file, os.O_WRONLY | os.O_APPEND)
+                except FileNotFoundError:
+                    fd = None
+                if fd is not None:
+                    try:
+                        written = os.write(fd, data)
+                        while written < len(data):  # only on odd filesystems
+                            written += os.write(fd, data[written:])
+                    finally:
+                        os.close(fd)
+                    return
+            with self._locked(exclusive=True):
+                if not self.events_file.exists():
+                    self._recover()
+
+    def replay(self) -> Tuple[Dict[str, Dict], int]:
+        """(current {term: review fields}, number of events replayed)"""
+        with self._locked(exclusive=False):
+            generation, records = self._read_snapshot()
+            segment_generation, data = self._read_segment(self.events_file)
+            if segment_generation is None:  # interrupted compaction
+                _, data = self._read_segment(self._archived(generation))
+            elif segment_generation != generation:
+                data = b""
+            self._load_terms()
+        return fold(records, self._terms, data), len(data) // EVENT.size
+
+    def active_events(self) -> int:
+        try:
+            size = os.stat(self.events_file).st_size
+        except FileNotFoundError:
+            return 0
+        return max(0, size - HEADER.size) // EVENT.size
+
+    def compact(self) -> int:
+        """Fold the active events into a new snapshot; returns how many"""
+        with self._locked(exclusive=True):
+            if not self.events_file.exists():
+                self._recover()
+            generation, records = self._read_snapshot()
+            _, data = self._read_segment(self.events_file)
+            count = len(data) // EVENT.size
+            if not count:
+                return 0
+            self._load_terms()
+            records = fold(records, self._terms, data)
+            # Archive first: a crash after this is finished by _recover()
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            os.replace(self.events_file, self._archived(generation))
+            self._write_snapshot(generation + 1, records)
+            self._new_segment(generation + 1)
+        return count
+
+    def maybe_compact(self, limit: int = COMPACT_EVENTS) -> int:
+        """Compact once the active segment holds `limit` events (one stat otherwise)"""
+        if self.active_events() >= limit:
+            return self.compact()
+        return 0
+
+    def review_days(self) -> Counter:
+        """Counter of review day ordinals over the whole history"""
+        days = Counter()
+        if not self.exists():
+            return days
+        segments = sorted(self.archive_dir.glob("events-*.bin")) + [self.events_file]
+        for path in segments:
+            _, data = self._read_segment(path)
+            if data:
+                words = array("I")
+                words.frombytes(data)
+                if sys.byteorder == "big":
+                    words.byteswap()
+                review_days = words[2::EVENT_WORDS]
+                kinds = bytes(data[KIND_OFFSET :: EVENT.size])
+                if kinds.strip(b"\0"):  # leave out edit events
+                    review_days = compress(review_days, kinds.translate(_REVIEW_MARKS))
+                days.update(review_days)
+        return days
+
+    def history(self, term_name: str) -> List[Dict]:
+        """Every logged review and edit of a term, oldest first"""
+        self._load_terms()
+        term_id = self._term_ids.get(term_name)
+        if term_id is None:
+            return []
+        segments = sorted(self.archive_dir.glob("events-*.bin")) + [self.events_file]
+        events = []
+        for path in segments:
+            _, data = self._read_segment(path)
+            for event in EVENT.iter_unpack(data):
+                if event[0] != term_id:
+                    continue
+                _, timestamp, day, interval, delta, grade, scheduler, kind, a, _ = event
+                if kind:
+                    field, value = _edit(kind, a)
+                    events.append(
+                        {
+                            "time": datetime.fromtimestamp(timestamp),
+                            "edited_on": date.fromordinal(day),
+                            "field": field,
+                            "value": value,
+                        }
+                    )
+                    continue
+                events.append(
+                    {
+                        "time": datetime.fromtimestamp(timestamp),
+                        "reviewed_on": date.fromordinal(day),
+                        "grade": grade,
+                        "mastery_delta": delta,
+                        "next_review": date.fromordinal(day + interval),
+                        "scheduler": SCHEDULER_NAMES.get(scheduler, "?"),
+                    }
+                )
+        return events
+
+
+def main():
+    import argparse
+
+    from metadata_store import STORE_BACKENDS, open_metadata_store
+
+    parser = argparse.ArgumentParser(description="Review event log")
+    parser.add_argument(
+        "--log-dir", help="Review log directory (default: the --store backend's log)"
+    )
+    parser.add_argument(
+        "--store", choices=STORE_BACKENDS, default="json", help="Review data backend"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    history_parser = subparsers.add_parser("history", help="Reviews of one term")
+    history_parser.add_argument("term")
+    replay_parser = subparsers.add_parser(
+        "replay", help="Rebuild review data from the log and compare with the store"
+    )
+    replay_parser.add_argument(
+        "--restore", action="store_true", help="Write the replayed data to the store"
+    )
+    subparsers.add_parser("compact", help="Fold logged events into the snapshot")
+    args = parser.parse_args()
+
+    project_data = PROJECT_DIR / "notes" / "data"
+    log_dir = args.log_dir or log_dir_for(args.store, project_data)
+    log = ReviewLog(log_dir)
+    if not log.exists():
+        print(f"❌ No review log at {log_dir} (it starts with the next review)")
+        return 1
+
+    if args.command == "history":
+        events = log.history(args.term)
+        if not events:
+            print(f"No logged reviews of '{args.term}'")
+            return 0
+        reviews = sum("grade" in event for event in events)
+        print(f"📜 {args.term}: {reviews} reviews, {len(events) - reviews} edits")
+        for event in events:
+            if "field" in event:
+                print(
+                    f"  {event['time']:%Y-%m-%d %H:%M}  edited {event['edited_on']}  "
+                    f"{event['field']} = {event['value']}"
+                )
+                continue
+            print(
+                f"  {event['time']:%Y-%m-%d %H:%M}  reviewed {event['reviewed_on']}  "
+                f"grade {event['grade']}  mastery {event['mastery_delta']:+d}  "
+                f"next {event['next_review']} ({event['scheduler']})"
+            )
+    elif args.command == "replay":
+        start = time.perf_counter()
+        records, count = log.replay()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(
+            f"🔁 Replayed {count} events over the snapshot: "
+            f"{len(records)} terms in {elapsed:.0f} ms"
+        )
+        store = open_metadata_store(
+            args.store,
+            project_data / "glossary_metadata.json",
+            project_data / "glossary_metadata.db",
+        )
+        stored = store.load_all()
+        differing = [
+            term
+            for term, record in records.items()
+            if any(stored.get(term, {}).get(k) != v for k, v in record.items())
+        ]
+        if args.restore and differing:
+            store.upsert({term: records[term] for term in differing})
+            print(f"✅ Restored {len(differing)} terms in the {args.store} store")
+        elif differing:
+            print(
+                f"⚠️  {len(differing)} terms differ from the store: "
+                f"{differing[:10]}"
+            )
+        else:
+            print("✅ Store matches the log")
+    elif args.command == "compact":
+        start = time.perf_counter()
+        count = log.compact()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"🗜️  Compacted {count} events into the snapshot ({elapsed:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Review Schedulers - When a reviewed term is due again, from how well it was recalled
+
+Every scheduler takes a term's stored review fields, a recall grade and the
+review date, and returns the fields to merge back: last_reviewed, review_count,
+next_review, plus whatever state the model keeps (stored alongside the review
+data; the SQLite store keeps it in its `extra` column).
+
+  - fixed: the original REVIEW_INTERVALS ladder, indexed by review count (the
+           grade is ignored)
+  - sm2:   SuperMemo-2: an ease factor per term, adjusted by every grade
+  - fsrs:  FSRS-4.5 memory model: stability and difficulty per term; the next
+           review is when recall probability drops to the desired retention
+
+Grades follow the common four-button scale: 1 again, 2 hard, 3 good, 4 easy.
+"""
+import math
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+GRADES = {"again": 1, "hard": 2, "good": 3, "easy": 4}
+DEFAULT_GRADE = GRADES["good"]
+MAX_INTERVAL = 36500
+# Mastery levels run from 0 to MAX_MASTERY
+MAX_MASTERY = 5
+
+
+def parse_grade(value) -> int:
+    """1-4 or again/hard/good/easy (argparse type)"""
+    text = str(value).strip().lower()
+    if text in GRADES:
+        return GRADES[text]
+    if text.isdigit() and 1 <= int(text) <= 4:
+        return int(text)
+    raise ValueError(f"invalid grade {value!r} (use 1-4 or {', '.join(GRADES)})")
+
+
+def parse_mastery_gain(value) -> int:
+    """Mastery points a review adds, -MAX_MASTERY to MAX_MASTERY (argparse type)"""
+    gain = int(str(value).strip())
+    if not -MAX_MASTERY <= gain <= MAX_MASTERY:
+        raise ValueError(
+            f"invalid mastery gain {value!r} (use -{MAX_MASTERY} to {MAX_MASTERY})"
+        )
+    return gain
+
+
+def _days_since(stored: Dict, reviewed_on: date) -> Optional[int]:
+    try:
+        last = date.fromisoformat(str(stored["last_reviewed"]))
+    except (KeyError, ValueError):
+        return None
+    return max(0, (reviewed_on - last).days)
+
+
+class ReviewScheduler:
+    """Computes the review fields after one review"""
+
+    name = ""
+
+    def interval(self, stored: Dict, grade: int, reviewed_on: date):
+        """(days until the next review, model fields to store)"""
+        raise NotImplementedError
+
+    def review(self, stored: Dict, grade: int, reviewed_on: date) -> Dict:
+        days, fields = self.interval(stored, grade, reviewed_on)
+        days = max(1, min(MAX_INTERVAL, days))
+        return {
+            "last_reviewed": reviewed_on.strftime("%Y-%m-%d"),
+            "review_count": (stored.get("review_count") or 0) + 1,
+            "next_review": (reviewed_on + timedelta(days=days)).strftime("%Y-%m-%d"),
+            **fields,
+        }
+
+
+class FixedScheduler(ReviewScheduler):
+    name = "fixed"
+
+    def __init__(self, intervals=(1, 3, 7, 14, 30, 60)):
+        self.intervals = list(intervals)
+
+    def interval(self, stored, grade, reviewed_on):
+        review_count = (stored.get("review_count") or 0) + 1
+        return self.intervals[min(review_count - 1, len(self.intervals) - 1)], {}
+
+
+class Sm2Scheduler(ReviewScheduler):
+    """
+    SM-2 with the four grades mapped to SuperMemo qualities (again 2, hard 3,
+    good 4, easy 5). A lapse restarts the repetition count; the ease factor
+    never drops below 1.3.
+    """
+
+    name = "sm2"
+    QUALITY = {1: 2, 2: 3, 3: 4, 4: 5}
+    INITIAL_EASE = 2.5
+    MIN_EASE = 1.3
+
+    def interval(self, stored, grade, reviewed_on):
+        quality = self.QUALITY[grade]
+        ease = stored.get("sm2_ease", self.INITIAL_EASE)
+        repetitions = stored.get("sm2_repetitions", 0)
+        previous = stored.get("interval_days", 0)
+        if quality < 3:
+            repetitions = 0
+            days = 1
+        else:
+            if repetitions == 0:
+                days = 1
+            elif repetitions == 1:
+                days = 6
+            else:
+                days = round(max(previous, 1) * ease)
+            repetitions += 1
+        ease += 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+        ease = max(self.MIN_EASE, ease)
+        return days, {
+            "sm2_ease": round(ease, 4),
+            "sm2_repetitions": repetitions,
+            "interval_days": days,
+        }
+
+
+class FsrsScheduler(ReviewScheduler):
+    """
+    FSRS-4.5 with its published default weights. Stability S is the interval (in
+    days) at which recall probability falls to 90%; difficulty D (1-10) slows
+    stability growth. Terms without FSRS state start from their first grade.
+    """
+
+    name = "fsrs"
+    WEIGHTS = (
+        0.4872, 1.4003, 3.7145, 13.8206, 5.1618, 1.2298, 0.8975, 0.031,
+        1.6474, 0.1367, 1.0461, 2.1072, 0.0793, 0.3246, 1.587, 0.2272, 2.8755,
+    )  # fmt: skip
+    DECAY = -0.5
+    FACTOR = 19 / 81  # so that retrievability(S, S) == 0.9
+
+    def __init__(self, desired_retention: float = 0.9, weights=None):
+        self.desired_retention = desired_retention
+        self.w = tuple(weights or self.WEIGHTS)
+
+    def retrievability(self, elapsed_days: float, stability: float) -> float:
+        return (1 + self.FACTOR * elapsed_days / stability) ** self.DECAY
+
+    def _initial_difficulty(self, grade: int) -> float:
+        return self.w[4] - (grade - 3) * self.w[5]
+
+    def interval(self, stored, grade, reviewed_on):
+        w = self.w
+        stability = stored.get("fsrs_stability")
+        difficulty = stored.get("fsrs_difficulty")
+        elapsed = _days_since(stored, reviewed_on)
+        if not stability or difficulty is None or elapsed is None:
+            stability = w[grade - 1]
+            difficulty = self._initial_difficulty(grade)
+        else:
+            recall = self.retrievability(elapsed, stability)
+            if grade == 1:  # a lapse never leaves the term more stable
+                stability = min(
+                    stability,
+                    w[11]
+                    * difficulty ** -w[12]
+                    * ((stability + 1) ** w[13] - 1)
+                    * math.exp(w[14] * (1 - recall)),
+                )
+            else:
+                hard_penalty = w[15] if grade == 2 else 1.0
+                easy_bonus = w[16] if grade == 4 else 1.0
+                stability *= 1 + (
+                    math.exp(w[8])
+                    * (11 - difficulty)
+                    * stability ** -w[9]
+                    * (math.exp(w[10] * (1 - recall)) - 1)
+                    * hard_penalty
+                    * easy_bonus
+                )
+            difficulty -= w[6] * (grade - 3)
+            # Mean reversion towards the difficulty of a "good" first review
+            difficulty = w[7] * self._initial_difficulty(3) + (1 - w[7]) * difficulty
+        difficulty = min(10.0, max(1.0, difficulty))
+        stability = max(0.1, stability)
+        days = round(
+            stability / self.FACTOR * (self.desired_retention ** (1 / self.DECAY) - 1)
+        )
+        return days, {
+            "fsrs_stability": round(stability, 4),
+            "fsrs_difficulty": round(difficulty, 4),
+            "interval_days": max(1, days),
+        }
+
+
+SCHEDULERS = {
+    scheduler.name: scheduler
+    for scheduler in (FixedScheduler, Sm2Scheduler, FsrsScheduler)
+}
+
+
+def get_scheduler(name: str, intervals=None) -> ReviewScheduler:
+    """Scheduler by name ("fixed" takes the planner's interval ladder)"""
+    if name not in SCHEDULERS:
+        raise ValueError(
+            f"Unknown review scheduler: {name} (use {', '.join(SCHEDULERS)})"
+        )
+    if name == "fixed" and intervals is not None:
+        return FixedScheduler(intervals)
+    return SCHEDULERS[name]()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Study Stats - Glossary statistics kept as aggregates that reviews update in place
+
+Aggregates (cached in notes/data/cache/study_stats.pickle):
+  - mastery histogram (levels 0-5) per primary chapter and per tag
+  - next_review histogram per chapter (None = never reviewed), so overdue and
+    due counts for any day are a sum over distinct dates, not over terms
+  - reviews per day, counted from the review log
+
+They are built from the parsed terms once and stamped with fingerprints of
+their sources (glossary, config, review data, topics). While the stamps match,
+--stats reads the aggregates alone; a review moves its term between buckets
+and re-stamps the review data, so the cache stays current without a re-scan.
+Any other change to a source means one rebuild on the next --stats.
+"""
+import os
+import pickle
+from collections import Counter
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from glossary_index import same_content
+
+CACHE_VERSION = 1
+MASTERY_LEVELS = range(6)
+# Mastery level from which a term counts as ready for an assignment
+READY_MASTERY = 3
+
+
+def tree_stamp(directory) -> Optional[Tuple[int, int, int]]:
+    """(files, total size, newest mtime) of a directory tree; None if missing"""
+    files = size = newest = 0
+    pending = [directory]
+    try:
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                        continue
+                    st = entry.stat()
+                    files += 1
+                    size += st.st_size
+                    newest = max(newest, st.st_mtime_ns)
+    except FileNotFoundError:
+        return None
+    return files, size, newest
+
+
+def _level(mastery) -> int:
+    try:
+        return min(5, max(0, int(mastery or 0)))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _chapter_key(chapter):
+    text = str(chapter)
+    return (0, int(text), "") if text.isdigit() else (1, 0, text)
+
+
+class StudyStats:
+    """
+    Cached state:
+      - sources:        fingerprints of what the aggregates were built from
+      - by_chapter:     {chapter: Counter(mastery level)}
+      - by_tag:         {tag: Counter(mastery level)}
+      - due_by_chapter: {chapter: Counter(next_review or None)}
+      - reviews_by_day: Counter(day ordinal)
+    """
+
+    def __init__(self, cache_file: Path = None):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.clear()
+        self.load()
+
+    def clear(self):
+        self.sources: Optional[Dict] = None
+        self.by_chapter: Dict[object, Counter] = {}
+        self.by_tag: Dict[str, Counter] = {}
+        self.due_by_chapter: Dict[object, Counter] = {}
+        self.reviews_by_day: Counter = Counter()
+        self.dirty = True
+
+    def load(self):
+        if self.cache_file is None:
+            return
+        try:
+            with open(self.cache_file, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            print(f"Warning: Ignoring unreadable statistics cache {self.cache_file}: {e}")
+            return
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            self.sources = data["sources"]
+            self.by_chapter = data["by_chapter"]
+            self.by_tag = data["by_tag"]
+            self.due_by_chapter = data["due_by_chapter"]
+            self.reviews_by_day = data["reviews_by_day"]
+            self.dirty = False
+
+    def save(self):
+        if self.cache_file is None or not self.dirty:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_name(
+            f"{self.cache_file.name}.{os.getpid()}.tmp"
+        )
+        with open(tmp_file, "wb") as f:
+            pickle.dump(
+                {
+                    "version": CACHE_VERSION,
+                    "sources": self.sources,
+                    "by_chapter": self.by_chapter,
+                    "by_tag": self.by_tag,
+                    "due_by_chapter": self.due_by_chapter,
+                    "reviews_by_day": self.reviews_by_day,
+                },
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_file, self.cache_file)
+        self.dirty = False
+
+    def current(self, sources: Dict) -> bool:
+        """The aggregates were built from sources with this content"""
+        if self.sources is None or set(self.sources) != set(sources):
+            return False
+        for name, fingerprint in sources.items():
+            cached = self.sources[name]
+            if isinstance(fingerprint, dict) or isinstance(cached, dict):
+                if not same_content(fingerprint, cached):
+                    return False
+            elif fingerprint != cached:
+                return False
+        if sources != self.sources:  # touched but unchanged: skip re-hashing
+            self.sources = sources
+            self.dirty = True
+        return True
+
+    # --- maintenance ------------------------------------------------------
+    @staticmethod
+    def _bump(counters: Dict, key, bucket, step: int):
+        counts = counters.get(key)
+        if counts is None:
+            counts = counters[key] = Counter()
+        counts[bucket] = counts.get(bucket, 0) + step
+
+    def _move(self, chapter, tags, mastery, next_review, step: int):
+        level = _level(mastery)
+        self._bump(self.by_chapter, chapter, level, step)
+        for tag in tags:
+            if tag:
+                self._bump(self.by_tag, tag, level, step)
+        self._bump(self.due_by_chapter, chapter, next_review or None, step)
+
+    def build(self, terms: Dict, sources: Dict, reviews_by_day: Counter):
+        """Full rebuild from a {term: TermRecord} table"""
+        self.clear()
+        # Terms sharing chapter, mastery, next review and tag list move together
+        rows = Counter(
+            (
+                record.chapter,
+                record.mastery_level,
+                record.next_review,
+                tuple(record.tags) if record.tags else (),
+            )
+            for record in terms.values()
+        )
+        for (chapter, mastery, next_review, tags), count in rows.items():
+            self._move(chapter, tags, mastery, next_review, count)
+        self.reviews_by_day = Counter(reviews_by_day)
+        self.sources = sources
+
+    def update_term(self, chapter, tags: Iterable, old: Tuple, new: Tuple):
+        """Move one term from its (mastery, next_review) buckets `old` to `new`"""
+        if old == new:
+            return
+        tags = tuple(tags or ())
+        self._move(chapter, tags, *old, -1)
+        self._move(chapter, tags, *new, 1)
+        self.dirty = True
+
+    def add_reviews(self, days: Iterable[date]):
+        self.reviews_by_day.update(day.toordinal() for day in days)
+        self.dirty = True
+
+    # --- queries ----------------------------------------------------------
+    @staticmethod
+    def _clean(counters: Dict) -> Dict:
+        return {key: counts for key, counts in counters.items() if +counts}
+
+    def chapters(self) -> List[Tuple[object, Counter]]:
+        """[(chapter, mastery Counter)], numbered chapters first, in order"""
+        chapters = self._clean(self.by_chapter)
+        return sorted(
+            chapters.items(),
+            key=lambda item: (item[0] is None, _chapter_key(item[0])),
+        )
+
+    def tags(self, limit: int = None) -> List[Tuple[str, Counter]]:
+        """[(tag, mastery Counter)], most terms first"""
+        tags = sorted(
+            self._clean(self.by_tag).items(),
+            key=lambda item: (-sum(item[1].values()), str(item[0])),
+        )
+        return tags[:limit] if limit else tags
+
+    def total(self) -> Counter:
+        total = Counter()
+        for counts in self.by_chapter.values():
+            total.update(counts)
+        return +total
+
+    def due(self, on: date, chapters: Iterable = None) -> Tuple[int, int, int]:
+        """(overdue before `on`, due on `on`, never reviewed) terms"""
+        day = on.isoformat()
+        keys = self.due_by_chapter if chapters is None else chapters
+        overdue = due_today = unreviewed = 0
+        for chapter in keys:
+            for next_review, count in self.due_by_chapter.get(chapter, {}).items():
+                if next_review is None:
+                    unreviewed += count
+                elif str(next_review) < day:
+                    overdue += count
+                elif str(next_review) == day:
+                    due_today += count
+        return overdue, due_today, unreviewed
+
+    def overdue_by_chapter(self, on: date) -> List[Tuple[object, int]]:
+        overdue = [
+            (chapter, self.due(on, [chapter])[0]) for chapter, _ in self.chapters()
+        ]
+        return [(chapter, count) for chapter, count in overdue if count]
+
+    def reviews_per_day(self, end: date, days: int) -> List[Tuple[date, int]]:
+        last = end.toordinal()
+        return [
+            (date.fromordinal(day), self.reviews_by_day.get(day, 0))
+            for day in range(last - days + 1, last + 1)
+        ]
+
+    def readiness(self, chapters: Iterable, on: date) -> Dict:
+        """Mastery and review state of the terms filed under `chapters`"""
+        chapters = list(dict.fromkeys(chapters))
+        counts = Counter()
+        for chapter in chapters:
+            counts.update(self.by_chapter.get(chapter, {}))
+        counts = +counts
+        terms = sum(counts.values())
+        overdue, due_today, unreviewed = self.due(on, chapters)
+        return {
+            "terms": terms,
+            "mean_mastery": (
+                sum(level * n for level, n in counts.items()) / terms if terms else 0.0
+            ),
+            "ready": sum(n for level, n in counts.items() if level >= READY_MASTERY),
+            "overdue": overdue,
+            "due_today": due_today,
+            "unreviewed": unreviewed,
+        }
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Term Export - Stream terms and their review state as NDJSON, JSON, CSV or columnar chunks
+
+Rows come from a generator over term names (one dict per term: the name, every
+term record field and the scheduler state kept in the review data) and each
+writer encodes and writes a row before the next one is built, so memory stays
+bounded by one row (one chunk for the columnar format) whatever the term count.
+
+Formats:
+  - ndjson:   one JSON object per line
+  - json:     a JSON array of the same objects, one per line
+  - csv:      header row, then one row per term; list fields joined with "; "
+  - columnar: one JSON line per chunk of CHUNK_ROWS terms, holding a list of
+              values per field ({"offset", "rows", "columns": {field: [...]}}),
+              after a header line with the field names. Each chunk loads
+              straight into a data frame (pandas.DataFrame(chunk["columns"])).
+
+Without an explicit format the file suffix picks one (.ndjson/.jsonl, .json,
+.csv; NDJSON on stdout). Files are written to a temporary name and renamed when
+complete; "-" streams to stdout.
+"""
+import json
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from term_store import LIST_FIELDS, TERM_FIELDS
+
+EXPORT_FORMATS = ("ndjson", "json", "csv", "columnar")
+# Scheduler state stored with the review data (see review_schedulers)
+REVIEW_STATE_FIELDS = (
+    "interval_days",
+    "sm2_ease",
+    "sm2_repetitions",
+    "fsrs_stability",
+    "fsrs_difficulty",
+)
+EXPORT_FIELDS = ("name",) + TERM_FIELDS + REVIEW_STATE_FIELDS
+CHUNK_ROWS = 10000
+COLUMNAR_VERSION = 1
+SUFFIX_FORMATS = {
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".json": "json",
+    ".csv": "csv",
+}
+
+
+def export_format_for(path: Optional[str], export_format: Optional[str]) -> str:
+    """
+    The requested format, else the one the file suffix implies (NDJSON on
+    stdout). Raises ValueError for a file whose suffix implies no format.
+    """
+    if export_format:
+        return export_format
+    if path is None or path == "-":
+        return "ndjson"
+    suffix = Path(path).suffix.lower()
+    if suffix not in SUFFIX_FORMATS:
+        raise ValueError(
+            f"Cannot tell the export format of {path} from its suffix: "
+            f"use --export-format ({', '.join(EXPORT_FORMATS)})"
+        )
+    return SUFFIX_FORMATS[suffix]
+
+
+def term_rows(
+    terms: Dict, names: Iterable[str], metadata: Dict = None
+) -> Iterator[Dict]:
+    """One export row per term name, built lazily"""
+    metadata = metadata or {}
+    for name in names:
+        row = {"name": name}
+        row.update(zip(TERM_FIELDS, terms[name].to_row()))
+        stored = metadata.get(name) or {}
+        for field in REVIEW_STATE_FIELDS:
+            row[field] = stored.get(field)
+        yield row
+
+
+def write_ndjson(rows: Iterable[Dict], out: TextIO) -> int:
+    encode = json.JSONEncoder(ensure_ascii=False, default=str).encode
+    count = 0
+    for row in rows:
+        out.write(encode(row))
+        out.write("\n")
+        count += 1
+    return count
+
+
+def write_json(rows: Iterable[Dict], out: TextIO) -> int:
+    encode = json.JSONEncoder(ensure_ascii=False, default=str).encode
+    out.write("[")
+    separator = "\n"
+    count = 0
+    for row in rows:
+        out.write(separator)
+        out.write(encode(row))
+        separator = ",\n"
+        count += 1
+    out.write("\n]\n")
+    return count
+
+
+def write_csv(rows: Iterable[Dict], out: TextIO) -> int:
+    import csv
+
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_FIELDS)
+    count = 0
+    for row in rows:
+        values = []
+        for field in EXPORT_FIELDS:
+            value = row.get(field)
+            if value is None:
+                value = ""
+            elif field in LIST_FIELDS:
+                value = "; ".join(str(item) for item in value)
+            values.append(value)
+        writer.writerow(values)
+        count += 1
+    return count
+
+
+def write_columnar(
+    rows: Iterable[Dict], out: TextIO, chunk_rows: int = CHUNK_ROWS
+) -> int:
+    encode = json.JSONEncoder(ensure_ascii=False, default=str).encode
+    out.write(
+        encode(
+            {
+                "format": "glossary-columnar",
+                "version": COLUMNAR_VERSION,
+                "fields": EXPORT_FIELDS,
+            }
+        )
+    )
+    out.write("\n")
+    count = 0
+    columns: Dict[str, List] = {field: [] for field in EXPORT_FIELDS}
+
+    def flush(size: int):
+        out.write(
+            encode({"offset": count - size, "rows": size, "columns": columns})
+        )
+        out.write("\n")
+        for values in columns.values():
+            values.clear()
+
+    size = 0
+    for row in rows:
+        for field, values in columns.items():
+            values.append(row.get(field))
+        size += 1
+        count += 1
+        if size == chunk_rows:
+            flush(size)
+            size = 0
+    if size:
+        flush(size)
+    return count
+
+
+WRITERS = {
+    "ndjson": write_ndjson,
+    "json": write_json,
+    "csv": write_csv,
+    "columnar": write_columnar,
+}
+
+
+@contextmanager
+def open_output(path: Optional[str]):
+    """
+    Text stream for `path`: stdout for None or "-", else a temporary file next
+    to it that replaces `path` only once everything was written
+    """
+    if path is None or path == "-":
+        yield sys.stdout
+        sys.stdout.flush()
+        return
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_file, "w", encoding="utf-8", newline="") as f:
+            yield f
+        os.replace(tmp_file, path)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
+
+
+def export_rows(rows: Iterable[Dict], path: Optional[str], export_format: str) -> int:
+    """Stream rows to `path` ("-" for stdout) in one of EXPORT_FORMATS"""
+    if export_format not in WRITERS:
+        raise ValueError(
+            f"Unknown export format: {export_format} (use {', '.join(WRITERS)})"
+        )
+    with open_output(path) as out:
+        return WRITERS[export_format](rows, out)
+
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Term Filters - Inverted indexes for the study plan's chapter, importance and tag filters
+
+Built once from the parsed term table and kept in sync term by term:
+  - chapter -> terms        (primary chapter)
+  - any chapter -> terms    (all_chapters from topic files)
+  - exam importance -> terms
+  - lowercased tag -> terms, plus a trigram index over the tag vocabulary so
+    substring tag filters only verify the tags that contain every trigram
+Filters intersect posting sets, smallest first, and results come back in
+glossary order. Building the index costs about two linear scans, so a process
+that filters once uses scan_terms(), the same filters in a single pass.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+NGRAM = 3
+
+
+def _ngrams(text: str) -> Set[str]:
+    return {text[i : i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+def _add(postings: Dict, key, term_name: str):
+    postings.setdefault(key, set()).add(term_name)
+
+
+def _discard(postings: Dict, key, term_name: str) -> bool:
+    """Remove a posting; True when that emptied (and dropped) the key"""
+    terms = postings.get(key)
+    if terms is None:
+        return False
+    terms.discard(term_name)
+    if not terms:
+        del postings[key]
+        return True
+    return False
+
+
+def scan_terms(
+    terms: Dict,
+    chapters: Optional[Iterable] = None,
+    chapter=None,
+    importance=None,
+    tag: Optional[str] = None,
+) -> List[str]:
+    """TermFilterIndex.select() by one pass over `terms`, without an index"""
+    chapters = set(chapters) if chapters else None
+    tag = tag.lower() if tag else None
+    names = []
+    for term_name, record in terms.items():
+        if chapters:
+            if record.chapter not in chapters and not any(
+                chap in chapters for chap in record.all_chapters or ()
+            ):
+                continue
+        elif chapter and record.chapter != chapter:
+            continue
+        if importance and record.exam_importance != importance:
+            continue
+        if tag and not any(
+            isinstance(t, str) and tag in t.lower() for t in record.tags or ()
+        ):
+            continue
+        names.append(term_name)
+    return names
+
+
+class TermFilterIndex:
+    """Posting sets over a {term_name: TermRecord} table"""
+
+    def __init__(self, terms: Dict = None):
+        self.by_chapter: Dict[object, Set[str]] = {}
+        self.by_any_chapter: Dict[object, Set[str]] = {}
+        self.by_importance: Dict[object, Set[str]] = {}
+        self.by_tag: Dict[str, Set[str]] = {}
+        self.tag_ngrams: Dict[str, Set[str]] = {}
+        self._keys: Dict[str, Tuple] = {}  # what each term is currently indexed under
+        self._lowered: Dict[str, str] = {}  # tag -> normalized tag
+        self._order: List[str] = []
+        self._ordinal: Dict[str, int] = {}
+        if terms:
+            self.sync(terms)
+
+    def _index_keys(self, record) -> Tuple:
+        tags = []
+        for tag in record.tags or ():
+            lowered = self._lowered.get(tag)
+            if lowered is None:
+                # Non-string tags can never match a tag filter
+                lowered = tag.lower() if isinstance(tag, str) else ""
+                self._lowered[tag] = lowered
+            if lowered:
+                tags.append(lowered)
+        return (
+            record.chapter,
+            tuple(record.all_chapters or ()),
+            record.exam_importance,
+            tuple(tags),
+        )
+
+    def _add_tag(self, tag: str, term_name: str):
+        if tag not in self.by_tag:
+            for gram in _ngrams(tag):
+                _add(self.tag_ngrams, gram, tag)
+        _add(self.by_tag, tag, term_name)
+
+    def _discard_tag(self, tag: str, term_name: str):
+        if _discard(self.by_tag, tag, term_name):
+            for gram in _ngrams(tag):
+                _discard(self.tag_ngrams, gram, tag)
+
+    def _index(self, term_name: str, keys: Tuple):
+        # Runs once per term on the first build, so the set lookups are inlined
+        chapter, all_chapters, importance, tags = keys
+        postings = self.by_chapter.get(chapter)
+        if postings is None:
+            postings = self.by_chapter[chapter] = set()
+        postings.add(term_name)
+        by_any_chapter = self.by_any_chapter
+        for chap in all_chapters:
+            postings = by_any_chapter.get(chap)
+            if postings is None:
+                postings = by_any_chapter[chap] = set()
+            postings.add(term_name)
+        postings = self.by_importance.get(importance)
+        if postings is None:
+            postings = self.by_importance[importance] = set()
+        postings.add(term_name)
+        by_tag = self.by_tag
+        for tag in tags:
+            postings = by_tag.get(tag)
+            if postings is None:
+                self._add_tag(tag, term_name)
+            else:
+                postings.add(term_name)
+        self._keys[term_name] = keys
+
+    def _unindex(self, term_name: str):
+        chapter, all_chapters, importance, tags = self._keys.pop(term_name)
+        _discard(self.by_chapter, chapter, term_name)
+        for chap in all_chapters:
+            _discard(self.by_any_chapter, chap, term_name)
+        _discard(self.by_importance, importance, term_name)
+        for tag in tags:
+            self._discard_tag(tag, term_name)
+
+    def update_term(self, term_name: str, record):
+        """Re-index one term after its chapter, importance or tags changed"""
+        keys = self._index_keys(record)
+        if self._keys.get(term_name) == keys:
+            return
+        if term_name in self._keys:
+            self._unindex(term_name)
+        self._index(term_name, keys)
+
+    def sync(self, terms: Dict) -> int:
+        """
+        Bring the index in line with a (re-parsed) term table, touching only
+        terms that were added, removed or re-filed. Returns how many changed.
+        """
+        changed = 0
+        for term_name in [t for t in self._keys if t not in terms]:
+            self._unindex(term_name)
+            changed += 1
+        for term_name, record in terms.items():
+            keys = self._index_keys(record)
+            if self._keys.get(term_name) != keys:
+                if term_name in self._keys:
+                    self._unindex(term_name)
+                self._index(term_name, keys)
+                changed += 1
+        self._order = list(terms)
+        self._ordinal = {term_name: i for i, term_name in enumerate(self._order)}
+        return changed
+
+    def tags_containing(self, text: str) -> List[str]:
+        """Normalized tags with `text` (lowercased) as a substring"""
+        text = text.lower()
+        if len(text) < NGRAM:
+            return [tag for tag in self.by_tag if text in tag]
+        candidates = None
+        grams = sorted(_ngrams(text), key=lambda g: len(self.tag_ngrams.get(g, ())))
+        for gram in grams:
+            tags = self.tag_ngrams.get(gram)
+            if not tags:
+                return []
+            candidates = set(tags) if candidates is None else candidates & tags
+            if not candidates:
+                return []
+        return [tag for tag in candidates if text in tag]
+
+    def select(
+        self,
+        chapters: Optional[Iterable] = None,
+        chapter=None,
+        importance=None,
+        tag: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Names of the terms passing every given filter, in glossary order:
+          chapters:   primary chapter or any of all_chapters is in this list
+          chapter:    primary chapter equals this
+          importance: exam_importance equals this
+          tag:        some tag contains this text, case-insensitively
+        """
+        postings = []
+        if chapters:
+            union = set()
+            for chap in chapters:
+                union |= self.by_chapter.get(chap, set())
+                union |= self.by_any_chapter.get(chap, set())
+            postings.append(union)
+        elif chapter:
+            postings.append(self.by_chapter.get(chapter, set()))
+        if importance:
+            postings.append(self.by_importance.get(importance, set()))
+        if tag:
+            union = set()
+            for matched in self.tags_containing(tag):
+                union |= self.by_tag[matched]
+            postings.append(union)
+
+        if not postings:
+            return list(self._order)
+        postings.sort(key=len)
+        result = set(postings[0])
+        for terms in postings[1:]:
+            if not result:
+                break
+            result &= terms
+        if len(result) * 8 > len(self._order):
+            return [term_name for term_name in self._order if term_name in result]
+        return sorted(result, key=self._ordinal.__getitem__)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Term Store - Compact slotted records for parsed glossary terms
+
+Each term is a TermRecord with __slots__ instead of a ~13-key dict, and the
+strings and lists that repeat across terms (chapters, importance levels, tag
+lists) are interned so every term shares one copy. Records keep dict-style
+access (record["chapter"], .get(), .update(), .items()) so existing callers
+work unchanged. Study plan entries are PlanEntry views over a record rather
+than copies of it.
+"""
+import sys
+from operator import attrgetter
+from typing import Dict, Iterator, List, Tuple
+
+TERM_FIELDS = (
+    "definition",
+    "wiki_link",
+    "letter_section",
+    "chapter",
+    "exam_importance",
+    "study_importance",
+    "mastery_level",
+    "last_reviewed",
+    "review_count",
+    "next_review",
+    "tags",
+    "related_terms",
+    "all_chapters",
+)
+LIST_FIELDS = ("tags", "related_terms", "all_chapters")
+# Fields whose values repeat across many terms and are worth sharing
+SHARED_FIELDS = ("letter_section", "chapter", "exam_importance", "study_importance")
+
+
+def review_fields(fields: Dict) -> Dict:
+    """The entries of stored review data that are also term record fields"""
+    return {key: value for key, value in fields.items() if key in TERM_FIELDS}
+
+
+class Interner:
+    """
+    Shares one copy of equal strings and string lists between records.
+    Shared lists must be treated as read-only; assign a new list to change one.
+    """
+
+    def __init__(self):
+        self._lists: Dict[Tuple, List] = {}
+
+    @staticmethod
+    def string(value):
+        return sys.intern(value) if type(value) is str else value
+
+    def list(self, values) -> List:
+        if not values:
+            values = ()
+        key = tuple(self.string(value) for value in values)
+        try:
+            return self._lists[key]
+        except KeyError:
+            shared = self._lists[key] = list(key)
+            return shared
+        except TypeError:  # unhashable items: keep a private copy
+            return list(values)
+
+
+class TermRecord:
+    """One glossary term; supports the dict operations the planner uses"""
+
+    __slots__ = TERM_FIELDS
+
+    def __init__(self, interner: Interner = None, **fields):
+        interner = interner or Interner()
+        for field in TERM_FIELDS:
+            value = fields.pop(field, None)
+            if field in LIST_FIELDS:
+                value = interner.list(value)
+            elif field in SHARED_FIELDS:
+                value = interner.string(value)
+            object.__setattr__(self, field, value)
+        if fields:
+            raise KeyError(f"Unknown term field(s): {', '.join(fields)}")
+
+    # Mapping-style access
+    def __getitem__(self, key: str):
+        if key not in TERM_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        if key not in TERM_FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key) -> bool:
+        return key in TERM_FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(TERM_FIELDS)
+
+    def __len__(self) -> int:
+        return len(TERM_FIELDS)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in TERM_FIELDS else default
+
+    def keys(self):
+        return TERM_FIELDS
+
+    def items(self):
+        return [(field, getattr(self, field)) for field in TERM_FIELDS]
+
+    def update(self, fields: Dict = None, **kwargs):
+        for key, value in {**(fields or {}), **kwargs}.items():
+            self[key] = value
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in TERM_FIELDS}
+
+    # Compact serialized form used by the index snapshot
+    def to_row(self) -> List:
+        return [getattr(self, field) for field in TERM_FIELDS]
+
+    @classmethod
+    def from_row(cls, row: List, interner: Interner = None) -> "TermRecord":
+        return cls(interner, **dict(zip(TERM_FIELDS, row)))
+
+    def __repr__(self):
+        return f"TermRecord({self.to_dict()!r})"
+
+
+def terms_to_rows(terms: Dict[str, TermRecord]) -> Dict[str, List]:
+    """{term: record} -> {term: row} for JSON snapshots"""
+    return {name: record.to_row() for name, record in terms.items()}
+
+
+def terms_from_rows(rows: Dict[str, List]) -> Dict[str, TermRecord]:
+    """Inverse of terms_to_rows, sharing repeated values between records"""
+    interner = Interner()
+    return {
+        sys.intern(name): TermRecord.from_row(row, interner)
+        for name, row in rows.items()
+    }
+
+
+# Keys of a study plan entry: the term name, its priority, and these record fields
+PLAN_FIELDS = (
+    "definition",
+    "chapter",
+    "exam_importance",
+    "study_importance",
+    "mastery_level",
+    "last_reviewed",
+    "wiki_link",
+    "letter_section",
+    "tags",
+    "related_terms",
+)
+PLAN_KEYS = ("name", "priority_score") + PLAN_FIELDS
+_plan_values = attrgetter(*PLAN_FIELDS)
+
+
+class PlanEntry:
+    """A study plan entry: a read-only view of a term record plus its priority"""
+
+    __slots__ = ("name", "record", "priority_score")
+
+    def __init__(self, name: str, record: TermRecord, priority_score: float):
+        self.name = name
+        self.record = record
+        self.priority_score = priority_score
+
+    def __getitem__(self, key: str):
+        if key == "name":
+            return self.name
+        if key == "priority_score":
+            return self.priority_score
+        if key in PLAN_FIELDS:
+            return self.record[key]
+        raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        return key in PLAN_KEYS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(PLAN_KEYS)
+
+    def get(self, key: str, default=None):
+        return self[key] if key in PLAN_KEYS else default
+
+    def keys(self):
+        return PLAN_KEYS
+
+    def items(self):
+        return [(key, self[key]) for key in PLAN_KEYS]
+
+    def to_dict(self) -> Dict:
+        return dict(
+            zip(PLAN_KEYS, (self.name, self.priority_score) + _plan_values(self.record))
+        )
+
+    def __repr__(self):
+        return f"PlanEntry({self.to_dict()!r})"
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Tracing - Phase timers and counters behind --profile, close to free when disabled
+
+    with tracing.span("score"):
+        ...
+    tracing.count("terms_scored", len(terms))
+
+    @tracing.traced("parse_glossary")
+    def parse_glossary(self): ...
+
+Spans nest: one opened inside another is reported under it, with its calls,
+total and self time. Counters are plain sums (files read, bytes, regex calls,
+terms scored). Nothing is recorded until enable(): span() then returns one
+shared no-op context manager, traced functions call straight through and
+count() returns after a single flag check, so the hooks stay in the code.
+Hot loops keep their own local counts and report them once per call.
+
+Work done in process-pool workers (--parallel scans) is timed as a whole by
+the parent's spans; its counters are not collected.
+"""
+import functools
+import json
+import sys
+import time
+from collections import Counter
+from contextlib import nullcontext
+from typing import Dict, List, TextIO
+
+PROFILE_FORMATS = ("text", "json")
+
+enabled = False
+_NULL_SPAN = nullcontext()
+# (outer span names..., name) -> [calls, seconds, seconds in child spans, that path]
+_spans: Dict[tuple, List] = {}
+_counters: Counter = Counter()
+_stack: List[List] = []
+_started = _stopped = None
+_profiler = None
+
+
+class _Span:
+    __slots__ = ("name", "entry", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        path = (_stack[-1][3] if _stack else ()) + (self.name,)
+        entry = _spans.get(path)
+        if entry is None:
+            entry = _spans[path] = [0, 0.0, 0.0, path]
+        self.entry = entry
+        _stack.append(entry)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        entry = self.entry
+        entry[0] += 1
+        entry[1] += elapsed
+        _stack.pop()
+        if _stack:
+            _stack[-1][2] += elapsed
+        return False
+
+
+def span(name: str):
+    """Context manager timing one phase (a shared no-op while disabled)"""
+    return _Span(name) if enabled else _NULL_SPAN
+
+
+def traced(name: str):
+    """Decorator: time every call of a function as the span `name`"""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def count(name: str, n: int = 1):
+    if enabled:
+        _counters[name] += n
+
+
+def enable(cprofile: bool = False):
+    """Start recording (from scratch), optionally under cProfile as well"""
+    global enabled, _started, _stopped, _profiler
+    _spans.clear()
+    _counters.clear()
+    _stack.clear()
+    enabled = True
+    _started = time.perf_counter()
+    _stopped = None
+    if cprofile:
+        import cProfile
+
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def disable():
+    global enabled, _stopped
+    _stopped = time.perf_counter()
+    if _profiler is not None:
+        _profiler.disable()
+    enabled = False
+
+
+def report() -> Dict:
+    """Recorded phases (depth-first, in first-seen order) and counters"""
+    total = 0.0
+    if _started is not None:
+        total = (_stopped or time.perf_counter()) - _started
+    order = {path: i for i, path in enumerate(_spans)}
+    paths = sorted(
+        _spans, key=lambda path: [order[path[: i + 1]] for i in range(len(path))]
+    )
+    phases = []
+    for path in paths:
+        calls, seconds, child_seconds, _ = _spans[path]
+        if not calls:
+            continue  # still open (report taken inside it)
+        phases.append(
+            {
+                "phase": "/".join(path),
+                "depth": len(path) - 1,
+                "calls": calls,
+                "seconds": round(seconds, 6),
+                "self_seconds": round(max(0.0, seconds - child_seconds), 6),
+            }
+        )
+    return {
+        "total_seconds": round(total, 6),
+        "phases": phases,
+        "counters": dict(sorted(_counters.items())),
+    }
+
+
+def format_report(data: Dict) -> str:
+    lines = [
+        f"⏱️  Profile: {data['total_seconds'] * 1000:.1f} ms total",
+        f"  {'phase':<40}{'calls':>7}{'total ms':>11}{'self ms':>11}",
+    ]
+    for phase in data["phases"]:
+        name = "  " * phase["depth"] + phase["phase"].rsplit("/", 1)[-1]
+        lines.append(
+            f"  {name:<40}{phase['calls']:>7}{phase['seconds'] * 1000:>11.1f}"
+            f"{phase['self_seconds'] * 1000:>11.1f}"
+        )
+    if data["counters"]:
+        lines.append("📈 Counters:")
+        for name, value in data["counters"].items():
+            lines.append(f"  {name:<40}{value:>18,}")
+    return "\n".join(lines)
+
+
+def add_profile_arguments(parser):
+    """--profile and --cprofile, shared by the planner and the config manager"""
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report time per phase and counters (files, bytes, regex calls, "
+        "terms scored) on stderr",
+    )
+    parser.add_argument(
+        "--profile-format",
+        choices=PROFILE_FORMATS,
+        default="text",
+        help="Format of the --profile report (default: text)",
+    )
+    parser.add_argument(
+        "--cprofile",
+        metavar="FILE",
+        help="Also run under cProfile and dump its stats to FILE "
+        "(read with: python -m pstats FILE)",
+    )
+
+
+def start_from_args(args) -> bool:
+    """Enable tracing when --profile or --cprofile was given"""
+    if not (getattr(args, "profile", False) or getattr(args, "cprofile", None)):
+        return False
+    enable(cprofile=bool(args.cprofile))
+    return True
+
+
+def finish(args, out: TextIO = None):
+    """Stop tracing and write what --profile/--cprofile asked for"""
+    if not enabled:
+        return
+    disable()
+    out = out or sys.stderr
+    if args.cprofile:
+        _profiler.dump_stats(args.cprofile)
+    data = report()
+    if args.profile_format == "json":
+        out.write(json.dumps(data, indent=2) + "\n")
+    else:
+        out.write(format_report(data) + "\n")
+        if args.cprofile:
+            out.write(f"💾 cProfile stats written to {args.cprofile}\n")
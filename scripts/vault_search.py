@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Vault Search - BM25 full-text search over chapter notes, topic pages and the glossary
+
+The persistent index (notes/data/cache/search_index.pickle) stores postings per
+section: a section is the text under one == heading == (each glossary entry is
+its own section), and every posting keeps the term frequency and the first line
+the word appears on. Before each search only files whose mtime/size changed are
+re-read, and only their sections' postings are replaced.
+
+Usage:
+    python3 scripts/vault_search.py search "plasmid replication"
+    python3 scripts/vault_search.py search "conjugation" --chapter 8 --limit 5
+    python3 scripts/vault_search.py search "pilus" --term Conjugation
+    python3 scripts/vault_search.py reindex [--rebuild]
+"""
+import argparse
+import heapq
+import math
+import os
+import pickle
+import re
+import sys
+import time
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from glossary_index import source_fingerprint
+from wiki_tokenizer import CHAPTER_RE, ENTRY_RE, HEADING_RE, TAGS_RE
+
+PROJECT_DIR = Path(__file__).parent.parent
+NOTES_DIR = PROJECT_DIR / "notes"
+DEFAULT_INDEX_FILE = NOTES_DIR / "data" / "cache" / "search_index.pickle"
+INDEX_VERSION = 1
+STATE_KEYS = (
+    "files",
+    "sections",
+    "postings",
+    "vocabulary",
+    "word_ids",
+    "total_length",
+    "next_id",
+)
+
+# BM25 parameters (the usual defaults)
+K1 = 1.2
+B = 0.75
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+LINK_RE = re.compile(r"\[\[([^|\]]+)(?:\|([^\]]+))?\]\]")
+PATH_CHAPTER_RE = re.compile(r"(?:^|/)ch(\d+)(?:/|$)", re.IGNORECASE)
+
+
+def words_of(text: str) -> List[str]:
+    """Lowercased words with a light plural strip ("plasmids" -> "plasmid")"""
+    return [
+        word[:-1] if len(word) > 3 and word[-1] == "s" and word[-2] != "s" else word
+        for word in WORD_RE.findall(text.lower())
+    ]
+
+
+def unlink(text: str) -> str:
+    """Replace [[target|label]] links with their label (or target name)"""
+    return LINK_RE.sub(lambda m: m.group(2) or m.group(1).rsplit("/", 1)[-1], text)
+
+
+def normalize_name(name: str) -> str:
+    """Key shared by term names, topic file names and link targets"""
+    name = name.split("#", 1)[0].rstrip("/")
+    name = name.rsplit("/", 1)[-1]
+    if name.endswith(".wiki"):
+        name = name[:-5]
+    return name.strip().lower().replace(" ", "_")
+
+
+def vault_files(notes_dir: Path) -> List[Path]:
+    """Every file the search covers: chapter notes, topic pages and the glossary"""
+    files = sorted((notes_dir / "chapters").glob("**/*.wiki"))
+    files += sorted((notes_dir / "topics").glob("*.wiki"))
+    glossary = notes_dir / "glossary.wiki"
+    if glossary.exists():
+        files.append(glossary)
+    return files
+
+
+class Section:
+    """Text under one heading (or one glossary entry) while a file is being read"""
+
+    def __init__(self, heading: str, line: int, chapters=()):
+        self.heading = heading
+        self.line = line
+        self.tokens: List[str] = []
+        self.token_lines: List[int] = []
+        self.chapters = set(chapters)
+        self.links = set()
+
+    def add_text(self, text: str, lineno: int):
+        # Links count as their label (or target name), not their path
+        if "[[" in text:
+            for target, label in LINK_RE.findall(text):
+                if not target.startswith(("http:", "https:", "mailto:")):
+                    self.links.add(normalize_name(target))
+            text = unlink(text)
+        for chapter in CHAPTER_RE.findall(text):
+            self.chapters.add(chapter)
+        words = words_of(text)
+        self.tokens += words
+        self.token_lines += [lineno] * len(words)
+
+    def postings(self) -> Iterator[Tuple[str, int, int]]:
+        """(word, term frequency, first line) for every distinct word"""
+        # Built from reversed pairs, so each word keeps its earliest line
+        first_lines = dict(zip(reversed(self.tokens), reversed(self.token_lines)))
+        for word, count in Counter(self.tokens).items():
+            yield word, count, first_lines[word]
+
+
+def read_sections(path: Path, relpath: str) -> List[Section]:
+    """Split a wiki file into sections at headings; glossary entries stand alone"""
+    path_chapters = PATH_CHAPTER_RE.findall(relpath)
+    is_glossary = relpath == "glossary.wiki"
+    sections = [Section(Path(relpath).stem, 1, path_chapters)]
+    file_tags = set()
+    with open(path, "r", errors="replace") as f:
+        for lineno, raw in enumerate(f, 1):
+            line = raw.rstrip("\n")
+            if not line.strip():
+                continue
+            first = line[0]
+            if first == "=":
+                match = HEADING_RE.match(line)
+                if match:
+                    heading = unlink(match.group(2))
+                    sections.append(Section(heading, lineno, path_chapters))
+            elif first == "*" and is_glossary:
+                match = ENTRY_RE.match(line)
+                if match:
+                    wiki_link, term_name, _ = match.groups()
+                    entry = Section(term_name, lineno)
+                    entry.links.add(normalize_name(wiki_link))
+                    entry.add_text(f"{term_name} {line}", lineno)
+                    sections.append(entry)
+                    # Text after an entry belongs to the letter section again
+                    sections.append(Section(sections[-2].heading, lineno + 1))
+                    continue
+            stripped = line.strip()
+            if not is_glossary and stripped[:3].lower() == "tag":
+                match = TAGS_RE.match(stripped)
+                if match:
+                    file_tags.update(CHAPTER_RE.findall(match.group(1)))
+            sections[-1].add_text(line, lineno)
+
+    # A topic page's "Tags: Ch. 8" applies to all of its sections
+    for section in sections:
+        section.chapters |= file_tags
+    return [section for section in sections if section.tokens]
+
+
+class SearchIndex:
+    """
+    Persistent BM25 index with section-level postings.
+
+    - files:    {relpath: {"fingerprint", "sections": [ids], "word_ids", "name"}}
+    - sections: {id: (relpath, heading, line, length, chapters, links)}
+    - postings: {word: array of (section id, term frequency, first line) triples}
+    - vocabulary / word_ids: word <-> id, so files list their words compactly
+    Flat unsigned-int arrays keep the pickle small and quick to load.
+    """
+
+    def __init__(self, index_file=DEFAULT_INDEX_FILE, notes_dir=NOTES_DIR):
+        self.index_file = Path(index_file)
+        self.notes_dir = Path(notes_dir)
+        self.clear()
+        self.dirty = False
+        self.load()
+
+    def clear(self):
+        self.files: Dict[str, Dict] = {}
+        self.sections: Dict[int, Tuple] = {}
+        self.postings: Dict[str, array] = {}
+        self.vocabulary: List[str] = []
+        self.word_ids: Dict[str, int] = {}
+        self.total_length = 0
+        self.next_id = 0
+        self.dirty = True
+
+    def load(self):
+        """Load the pickled index, ignoring it if unreadable or from another version"""
+        try:
+            with open(self.index_file, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            print(f"Warning: Ignoring unreadable search index {self.index_file}: {e}")
+            return
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return
+        for key in STATE_KEYS:
+            setattr(self, key, data[key])
+        self.dirty = False
+
+    def save(self):
+        """Atomically write the index if anything changed"""
+        if not self.dirty:
+            return
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.index_file.with_name(
+            f"{self.index_file.name}.{os.getpid()}.tmp"
+        )
+        state = {key: getattr(self, key) for key in STATE_KEYS}
+        with open(tmp_file, "wb") as f:
+            pickle.dump(
+                {"version": INDEX_VERSION, **state},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_file, self.index_file)
+        self.dirty = False
+
+    def _remove_file(self, relpath: str):
+        entry = self.files.pop(relpath)
+        removed = set(entry["sections"])
+        postings = self.postings
+        for word_id in entry["word_ids"]:
+            word = self.vocabulary[word_id]
+            old = postings[word]
+            kept = array("I")
+            for i in range(0, len(old), 3):
+                if old[i] not in removed:
+                    kept.extend(old[i : i + 3])
+            if kept:
+                postings[word] = kept
+            else:
+                del postings[word]
+        for section_id in removed:
+            self.total_length -= self.sections.pop(section_id)[3]
+        self.dirty = True
+
+    def _add_file(self, path: Path, relpath: str, fingerprint: Dict):
+        section_ids = []
+        words = set()
+        postings = self.postings
+        for section in read_sections(path, relpath):
+            section_id = self.next_id
+            self.next_id += 1
+            self.sections[section_id] = (
+                relpath,
+                section.heading,
+                section.line,
+                len(section.tokens),
+                tuple(sorted(section.chapters)),
+                tuple(sorted(section.links)),
+            )
+            for word, count, first_line in section.postings():
+                word_postings = postings.get(word)
+                if word_postings is None:
+                    word_postings = postings[word] = array("I")
+                word_postings.extend((section_id, count, first_line))
+                words.add(word)
+            self.total_length += len(section.tokens)
+            section_ids.append(section_id)
+        self.files[relpath] = {
+            "fingerprint": fingerprint,
+            "sections": section_ids,
+            "word_ids": array("I", sorted(self._word_id(word) for word in words)),
+            "name": normalize_name(relpath),
+        }
+        self.dirty = True
+
+    def _word_id(self, word: str) -> int:
+        word_id = self.word_ids.get(word)
+        if word_id is None:
+            word_id = self.word_ids[word] = len(self.vocabulary)
+            self.vocabulary.append(word)
+        return word_id
+
+    def update(self) -> Tuple[int, int]:
+        """Re-index new and changed files and drop deleted ones; (changed, removed)"""
+        changed = 0
+        seen = set()
+        for path in vault_files(self.notes_dir):
+            relpath = path.relative_to(self.notes_dir).as_posix()
+            seen.add(relpath)
+            previous = self.files.get(relpath, {}).get("fingerprint")
+            fingerprint = source_fingerprint(path, previous)
+            if fingerprint is None or fingerprint is previous:
+                continue
+            if previous is not None and previous.get("hash") == fingerprint["hash"]:
+                self.files[relpath]["fingerprint"] = fingerprint  # touched, not edited
+                self.dirty = True
+                continue
+            if relpath in self.files:
+                self._remove_file(relpath)
+            self._add_file(path, relpath, fingerprint)
+            changed += 1
+        removed = [relpath for relpath in self.files if relpath not in seen]
+        for relpath in removed:
+            self._remove_file(relpath)
+        return changed, len(removed)
+
+    def _matches_term(self, section: Tuple, term_key: str) -> bool:
+        relpath, _, _, _, _, links = section
+        return term_key in links or (
+            relpath.startswith("topics/") and self.files[relpath]["name"] == term_key
+        )
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        term: Optional[str] = None,
+        chapter: Optional[str] = None,
+    ) -> List[Tuple[float, int, int]]:
+        """
+        Top sections for a query as (score, section id, line of first match).
+        `term` keeps sections of that term's topic page, its glossary entry and
+        sections linking to it; `chapter` keeps sections tied to that chapter.
+        """
+        query_words = list(dict.fromkeys(words_of(query)))
+        sections = self.sections
+        if not query_words or not sections:
+            return []
+        count = len(sections)
+        avg_length = self.total_length / count
+        term_key = normalize_name(term) if term else None
+        chapter = str(chapter) if chapter else None
+
+        scores: Dict[int, float] = {}
+        first_lines: Dict[int, int] = {}
+        rejected = set()
+        for word in query_words:
+            word_postings = self.postings.get(word)
+            if not word_postings:
+                continue
+            df = len(word_postings) // 3
+            idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+            for section_id, tf, first_line in zip(
+                word_postings[0::3], word_postings[1::3], word_postings[2::3]
+            ):
+                if section_id in rejected:
+                    continue
+                if section_id not in scores and (term_key or chapter):
+                    section = sections[section_id]
+                    if (chapter and chapter not in section[4]) or (
+                        term_key and not self._matches_term(section, term_key)
+                    ):
+                        rejected.add(section_id)
+                        continue
+                norm = K1 * (1 - B + B * sections[section_id][3] / avg_length)
+                scores[section_id] = scores.get(section_id, 0.0) + idf * (
+                    tf * (K1 + 1) / (tf + norm)
+                )
+                if first_line < first_lines.get(section_id, first_line + 1):
+                    first_lines[section_id] = first_line
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [
+            (score, section_id, first_lines[section_id]) for section_id, score in top
+        ]
+
+
+def snippet(path: Path, lineno: int, width: int = 100) -> str:
+    """The text of one line of a file, shortened for display"""
+    try:
+        with open(path, "r", errors="replace") as f:
+            for current, line in enumerate(f, 1):
+                if current == lineno:
+                    text = " ".join(line.split())
+                    return text if len(text) <= width else text[: width - 1] + "…"
+    except OSError:
+        pass
+    return ""
+
+
+def print_results(index: SearchIndex, query: str, results, elapsed: float):
+    if not results:
+        print(f"No matches for '{query}'")
+        return
+    print(f"🔎 {len(results)} results for '{query}' ({elapsed * 1000:.1f} ms)")
+    for rank, (score, section_id, lineno) in enumerate(results, 1):
+        relpath, heading, heading_line, _, _, _ = index.sections[section_id]
+        print(f"\n{rank}. {relpath}:{lineno}  == {heading} ==  (score {score:.2f})")
+        text = snippet(index.notes_dir / relpath, lineno)
+        if text:
+            print(f"    {text}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Full-text search over the notes vault"
+    )
+    parser.add_argument(
+        "--index-file", default=str(DEFAULT_INDEX_FILE), help="Search index location"
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    search_parser = subparsers.add_parser(
+        "search", help="Search notes, topics and glossary"
+    )
+    search_parser.add_argument("query", nargs="+", help="Words to search for")
+    search_parser.add_argument(
+        "--limit", type=int, default=10, help="Number of results"
+    )
+    search_parser.add_argument(
+        "--term",
+        help="Only the term's topic page, glossary entry and sections linking to it",
+    )
+    search_parser.add_argument("--chapter", help="Only sections tied to this chapter")
+
+    reindex_parser = subparsers.add_parser("reindex", help="Update the search index")
+    reindex_parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Discard the index and re-read every file",
+    )
+
+    args = parser.parse_args()
+    if not args.command:
+        parser.print_help()
+        return
+
+    index = SearchIndex(args.index_file)
+    if args.command == "reindex":
+        if args.rebuild:
+            index.clear()
+        changed, removed = index.update()
+        index.save()
+        print(
+            f"✅ Search index: {len(index.files)} files, "
+            f"{len(index.sections)} sections ({changed} re-indexed, {removed} removed)"
+        )
+        return
+
+    index.update()
+    index.save()
+    query = " ".join(args.query)
+    start = time.perf_counter()
+    results = index.search(query, args.limit, term=args.term, chapter=args.chapter)
+    print_results(index, query, results, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Wiki Tokenizer - Single-pass streaming tokenizer for vimwiki glossary and topic files
+"""
+import os
+import re
+from typing import Iterable, Iterator, Tuple
+
+import tracing
+
+# Token kinds
+HEADING = "heading"  # value: (level, text)
+ENTRY = "entry"  # value: (wiki_link, term_name, definition) for "* [[link|Name]] :: def"
+TAGS = "tags"  # value: list of tag strings from a "Tags: a, b" line
+CHAPTER = "chapter"  # value: chapter number as a string ("Ch. 8", "Chapter 10")
+LINK = "link"  # value: (target, label or None) for [[target|label]]
+
+# Tokens are plain (kind, value, line) tuples: cheaper to build than named tuples
+# and the hot loops unpack them directly
+Token = Tuple[str, object, int]
+
+# All patterns are compiled once at import time and shared by every parser
+HEADING_RE = re.compile(r"(=+)\s*([^=]+?)\s*=+")
+ENTRY_RE = re.compile(r"\*\s*\[\[([^|]+)\|([^\]]+)\]\]\s*::\s*(.+)")
+TAGS_RE = re.compile(r"Tags?\s*:\s*(.+)", re.IGNORECASE)
+CHAPTER_RE = re.compile(r"(?:Ch\.?\s*|Chapter\s+)(\d+)", re.IGNORECASE)
+# One alternation for every inline token so each line is scanned exactly once.
+# findall() yields (link, target, label, chapter) tuples.
+INLINE_RE = re.compile(
+    r"(\[\[([^|\]]+)(?:\|([^\]]+))?\]\])"
+    r"|(?:Ch\.?\s*|Chapter\s+)(\d+)",
+    re.IGNORECASE,
+)
+
+
+def tokenize_lines(lines: Iterable[str], inline: bool = True) -> Iterator[Token]:
+    """
+    Tokenize an iterable of lines in a single pass.
+
+    Block tokens (headings, glossary entries, tag lines) are recognised from the
+    first character of the line; inline tokens (chapter refs, wiki links) come
+    from one combined regex scan. Set `inline=False` when only block tokens are
+    needed (e.g. glossary.wiki) to skip the inline scan entirely.
+    """
+    regex_calls = 0  # reported to tracing once, at the end
+    for lineno, raw in enumerate(lines, 1):
+        raw = raw.rstrip("\n")
+        if not raw:
+            continue
+
+        first = raw[0]
+        if first == "=":
+            regex_calls += 1
+            match = HEADING_RE.match(raw)
+            if match:
+                yield (HEADING, (len(match.group(1)), match.group(2)), lineno)
+        elif first == "*":
+            regex_calls += 1
+            match = ENTRY_RE.match(raw)
+            if match:
+                yield (ENTRY, match.groups(), lineno)
+
+        if not inline:
+            continue
+
+        line = raw.strip()
+        regex_calls += 1
+        if line[:3].lower() == "tag":
+            regex_calls += 1
+            match = TAGS_RE.match(line)
+            if match:
+                yield (TAGS, [tag.strip() for tag in match.group(1).split(",")], lineno)
+
+        for link, target, label, chapter in INLINE_RE.findall(line):
+            if chapter:
+                yield (CHAPTER, chapter, lineno)
+                continue
+            # Chapter refs inside a link ([[chapters/ch8/index|Chapter 8]]) still count
+            if "ch" in link.lower():
+                regex_calls += 1
+                for inner in CHAPTER_RE.findall(link):
+                    yield (CHAPTER, inner, lineno)
+            yield (LINK, (target, label or None), lineno)
+    if tracing.enabled:
+        tracing.count("regex_calls", regex_calls)
+
+
+def tokenize_file(path, inline: bool = True) -> Iterator[Token]:
+    """Stream tokens from a file without loading it into memory"""
+    with open(path, "r") as f:
+        yield from tokenize_lines(f, inline=inline)
+        if tracing.enabled:
+            tracing.count("files_read")
+            tracing.count("bytes_read", os.fstat(f.fileno()).st_size)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+YAML Cache - Loads YAML files through a compiled binary snapshot validated by mtime
+
+The first load of a YAML file parses it (with libyaml's C loader when PyYAML was
+built with it) and pickles the result next to the other generated data. Later
+loads unpickle the snapshot as long as the source's mtime and size are unchanged,
+so neither PyYAML nor the parser is imported on the common path.
+"""
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+import tracing
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "notes" / "data" / "cache"
+SNAPSHOT_VERSION = 1
+
+
+def _yaml_loader():
+    """Fastest available safe loader (C-accelerated when libyaml is present)"""
+    import yaml
+
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def parse_yaml(stream):
+    """Parse a YAML stream or string with the fastest safe loader"""
+    import yaml
+
+    return yaml.load(stream, Loader=_yaml_loader())
+
+
+def _snapshot_path(path: Path, cache_dir: Path) -> Path:
+    key = hashlib.blake2b(str(path).encode(), digest_size=8).hexdigest()
+    return cache_dir / f"{path.stem}-{key}.pickle"
+
+
+def load_yaml(path, cache_dir=None):
+    """
+    Load a YAML file, using (and refreshing) its binary snapshot.
+    Raises the same errors as reading/parsing the file directly.
+    """
+    path = Path(path).resolve()
+    st = os.stat(path)
+    snapshot_file = _snapshot_path(path, Path(cache_dir or DEFAULT_CACHE_DIR))
+
+    try:
+        with open(snapshot_file, "rb") as f:
+            snapshot = pickle.load(f)
+        if (
+            snapshot.get("version") == SNAPSHOT_VERSION
+            and snapshot.get("mtime") == st.st_mtime_ns
+            and snapshot.get("size") == st.st_size
+        ):
+            tracing.count("yaml_snapshot_hits")
+            return snapshot["data"]
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+        pass  # missing or unreadable snapshot: re-parse below
+
+    with tracing.span(f"parse_yaml {path.name}"):
+        with open(path, "r") as f:
+            data = parse_yaml(f)
+    tracing.count("yaml_files_parsed")
+    tracing.count("bytes_read", st.st_size)
+
+    try:
+        snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = snapshot_file.with_name(f"{snapshot_file.name}.{os.getpid()}.tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump(
+                {
+                    "version": SNAPSHOT_VERSION,
+                    "mtime": st.st_mtime_ns,
+                    "size": st.st_size,
+                    "data": data,
+                },
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_file, snapshot_file)
+    except OSError as e:
+        print(f"Warning: Could not write YAML snapshot {snapshot_file}: {e}")
+    return data